@@ -14,3 +14,8 @@ from django.core.asgi import get_asgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'otimizacao.settings')
 
 application = get_asgi_application()
+
+# Só o servidor aquece o pool de renderização (ver solver/workers.py)
+from solver.workers import prewarm_render_pool  # noqa: E402
+
+prewarm_render_pool()
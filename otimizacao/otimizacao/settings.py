@@ -40,7 +40,6 @@ INSTALLED_APPS = [
     'django.contrib.messages',
     'django.contrib.staticfiles',
     'solver',
-    'django_plotly_dash',
 ]
 
 MIDDLEWARE = [
@@ -52,6 +51,8 @@ MIDDLEWARE = [
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
+    'solver.middleware.ServerTimingMiddleware',
+    'solver.middleware.AdmissionMiddleware',
 ]
 
 CSRF_TRUSTED_ORIGINS = ['http://127.0.0.1:8000']
@@ -132,3 +133,164 @@ STATICFILES_DIRS = [
 # https://docs.djangoproject.com/en/5.1/ref/settings/#default-auto-field
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
+
+# Testes sem exploração de resolvedores: resultados reproduzíveis (ver solver/testing.py)
+
+TEST_RUNNER = 'solver.testing.SolverTestRunner'
+
+# Cache de resultados do solver (ver solver/cache.py)
+# ALIAS: nome de um backend em CACHES para compartilhar o cache entre processos
+
+SOLVER_CACHE = {
+    'ALIAS': None,
+    'MAX_ENTRIES': 256,
+    'TTL': 60 * 60,
+}
+
+# Armazenamento dos gráficos gerados, um arquivo por modelo (ver solver/artifacts.py)
+
+SOLVER_ARTIFACTS = {
+    'ROOT': BASE_DIR / 'graph_artifacts',
+    'MAX_BYTES': 64 * 1024 * 1024,
+    'MAX_AGE': 24 * 60 * 60,
+}
+
+# Pool de processos de renderização dos gráficos (ver solver/workers.py)
+# WORKERS = 0 renderiza na própria requisição (útil em desenvolvimento e testes)
+# PREWARM cria e aquece os processos na partida do servidor (otimizacao/wsgi.py e asgi.py),
+# fora do caminho da primeira requisição
+
+SOLVER_RENDER = {
+    'WORKERS': 2,
+    'MAX_PENDING': 32,
+    'SUBMIT_TIMEOUT': 0.5,
+    'WAIT_TIMEOUT': 30,
+    'PREWARM': True,
+    # Limites de ?width= e ?dpi= nas variantes do gráfico (ver solver/variants.py)
+    'MAX_WIDTH': 2000,
+    'MAX_DPI': 200,
+}
+
+# Endpoint assíncrono de otimização (ver solver/cbc.py)
+
+SOLVER_ASYNC = {
+    'MAX_CONCURRENT': 8,
+    'TIMEOUT': 30,
+}
+
+# Resolução em lote (ver solver/batch.py)
+
+SOLVER_BATCH = {
+    'WORKERS': 4,
+    'MAX_ITEMS': 500,
+}
+
+# Sessões de re-otimização incremental (ver solver/sessions.py)
+
+SOLVER_SESSIONS = {
+    'MAX_ENTRIES': 128,
+    'TTL': 30 * 60,
+}
+
+# Varredura paramétrica (ver solver/sensitivity.py)
+
+SOLVER_SWEEP = {
+    'MAX_STEPS': 1000,
+}
+
+# Resolvedores (ver solver/backends.py)
+# DEFAULT = None escolhe o resolvedor pelo formato do problema; "solver" na requisição tem prioridade
+# EXPLORE é a fração das resoluções usada para medir candidatos com menos de MIN_SAMPLES amostras;
+# depois disso, cada faixa de formato vai para o resolvedor mais rápido medido
+# (nos testes, EXPLORE = 0: ver solver/testing.py)
+# TIME_LIMIT é o teto de tempo de toda resolução; "limits" na requisição pode pedir menos, e um
+# gap ("gapRel") diferente de GAP_REL para modelos inteiros
+
+SOLVER_BACKENDS = {
+    'DEFAULT': None,
+    'LARGE_MODEL': 5000,
+    'MIN_SAMPLES': 5,
+    'EXPLORE': 0.1,
+    'TIME_LIMIT': 60,
+    'GAP_REL': 1e-4,
+    'PRESOLVE': True,
+    'CBC_OPTIONS': {
+        'threads': 2,
+    },
+}
+
+# Histórico de resoluções no banco (ver solver/history.py)
+# As gravações são acumuladas e feitas em lote por uma thread própria
+
+SOLVER_HISTORY = {
+    'ENABLED': True,
+    'BATCH_SIZE': 50,
+    'FLUSH_INTERVAL': 2.0,
+    'PAGE_SIZE': 20,
+    'MAX_PAGE_SIZE': 100,
+}
+
+# Fila de jobs de resolução (ver solver/jobs.py e o comando run_jobs)
+# AUTOSTART = True inicia o pool no próprio processo web no primeiro job; em produção,
+# prefira AUTOSTART = False e um processo `python manage.py run_jobs` dedicado
+
+SOLVER_JOBS = {
+    'WORKERS': 2,
+    'AUTOSTART': True,
+    'MAX_PENDING': 1000,
+    'DEFAULT_TIMEOUT': 60,
+    'MAX_TIMEOUT': 600,
+    'MAX_WAIT': 30,
+}
+
+# Partida dos processos (ver solver/startup.py e o comando startup_time)
+# PRELOAD = True importa PuLP, numpy e as views já em django.setup(): use com um
+# servidor que carrega a aplicação antes do fork (gunicorn --preload). O matplotlib
+# só é importado pelos processos de renderização.
+
+SOLVER_STARTUP = {
+    'PRELOAD': False,
+}
+
+# Upload de modelos em MPS, LP ou CSV (ver solver/upload.py e /solver/optimize/upload/)
+
+SOLVER_UPLOAD = {
+    'MAX_BYTES': 64 * 1024 * 1024,
+    'MAX_NONZEROS': 2_000_000,
+}
+
+# Galeria de exemplos resolvidos de antemão (ver solver/gallery.py e `manage.py build_gallery`)
+# Os arquivos vão para solver/static/gallery, com impressão digital no nome; com USE_STATIC_URL,
+# a listagem aponta para STATIC_URL (após collectstatic) em vez da view gallery_file.
+
+SOLVER_GALLERY = {
+    'CATALOG': None,
+    'USE_STATIC_URL': False,
+    'MAX_AGE': 300,
+}
+
+# Controle de admissão das views de resolução e de gráficos (ver solver/admission.py)
+# CONCURRENCY e QUEUE valem por processo; RATE (fichas/s) e BURST, por cliente. Requisições
+# acima do limite de fichas recebem 429; com a fila cheia ou após QUEUE_TIMEOUT, 503.
+
+SOLVER_ADMISSION = {
+    'ENABLED': True,
+    'CONCURRENCY': {'solve': 4, 'render': 8},
+    'QUEUE': {'solve': 16, 'render': 32},
+    'QUEUE_TIMEOUT': 10,
+    'RATE': {'solve': 5.0, 'submit': 5.0, 'render': 50.0},
+    'BURST': {'solve': 20, 'submit': 20, 'render': 200},
+}
+
+# Logs do solver: tempos por etapa de cada requisição em JSON (logger 'solver.timing')
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {'class': 'logging.StreamHandler'},
+    },
+    'loggers': {
+        'solver': {'handlers': ['console'], 'level': 'INFO'},
+    },
+}
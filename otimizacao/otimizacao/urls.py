@@ -2,11 +2,14 @@ from django.contrib import admin
 from django.urls import path, include
 from django.shortcuts import redirect
 
+from solver.views import metrics
+
 def redirect_to_solver(request):
     return redirect('/solver/')
 
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('solver/', include('solver.urls')),
+    path('metrics', metrics, name='metrics'),
     path('', redirect_to_solver),
 ]
\ No newline at end of file
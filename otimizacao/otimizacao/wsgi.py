@@ -14,3 +14,8 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'otimizacao.settings')
 
 application = get_wsgi_application()
+
+# Só o servidor aquece o pool de renderização (ver solver/workers.py)
+from solver.workers import prewarm_render_pool  # noqa: E402
+
+prewarm_render_pool()
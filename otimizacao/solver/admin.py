@@ -1,3 +1,28 @@
 from django.contrib import admin
 
-# Register your models here.
+from .models import Problem, Solution, SolveJob, SolveTiming
+
+
+@admin.register(Problem)
+class ProblemAdmin(admin.ModelAdmin):
+    list_display = ('key', 'objective', 'variables', 'constraints', 'created_at')
+    search_fields = ('key',)
+
+
+@admin.register(Solution)
+class SolutionAdmin(admin.ModelAdmin):
+    list_display = ('problem', 'backend', 'objective_result', 'created_at')
+    list_filter = ('backend',)
+
+
+@admin.register(SolveTiming)
+class SolveTimingAdmin(admin.ModelAdmin):
+    list_display = ('problem', 'backend', 'solve_ms', 'created_at')
+    list_filter = ('backend',)
+
+
+@admin.register(SolveJob)
+class SolveJobAdmin(admin.ModelAdmin):
+    list_display = ('id', 'status', 'priority', 'key', 'created_at', 'finished_at')
+    list_filter = ('status',)
+    search_fields = ('key',)
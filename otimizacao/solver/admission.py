@@ -0,0 +1,215 @@
+import math
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+
+DEFAULT_SETTINGS = {
+    'ENABLED': True,
+    # Classe de cada view (nome da URL); views fora da lista não passam pela admissão
+    'VIEWS': {
+        'optimize': 'solve',
+        'optimize_async': 'solve',
+        'optimize_batch': 'solve',
+        'optimize_stream': 'solve',
+        'optimize_upload': 'solve',
+        'sweep': 'solve',
+        'sessions': 'solve',
+        'session_detail': 'solve',
+        'jobs': 'submit',
+        'graph': 'render',
+    },
+    'CONCURRENCY': {'solve': 4, 'render': 8},   # Requisições simultâneas por processo
+    'QUEUE': {'solve': 16, 'render': 32},       # Requisições esperando uma vaga, por processo
+    'QUEUE_TIMEOUT': 10,                        # Espera máxima por uma vaga, em segundos
+    'RETRY_AFTER': 2,                           # Retry-After das respostas 503, em segundos
+    'RATE': {'solve': 5.0, 'submit': 5.0, 'render': 50.0},   # Fichas por segundo, por cliente
+    'BURST': {'solve': 20, 'submit': 20, 'render': 200},     # Capacidade do balde de cada cliente
+    'MAX_CLIENTS': 10000,       # Clientes com balde em memória (LRU)
+    'CLIENT_HEADER': None,      # Ex.: 'HTTP_X_FORWARDED_FOR' atrás de um proxy confiável
+}
+
+# Resultados de Gate.acquire() e AdmissionControl.enter() (também rótulos dos contadores)
+ADMITTED = 'admitted'
+QUEUE_FULL = 'queue_full'
+TIMEOUT = 'timeout'
+RATE_LIMITED = 'rate_limited'
+
+
+def admission_settings():
+    return {**DEFAULT_SETTINGS, **getattr(settings, 'SOLVER_ADMISSION', {})}
+
+
+class Gate:
+    """
+    Limita as requisições simultâneas de uma classe, com uma fila de espera
+    limitada. Quem chega com a fila cheia é recusado na hora; quem espera
+    mais que `timeout` desiste. As vagas são entregues por ordem de chegada.
+    """
+
+    def __init__(self, limit, queue):
+        self.limit = limit
+        self.queue = queue
+        self.active = 0
+        self.waiting = 0
+        self._condition = threading.Condition()
+
+    def try_acquire(self):
+        with self._condition:
+            if self.active < self.limit and not self.waiting:
+                self.active += 1
+                return True
+            return False
+
+    def acquire(self, timeout):
+        with self._condition:
+            if self.active < self.limit and not self.waiting:
+                self.active += 1
+                return ADMITTED
+            if self.waiting >= self.queue:
+                return QUEUE_FULL
+            self.waiting += 1
+            try:
+                deadline = time.monotonic() + timeout
+                while self.active >= self.limit:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        return TIMEOUT
+                    self._condition.wait(remaining)
+                self.active += 1
+                return ADMITTED
+            finally:
+                self.waiting -= 1
+
+    def release(self):
+        with self._condition:
+            self.active -= 1
+            self._condition.notify()
+
+
+class TokenBuckets:
+    """Um balde de fichas por cliente: `rate` fichas por segundo, até `burst`."""
+
+    def __init__(self, rate, burst, max_clients):
+        self.rate = rate
+        self.burst = burst
+        self.max_clients = max_clients
+        self._buckets = OrderedDict()
+        self._lock = threading.Lock()
+
+    def take(self, client):
+        """Retorna 0 se a ficha foi consumida, ou os segundos até a próxima ficha."""
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated = self._buckets.pop(client, (self.burst, now))
+            tokens = min(self.burst, tokens + (now - updated) * self.rate)
+            wait = 0.0
+            if tokens >= 1:
+                tokens -= 1
+            else:
+                wait = (1 - tokens) / self.rate
+            self._buckets[client] = (tokens, now)
+            while len(self._buckets) > self.max_clients:
+                self._buckets.popitem(last=False)
+        return wait
+
+
+class AdmissionControl:
+    """
+    Controle de admissão do processo: um Gate e um TokenBuckets por classe
+    de view (ver DEFAULT_SETTINGS) e contadores por classe e resultado.
+    """
+
+    def __init__(self, options):
+        self.options = options
+        self.gates = {
+            name: Gate(limit, options['QUEUE'].get(name, 0))
+            for name, limit in options['CONCURRENCY'].items()
+        }
+        self.buckets = {
+            name: TokenBuckets(rate, options['BURST'].get(name, max(1, math.ceil(rate))), options['MAX_CLIENTS'])
+            for name, rate in options['RATE'].items()
+        }
+        self._counts = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_settings(cls):
+        return cls(admission_settings())
+
+    def view_class(self, url_name):
+        return self.options['VIEWS'].get(url_name)
+
+    def client(self, request):
+        header = self.options['CLIENT_HEADER']
+        value = request.META.get(header, '') if header else ''
+        # Em X-Forwarded-For, o primeiro endereço é o do cliente original
+        return value.split(',')[0].strip() or request.META.get('REMOTE_ADDR', '')
+
+    def check_rate(self, name, client):
+        """Retorna os segundos até a próxima ficha do cliente (0 = pode seguir)."""
+        buckets = self.buckets.get(name)
+        wait = buckets.take(client) if buckets is not None else 0.0
+        if wait:
+            self.count(name, RATE_LIMITED)
+        return wait
+
+    def try_enter(self, name):
+        """Retorna True se a requisição entrou sem esperar (ou a classe não tem limite)."""
+        gate = self.gates.get(name)
+        if gate is None or gate.try_acquire():
+            self.count(name, ADMITTED)
+            return True
+        return False
+
+    def enter(self, name):
+        """Espera uma vaga; retorna ADMITTED, QUEUE_FULL ou TIMEOUT."""
+        outcome = self.gates[name].acquire(self.options['QUEUE_TIMEOUT'])
+        if outcome == ADMITTED:
+            self.count(name, 'queued')
+        self.count(name, outcome)
+        return outcome
+
+    def leave(self, name):
+        gate = self.gates.get(name)
+        if gate is not None:
+            gate.release()
+
+    def count(self, name, outcome):
+        with self._lock:
+            self._counts[(name, outcome)] = self._counts.get((name, outcome), 0) + 1
+
+    def render(self):
+        """Contadores e ocupação no formato do Prometheus (para /metrics)."""
+        with self._lock:
+            counts = sorted(self._counts.items())
+        lines = [
+            '# HELP solver_admission_requests_total Requisições por classe e resultado da admissão.',
+            '# TYPE solver_admission_requests_total counter',
+        ]
+        for (name, outcome), count in counts:
+            lines.append(f'solver_admission_requests_total{{class="{name}",outcome="{outcome}"}} {count}')
+        for metric, attribute, text in (
+            ('solver_admission_active', 'active', 'Requisições em execução, por classe.'),
+            ('solver_admission_waiting', 'waiting', 'Requisições esperando uma vaga, por classe.'),
+        ):
+            lines.append(f'# HELP {metric} {text}')
+            lines.append(f'# TYPE {metric} gauge')
+            for name, gate in sorted(self.gates.items()):
+                lines.append(f'{metric}{{class="{name}"}} {getattr(gate, attribute)}')
+        return '\n'.join(lines) + '\n'
+
+
+_admission = None
+_admission_lock = threading.Lock()
+
+
+# Função para obter o controle de admissão configurado em settings.SOLVER_ADMISSION
+def get_admission():
+    global _admission
+    if _admission is None:
+        with _admission_lock:
+            if _admission is None:
+                _admission = AdmissionControl.from_settings()
+    return _admission
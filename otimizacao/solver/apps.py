@@ -4,3 +4,11 @@ from django.apps import AppConfig
 class SolverConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'solver'
+
+    def ready(self):
+        from .startup import preload, startup_settings
+
+        # Com SOLVER_STARTUP['PRELOAD'], os módulos pesados são importados uma
+        # vez no processo pai e compartilhados pelos workers após o fork
+        if startup_settings()['PRELOAD']:
+            preload()
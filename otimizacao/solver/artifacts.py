@@ -0,0 +1,142 @@
+import os
+import re
+import tempfile
+import threading
+import time
+
+from django.conf import settings
+
+# Chave do modelo, opcionalmente com a variante e a extensão (ver solver/variants.py)
+KEY_PATTERN = re.compile(r'^[0-9a-f]{16,64}(?:-[a-z0-9]+)*(?:\.(?:png|svg|webp))?$')
+
+DEFAULT_SETTINGS = {
+    'ROOT': os.path.join(settings.BASE_DIR, 'graph_artifacts'),
+    'MAX_BYTES': 64 * 1024 * 1024,   # Tamanho máximo somado dos artefatos
+    'MAX_AGE': 24 * 60 * 60,         # Idade máxima de um artefato, em segundos
+    'EXTENSION': '.png',
+}
+
+
+class ArtifactStore:
+    """
+    Armazena os gráficos gerados em disco, um arquivo por chave (hash do
+    modelo) e variante; chaves sem extensão recebem `extension`. A escrita
+    é atômica (arquivo temporário + os.replace), então requisições
+    concorrentes nunca leem um arquivo pela metade. O total é limitado por
+    tamanho e idade: os artefatos mais antigos saem primeiro.
+    """
+
+    def __init__(self, root, max_bytes=64 * 1024 * 1024, max_age=24 * 60 * 60, extension='.png'):
+        self.root = str(root)
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.extension = extension
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_settings(cls):
+        options = {**DEFAULT_SETTINGS, **getattr(settings, 'SOLVER_ARTIFACTS', {})}
+        return cls(
+            root=options['ROOT'],
+            max_bytes=options['MAX_BYTES'],
+            max_age=options['MAX_AGE'],
+            extension=options['EXTENSION'],
+        )
+
+    def path(self, key):
+        if not KEY_PATTERN.match(key):
+            raise ValueError(f"Chave de artefato inválida: {key}")
+        return os.path.join(self.root, key if '.' in key else key + self.extension)
+
+    def _expired(self, mtime, now=None):
+        return bool(self.max_age) and mtime + self.max_age <= (now or time.time())
+
+    def stat(self, key):
+        """Retorna o os.stat do artefato, ou None se ele não existir ou tiver expirado."""
+        try:
+            st = os.stat(self.path(key))
+        except (OSError, ValueError):
+            return None
+        if self._expired(st.st_mtime):
+            return None
+        return st
+
+    def exists(self, key):
+        return self.stat(key) is not None
+
+    def open(self, key):
+        if self.stat(key) is None:
+            return None
+        try:
+            return open(self.path(key), 'rb')
+        except OSError:
+            return None
+
+    def put(self, key, data):
+        path = self.path(key)
+        os.makedirs(self.root, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.root, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.chmod(tmp_path, 0o644)
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        self.evict()
+        return path
+
+    def evict(self):
+        """Remove artefatos expirados e, se preciso, os mais antigos até caber em max_bytes."""
+        with self._lock:
+            try:
+                entries = [
+                    entry for entry in os.scandir(self.root)
+                    if entry.is_file() and not entry.name.endswith('.tmp')
+                ]
+            except FileNotFoundError:
+                return
+
+            now = time.time()
+            alive = []
+            for entry in entries:
+                try:
+                    st = entry.stat()
+                except FileNotFoundError:
+                    continue
+                if self._expired(st.st_mtime, now):
+                    self._remove(entry.path)
+                else:
+                    alive.append((st.st_mtime, st.st_size, entry.path))
+
+            total = sum(size for _, size, _ in alive)
+            if not self.max_bytes or total <= self.max_bytes:
+                return
+            for _, size, path in sorted(alive):
+                if total <= self.max_bytes:
+                    break
+                self._remove(path)
+                total -= size
+
+    @staticmethod
+    def _remove(path):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+
+_artifact_store = None
+_artifact_store_lock = threading.Lock()
+
+
+# Função para obter o armazenamento de artefatos configurado em settings.SOLVER_ARTIFACTS
+def get_artifact_store():
+    global _artifact_store
+    if _artifact_store is None:
+        with _artifact_store_lock:
+            if _artifact_store is None:
+                _artifact_store = ArtifactStore.from_settings()
+    return _artifact_store
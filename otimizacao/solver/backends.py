@@ -0,0 +1,511 @@
+import asyncio
+import importlib.util
+import os
+import random
+import re
+import tempfile
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from contextlib import contextmanager
+
+import numpy as np
+from django.conf import settings
+from pulp import LpConstraintEQ, LpConstraintGE, LpMaximize, LpSolutionIntegerFeasible, PULP_CBC_CMD
+
+from .parser import parse_constraint, parse_linear
+from .planar import MAX_CONSTRAINTS
+from .presolve import presolve, presolved_solution
+from .problem import build_model, constraint_geometry, model_solution, solve_planar
+from .timing import span, traced_call
+
+DEFAULT_SETTINGS = {
+    'DEFAULT': None,         # Nome do resolvedor padrão (None = seleção automática)
+    'LARGE_MODEL': 5000,     # variáveis × restrições a partir do qual o modelo é "grande"
+    'MIN_SAMPLES': 5,        # Amostras por formato antes de rotear pelo resolvedor mais rápido
+    'EXPLORE': 0,            # Fração das resoluções enviada a candidatos ainda sem MIN_SAMPLES (0 = sem exploração)
+    'TIME_LIMIT': 60,        # Tempo máximo de cada resolução, em segundos (a requisição pode pedir menos)
+    'GAP_REL': 1e-4,         # Gap relativo padrão em modelos inteiros
+    'PRESOLVE': True,        # Reduz o problema antes de resolvê-lo (ver solver/presolve.py)
+    'CBC_OPTIONS': {         # Opções extras do resolvedor 'pulp-cbc-tuned'
+        'threads': 2,
+    },
+}
+
+# Limitante do resumo que o CBC grava no log ("Upper bound" ao maximizar)
+BOUND_PATTERN = re.compile(r'^(?:Lower|Upper) bound:\s*(\S+)', re.MULTILINE)
+
+
+def backend_settings():
+    return {**DEFAULT_SETTINGS, **getattr(settings, 'SOLVER_BACKENDS', {})}
+
+
+# Função para descrever o formato do problema (usado na seleção e nas métricas)
+def problem_shape(problem):
+    names = set(parse_linear(problem['objectiveFunction']))
+    constraints = 0
+    for c in problem['constraints']:
+        parsed = parse_constraint(c)
+        if parsed:
+            names.update(parsed[0])
+            constraints += 1
+    declared = problem.get('variables', {})
+    return {
+        'variables': len(names),
+        'constraints': constraints,
+        'planar': names == {'x1', 'x2'} and not declared,
+        'integer': any(spec['cat'] != 'Continuous' for spec in declared.values()),
+    }
+
+
+# Função para os limites de uma resolução: os pedidos em "limits", até o máximo do servidor
+def solver_limits(problem=None):
+    options = backend_settings()
+    requested = (problem or {}).get('limits', {})
+    return {
+        'timeLimit': min(requested.get('timeLimit') or options['TIME_LIMIT'], options['TIME_LIMIT']),
+        'gapRel': requested.get('gapRel', options['GAP_REL']),
+    }
+
+
+# Função para ler do log do CBC o limitante da melhor solução possível
+def cbc_bound(log_path):
+    try:
+        with open(log_path, encoding='utf-8', errors='replace') as f:
+            matches = BOUND_PATTERN.findall(f.read())
+    except OSError:
+        return None
+    try:
+        return float(matches[-1]) if matches else None
+    except ValueError:
+        return None
+
+
+# Função para o limitante e o gap relativo da solução de um modelo inteiro
+def mip_report(objective, bound, status):
+    """
+    Sem limitante no log (ótimo provado sem tolerância), o limitante é o
+    próprio objetivo. Sem solução incumbente não há gap.
+    """
+    if bound is None and status == 'Optimal':
+        bound = objective
+    gap = None
+    if objective is not None and bound is not None:
+        gap = round(abs(bound - objective) / max(abs(objective), 1e-10), 6)
+    return {'bound': bound, 'gap': gap}
+
+
+# Context manager para o log do CBC: em modelos inteiros, sem `log_path`, usa um arquivo temporário
+@contextmanager
+def cbc_log(model, log_path=None):
+    if log_path is not None or not model.isMIP():
+        yield log_path
+        return
+    fd, path = tempfile.mkstemp(prefix='solver-cbc-', suffix='.log')
+    os.close(fd)
+    try:
+        yield path
+    finally:
+        os.remove(path)
+
+
+# Função para agrupar formatos parecidos (potências de 2) em uma mesma faixa de métricas
+def shape_bucket(shape):
+    def ceil_pow2(n):
+        return 1 << max(n - 1, 0).bit_length()
+
+    bucket = f"n{ceil_pow2(shape['variables'])}-m{ceil_pow2(shape['constraints'])}"
+    return bucket + '-int' if shape['integer'] else bucket
+
+
+class SolverBackend(ABC):
+    """
+    Interface dos resolvedores. `solve(problem)` recebe o problema de
+    read_problem e retorna a solução no formato de model_solution, ou None
+    quando não chega a um ótimo (o problema segue para o 'pulp-cbc').
+    Resolvedores com log (CBC) o gravam em `log_path`, quando informado.
+    """
+
+    name = None
+
+    def available(self):
+        return True
+
+    def supports(self, shape):
+        return True
+
+    @abstractmethod
+    def solve(self, problem, log_path=None):
+        pass
+
+
+class PlanarBackend(SolverBackend):
+    name = 'numpy-2d'
+
+    def supports(self, shape):
+        return shape['planar'] and not shape['integer'] and shape['constraints'] <= MAX_CONSTRAINTS
+
+    def solve(self, problem, log_path=None):
+        with span('planar'):
+            return solve_planar(problem)
+
+
+class PulpCbcBackend(SolverBackend):
+    name = 'pulp-cbc'
+
+    def options(self):
+        return {}
+
+    def solver(self, problem=None, log_path=None):
+        """O CBC com os limites de tempo e gap do problema (ver solver_limits)."""
+        return PULP_CBC_CMD(msg=False, logPath=log_path, **self.options(), **solver_limits(problem))
+
+    def solve(self, problem, log_path=None):
+        with span('build'):
+            model, constraint_lines, restriction_points = build_model(problem)
+        with cbc_log(model, log_path) as path:
+            with span('cbc'):
+                model.solve(self.solver(problem, path))
+            return cbc_solution(model, constraint_lines, restriction_points, path)
+
+
+class TunedCbcBackend(PulpCbcBackend):
+    name = 'pulp-cbc-tuned'
+
+    def options(self):
+        return backend_settings()['CBC_OPTIONS']
+
+
+# Função para a solução de um modelo resolvido pelo CBC, com limitante e gap se for inteiro
+def cbc_solution(model, constraint_lines, restriction_points, log_path=None):
+    solution = model_solution(model, constraint_lines, restriction_points)
+    if model.isMIP():
+        solution.update(mip_report(solution['objective_result'], cbc_bound(log_path), solution['status']))
+    return solution
+
+
+# Função para converter um modelo PuLP nas matrizes de scipy.optimize.linprog
+def model_arrays(model):
+    variables = model.variables()
+    index = {v.name: j for j, v in enumerate(variables)}
+
+    c = np.zeros(len(variables))
+    for var, coef in model.objective.items():
+        c[index[var.name]] = coef
+    if model.sense == LpMaximize:
+        c = -c
+
+    rows = {'ub': ([], []), 'eq': ([], [])}
+    for constraint in model.constraints.values():
+        row = np.zeros(len(variables))
+        for var, coef in constraint.items():
+            row[index[var.name]] = coef
+        rhs = -constraint.constant
+        if constraint.sense == LpConstraintEQ:
+            kind = 'eq'
+        elif constraint.sense == LpConstraintGE:
+            kind, row, rhs = 'ub', -row, -rhs
+        else:
+            kind = 'ub'
+        rows[kind][0].append(row)
+        rows[kind][1].append(rhs)
+
+    arrays = {'c': c, 'bounds': [(v.lowBound, v.upBound) for v in variables]}
+    for kind, (A, b) in rows.items():
+        arrays[f'A_{kind}'] = np.array(A) if A else None
+        arrays[f'b_{kind}'] = np.array(b) if b else None
+    integrality = np.array([v.cat == 'Integer' for v in variables], dtype=int)
+    if integrality.any():
+        arrays['integrality'] = integrality
+    return variables, arrays
+
+
+class ScipyHighsBackend(SolverBackend):
+    name = 'scipy-highs'
+
+    def available(self):
+        return importlib.util.find_spec('scipy') is not None
+
+    def solve(self, problem, log_path=None):
+        from scipy.optimize import linprog
+
+        with span('build'):
+            model, constraint_lines, restriction_points = build_model(problem)
+            variables, arrays = model_arrays(model)
+        limits = solver_limits(problem)
+        options = {'time_limit': limits['timeLimit']}
+        if 'integrality' in arrays:
+            options['mip_rel_gap'] = limits['gapRel']
+
+        with span('highs'):
+            result = linprog(method='highs', options=options, **arrays)
+        # status 1: limite de tempo; em modelos inteiros, x é a melhor solução encontrada
+        incumbent = result.status == 1 and 'integrality' in arrays and result.x is not None
+        if result.status != 0 and not incumbent:
+            return None
+        for var, x in zip(variables, result.x):
+            var.varValue = float(x)
+        model.status = 1
+        if incumbent:
+            model.sol_status = LpSolutionIntegerFeasible
+        solution = model_solution(model, constraint_lines, restriction_points)
+        if 'integrality' in arrays:
+            bound = getattr(result, 'mip_dual_bound', None)
+            if bound is not None and model.sense == LpMaximize:
+                bound = -bound
+            solution.update(mip_report(solution['objective_result'], bound, solution['status']))
+        return solution
+
+
+# Registro dos resolvedores, na ordem de preferência da seleção automática
+BACKENDS = OrderedDict()
+
+
+def register_backend(backend):
+    BACKENDS[backend.name] = backend
+    return backend
+
+
+register_backend(PlanarBackend())
+register_backend(PulpCbcBackend())
+register_backend(TunedCbcBackend())
+register_backend(ScipyHighsBackend())
+
+
+class LatencyMetrics:
+    """
+    Tempos de resolução por (resolvedor, faixa de formato): contagem, soma,
+    mínimo e máximo, em segundos. As métricas são do processo atual.
+    """
+
+    def __init__(self):
+        self._stats = {}
+        self._lock = threading.Lock()
+
+    def record(self, backend, bucket, seconds):
+        with self._lock:
+            stats = self._stats.setdefault((backend, bucket), [0, 0.0, seconds, seconds])
+            stats[0] += 1
+            stats[1] += seconds
+            stats[2] = min(stats[2], seconds)
+            stats[3] = max(stats[3], seconds)
+
+    def mean(self, backend, bucket, min_samples=1):
+        with self._lock:
+            stats = self._stats.get((backend, bucket))
+        if stats is None or stats[0] < min_samples:
+            return None
+        return stats[1] / stats[0]
+
+    def count(self, backend, bucket):
+        with self._lock:
+            stats = self._stats.get((backend, bucket))
+        return stats[0] if stats else 0
+
+    def snapshot(self):
+        with self._lock:
+            items = sorted(self._stats.items())
+        report = {}
+        for (backend, bucket), (count, total, low, high) in items:
+            report.setdefault(bucket, {})[backend] = {
+                'count': count,
+                'total_ms': round(total * 1000, 3),
+                'mean_ms': round(total / count * 1000, 3),
+                'min_ms': round(low * 1000, 3),
+                'max_ms': round(high * 1000, 3),
+            }
+        return report
+
+
+_metrics = LatencyMetrics()
+
+
+def get_backend_metrics():
+    return _metrics
+
+
+# Função para escolher o resolvedor de um problema
+def select_backend(shape, requested=None, explore=True):
+    """
+    Com `requested` (campo "solver" da requisição), usa esse resolvedor ou
+    levanta ValueError se ele não estiver disponível ou não aceitar o
+    problema. Sem ele: quando todos os candidatos já têm MIN_SAMPLES
+    medições nesta faixa de formato, usa o mais rápido; senão, uma fração
+    EXPLORE das resoluções vai para o candidato com menos medições (para
+    que todos cheguem a MIN_SAMPLES) e as demais seguem a regra fixa
+    (2-D contínuo → numpy-2d; grande ou inteiro → scipy-highs ou
+    pulp-cbc-tuned; demais → pulp-cbc). Com `explore` False, não há
+    exploração (resoluções reproduzíveis, como as da galeria).
+    """
+    options = backend_settings()
+    requested = requested or options['DEFAULT']
+    if requested:
+        backend = BACKENDS.get(requested)
+        if backend is None or not backend.available():
+            raise ValueError(f'Resolvedor indisponível: {requested}')
+        if not backend.supports(shape):
+            raise ValueError(f'O resolvedor {requested} não aceita este problema.')
+        return backend
+
+    candidates = [b for b in BACKENDS.values() if b.available() and b.supports(shape)]
+    bucket = shape_bucket(shape)
+    means = [_metrics.mean(b.name, bucket, options['MIN_SAMPLES']) for b in candidates]
+    if None not in means:
+        return candidates[int(np.argmin(means))]
+    if explore and random.random() < options['EXPLORE']:
+        return min(candidates, key=lambda b: _metrics.count(b.name, bucket))
+
+    if BACKENDS['numpy-2d'] in candidates:
+        return BACKENDS['numpy-2d']
+    if shape['integer'] or shape['variables'] * shape['constraints'] >= options['LARGE_MODEL']:
+        highs = BACKENDS['scipy-highs']
+        return highs if highs in candidates else BACKENDS['pulp-cbc-tuned']
+    return BACKENDS['pulp-cbc']
+
+
+def _record(backend, shape, started, solution, presolve_stats=None, original=None):
+    if presolve_stats is not None:
+        solution['presolve'] = presolve_stats
+    if original is not None and solution['constraint_lines'] is not None:
+        # O presolve remove e reordena restrições: as retas do gráfico e os rótulos
+        # "Restrição N" da resposta vêm das restrições do usuário, na ordem original
+        solution['constraint_lines'], solution['restriction_points'] = constraint_geometry(original['constraints'])
+    solution['backend'] = backend.name
+    solution['shape'] = shape_bucket(shape)
+    solution['solve_ms'] = round((time.perf_counter() - started) * 1000, 3)
+    record_latency(solution)
+    return solution
+
+
+# Função para registrar o tempo de uma solução (também usada pelo processo principal do lote)
+def record_latency(solution):
+    _metrics.record(solution['backend'], solution['shape'], solution['solve_ms'] / 1000)
+
+
+# Função para aplicar o presolve ao problema, se habilitado
+def reduce_problem(problem):
+    """
+    Retorna (problema reduzido, estatísticas, solução). A solução só existe
+    quando o presolve já mostra que o problema é inviável ou ilimitado; ela
+    é registrada com o resolvedor 'presolve'.
+    """
+    if not backend_settings()['PRESOLVE']:
+        return problem, None, None
+    started = time.perf_counter()
+    with span('presolve'):
+        reduced, stats = presolve(problem)
+    if stats['status'] is None:
+        return reduced, stats, None
+    solution = presolved_solution(problem, stats)
+    solution['backend'] = 'presolve'
+    solution['shape'] = shape_bucket(problem_shape(problem))
+    solution['solve_ms'] = round((time.perf_counter() - started) * 1000, 3)
+    record_latency(solution)
+    return problem, stats, solution
+
+
+# Função para resolver um problema com o resolvedor selecionado
+def solve(problem, requested=None, log_path=None, explore=True):
+    """
+    Retorna a solução (formato de model_solution) com 'backend', 'shape'
+    (faixa de formato), 'solve_ms' e 'presolve' (estatísticas da redução).
+    O problema reduzido só é usado para resolver; as retas e os pontos das
+    restrições são os do problema original.
+    Se o resolvedor escolhido não chegar a um ótimo, o problema
+    é resolvido pelo 'pulp-cbc', que preserva o comportamento original.
+    """
+    original = problem
+    problem, stats, solution = reduce_problem(problem)
+    if solution is not None:
+        return solution
+    shape = problem_shape(problem)
+    backend = select_backend(shape, requested, explore)
+    started = time.perf_counter()
+    solution = backend.solve(problem, log_path)
+    if solution is None:
+        backend = BACKENDS['pulp-cbc']
+        started = time.perf_counter()
+        solution = backend.solve(problem, log_path)
+    if presolve_inconclusive(stats, solution):
+        backend, shape = BACKENDS['pulp-cbc'], problem_shape(original)
+        started = time.perf_counter()
+        solution = backend.solve(original, log_path)
+    return _record(backend, shape, started, solution, stats, original)
+
+
+# Função para verificar se o status do problema reduzido precisa ser confirmado no original
+def presolve_inconclusive(stats, solution):
+    """
+    Variáveis que viram limites saem das restrições: um problema ilimitado
+    nessas variáveis pode chegar ao CBC como inviável (e vice-versa). Por
+    isso, 'Infeasible' e 'Unbounded' do problema reduzido são refeitos no
+    problema original, sem presolve.
+    """
+    return stats is not None and solution.get('status') in ('Infeasible', 'Unbounded')
+
+
+# Versão assíncrona: o CBC roda como subprocesso (solver/cbc.py), os demais em uma thread
+async def solve_async_problem(problem, requested=None):
+    original = problem
+    problem, stats, solution = reduce_problem(problem)
+    if solution is not None:
+        return solution
+    shape = problem_shape(problem)
+    backend = select_backend(shape, requested)
+    started = time.perf_counter()
+    solution = None
+    if not isinstance(backend, PulpCbcBackend):
+        solution = await asyncio.to_thread(backend.solve, problem)
+    if solution is None:
+        if not isinstance(backend, PulpCbcBackend):
+            backend = BACKENDS['pulp-cbc']
+            started = time.perf_counter()
+        solution = await _solve_cbc_async(backend, problem)
+    if presolve_inconclusive(stats, solution):
+        backend, shape = BACKENDS['pulp-cbc'], problem_shape(original)
+        started = time.perf_counter()
+        solution = await _solve_cbc_async(backend, original)
+    return _record(backend, shape, started, solution, stats, original)
+
+
+async def _solve_cbc_async(backend, problem):
+    from .cbc import solve_async
+
+    with span('build'):
+        model, constraint_lines, restriction_points = build_model(problem)
+    with cbc_log(model) as path:
+        with span('cbc'):
+            await solve_async(model, solver=backend.solver(problem, path))
+        return cbc_solution(model, constraint_lines, restriction_points, path)
+
+
+# Função para resolver um problema completo (usada nos processos do lote)
+def solve_problem(problem):
+    return solve(problem, problem.get('solver'))
+
+
+# Função executada pelos processos da fila de jobs (ver solver/jobs.py)
+def serve_jobs(connection):
+    """
+    Avisa que está pronto (None), recebe (id, problema) pelo Pipe e devolve
+    (id, solução, etapas, erro), até receber None ou o Pipe ser fechado. O
+    processo abre um grupo próprio para que o CBC, seu subprocesso, seja
+    encerrado junto com ele quando o job é cancelado ou estoura o tempo.
+    """
+    if hasattr(os, 'setpgrp'):
+        os.setpgrp()
+    connection.send(None)  # Pronto: módulos importados
+    while True:
+        try:
+            message = connection.recv()
+        except EOFError:
+            return
+        if message is None:
+            return
+        job_id, problem = message
+        try:
+            solution, spans = traced_call(solve_problem, problem)
+            connection.send((job_id, solution, spans, None))
+        except Exception as e:
+            connection.send((job_id, None, [], str(e)))
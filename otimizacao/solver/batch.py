@@ -0,0 +1,32 @@
+import atexit
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+from django.conf import settings
+
+DEFAULT_SETTINGS = {
+    'WORKERS': 4,        # Processos que resolvem os modelos de um lote
+    'MAX_ITEMS': 500,    # Número máximo de modelos por requisição
+}
+
+_solve_executor = None
+_solve_executor_lock = threading.Lock()
+
+
+def batch_settings():
+    return {**DEFAULT_SETTINGS, **getattr(settings, 'SOLVER_BATCH', {})}
+
+
+# Função para obter o pool de processos que resolve os modelos dos lotes
+def get_solve_executor():
+    global _solve_executor
+    if _solve_executor is None:
+        with _solve_executor_lock:
+            if _solve_executor is None:
+                _solve_executor = ProcessPoolExecutor(
+                    max_workers=batch_settings()['WORKERS'],
+                    mp_context=multiprocessing.get_context('spawn'),
+                )
+                atexit.register(_solve_executor.shutdown, wait=False, cancel_futures=True)
+    return _solve_executor
@@ -0,0 +1,190 @@
+import gc
+import json
+import platform
+import random
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+import numpy as np
+import pulp
+from django.test import Client, override_settings
+from pulp import PULP_CBC_CMD
+
+from . import parser
+from .backends import solve
+from .cache import get_result_cache
+from .problem import build_model, constraint_geometry, parse_expression, read_problem
+from .rendering import render_graph
+
+# Tamanhos dos casos: (variáveis, restrições). Casos com 2 variáveis também medem o gráfico.
+SIZES = ((2, 5), (2, 20), (2, 100), (10, 10), (50, 40), (200, 150))
+QUICK_SIZES = ((2, 5), (10, 10))
+
+STAGES = ('parse', 'build', 'solve', 'backend', 'render', 'view')
+
+
+# Função para gerar um problema aleatório, factível e limitado, no formato de optimize
+def random_spec(rng, variables, constraints):
+    """
+    Sorteia um ponto x0 >= 0 e restrições satisfeitas por ele (x0 é sempre
+    factível). Todas as variáveis aparecem com coeficiente positivo em
+    alguma restrição <=, então a maximização de custos positivos é limitada.
+    """
+    x0 = [rng.uniform(0, 10) for _ in range(variables)]
+    specs = []
+    for i in range(constraints):
+        # Cada restrição tem a variável i % n e mais algumas sorteadas
+        chosen = {i % variables} | {rng.randrange(variables) for _ in range(min(variables - 1, 4))}
+        coefficients = {j: rng.randint(1, 9) for j in sorted(chosen)}
+        activity = sum(a * x0[j] for j, a in coefficients.items())
+        lhs = '+'.join(f'{a}x{j + 1}' for j, a in coefficients.items())
+        if i >= variables and rng.random() < 0.2:
+            specs.append(f'{lhs}>={round(activity - rng.uniform(0, 5), 2)}')
+        else:
+            specs.append(f'{lhs}<={round(activity + rng.uniform(0, 5), 2)}')
+
+    return {
+        'objective': 'maximize',
+        'objectiveFunction': '+'.join(f'{rng.randint(1, 9)}x{j + 1}' for j in range(variables)),
+        'constraints': specs,
+    }
+
+
+# Função para medir uma função repetidas vezes: percentis, vazão e pico de memória
+def measure(function, setup=None, repeat=20):
+    """
+    `setup()` (fora da medição) prepara o argumento de cada chamada. Os
+    tempos são medidos sem tracemalloc; o pico de memória vem de uma
+    execução extra com tracemalloc ligado.
+    """
+    def call():
+        arguments = (setup(),) if setup else ()
+        started = time.perf_counter()
+        function(*arguments)
+        return time.perf_counter() - started
+
+    call()  # Aquecimento
+    gc.collect()
+    samples = np.array([call() for _ in range(repeat)]) * 1000
+
+    tracemalloc.start()
+    try:
+        call()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        'p50_ms': round(float(np.percentile(samples, 50)), 3),
+        'p95_ms': round(float(np.percentile(samples, 95)), 3),
+        'mean_ms': round(float(samples.mean()), 3),
+        'throughput_per_s': round(1000 / samples.mean(), 2) if samples.mean() else None,
+        'peak_kib': round(peak / 1024, 1),
+    }
+
+
+# Função para medir as etapas do pipeline para um problema
+def benchmark_case(data, stages=STAGES, repeat=20, client=None):
+    problem = read_problem(data)
+    planar = set(parser.parse_linear(problem['objectiveFunction'])) == {'x1', 'x2'}
+    results = {}
+
+    if 'parse' in stages:
+        def parse_all():
+            parser.cache_clear()
+            parse_expression(problem['objectiveFunction'], {})
+            for c in problem['constraints']:
+                parser.parse_constraint(c)
+        results['parse'] = measure(parse_all, repeat=repeat)
+
+    if 'build' in stages:
+        results['build'] = measure(lambda: build_model(problem), repeat=repeat)
+
+    if 'solve' in stages:
+        results['solve'] = measure(
+            lambda model: model.solve(PULP_CBC_CMD(msg=False)),
+            setup=lambda: build_model(problem)[0],
+            repeat=repeat,
+        )
+
+    if 'backend' in stages:
+        results['backend'] = measure(lambda: solve(problem), repeat=repeat)
+
+    if 'render' in stages and planar:
+        solution = solve(problem)
+        constraint_lines, _ = constraint_geometry(problem['constraints'])
+        results['render'] = measure(
+            lambda: render_graph(constraint_lines, problem['nonNegativity'], solution['optimal_point'][:2]),
+            repeat=max(repeat // 4, 1),
+        )
+
+    if 'view' in stages:
+        client = client or Client()
+        body = json.dumps(data)
+
+        def post(_):
+            response = client.post('/solver/optimize/', body, content_type='application/json')
+            if response.status_code != 200:
+                raise RuntimeError(f'optimize respondeu {response.status_code}: {response.content[:200]}')
+
+        # O cache de resultados é limpo antes de cada chamada: mede a resolução, não o cache
+        results['view'] = measure(post, setup=get_result_cache().clear, repeat=repeat)
+
+    return results
+
+
+# Função para executar a suíte completa
+def run_benchmarks(sizes=SIZES, stages=STAGES, repeat=20, seed=1234):
+    """
+    Retorna {'meta': {...}, 'results': {'n2-m5': {'parse': {...}, ...}}}.
+    Os problemas dependem apenas de `seed`, então execuções com a mesma
+    semente medem exatamente os mesmos modelos. O histórico no banco é
+    desligado durante a suíte.
+    """
+    rng = random.Random(seed)
+    results = {}
+    started = time.perf_counter()
+    with override_settings(SOLVER_HISTORY={'ENABLED': False}):
+        client = Client()
+        for variables, constraints in sizes:
+            data = random_spec(rng, variables, constraints)
+            results[f'n{variables}-m{constraints}'] = benchmark_case(data, stages, repeat, client)
+
+    return {
+        'meta': {
+            'created_at': datetime.now(timezone.utc).isoformat(),
+            'seed': seed,
+            'repeat': repeat,
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'numpy': np.__version__,
+            'pulp': pulp.__version__,
+            'elapsed_s': round(time.perf_counter() - started, 3),
+        },
+        'results': results,
+    }
+
+
+# Função para comparar uma execução com a linha de base salva
+def compare(baseline, current, threshold=0.2, metric='p50_ms'):
+    """
+    Retorna uma linha por (caso, etapa) presente nas duas execuções, com a
+    razão atual/base e se ela passou de 1 + threshold (regressão).
+    """
+    rows = []
+    for case, stages in current['results'].items():
+        for stage, stats in stages.items():
+            base = baseline['results'].get(case, {}).get(stage)
+            if base is None or not base[metric]:
+                continue
+            ratio = stats[metric] / base[metric]
+            rows.append({
+                'case': case,
+                'stage': stage,
+                'baseline': base[metric],
+                'current': stats[metric],
+                'ratio': round(ratio, 3),
+                'regression': ratio > 1 + threshold,
+            })
+    return rows
@@ -0,0 +1,144 @@
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import caches
+
+from .parser import parse_constraint, parse_linear
+
+DEFAULT_SETTINGS = {
+    'ALIAS': None,        # Alias de um backend em CACHES (None = cache em memória do processo)
+    'MAX_ENTRIES': 256,   # Limite de entradas do cache em memória (LRU)
+    'TTL': 60 * 60,       # Tempo de vida de cada entrada, em segundos
+    'KEY_PREFIX': 'solver:result:',
+}
+
+
+# Função para normalizar uma expressão em uma lista ordenada de (variável, coeficiente)
+def canonical_expression(expression):
+    return sorted(parse_linear(expression).items())
+
+
+# Função para gerar a chave canônica de um problema
+def problem_key(objective, objective_function, constraints, non_negativity, variables=None, limits=None,
+                solver=None):
+    """
+    Gera uma chave (sha256) que identifica o problema independentemente de
+    espaços, coeficientes implícitos ou ordem dos termos. A ordem das
+    restrições é preservada, pois ela define os rótulos da resposta. Tipos
+    e limites de variáveis e os limites de resolução (que mudam a solução
+    incumbente) só entram na chave quando informados. O resolvedor pedido
+    também: com "solver", a resposta precisa vir desse resolvedor, e não
+    de um resultado guardado por outro.
+    """
+    canonical_constraints = []
+    for c in constraints:
+        parsed = parse_constraint(c)
+        if parsed:
+            coefficients, operator, rhs = parsed
+            canonical_constraints.append([sorted(coefficients.items()), operator, rhs])
+
+    canonical = {
+        'sense': 'maximize' if objective == 'maximize' else 'minimize',
+        'objective': canonical_expression(objective_function),
+        'constraints': canonical_constraints,
+        'nonNegativity': {
+            'x1': bool(non_negativity.get('x1', True)),
+            'x2': bool(non_negativity.get('x2', True)),
+        },
+    }
+    if variables:
+        canonical['variables'] = variables
+    if limits:
+        canonical['limits'] = limits
+    if solver:
+        canonical['solver'] = solver
+    payload = json.dumps(canonical, sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class ResultCache:
+    """
+    Cache de resultados de otimização com despejo LRU e expiração por TTL.
+    Quando `alias` é informado, delega para o backend de cache do Django
+    correspondente (que aplica sua própria política de despejo).
+    """
+
+    def __init__(self, max_entries=256, ttl=3600, alias=None, key_prefix='solver:result:'):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.alias = alias
+        self.key_prefix = key_prefix
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_settings(cls):
+        options = {**DEFAULT_SETTINGS, **getattr(settings, 'SOLVER_CACHE', {})}
+        return cls(
+            max_entries=options['MAX_ENTRIES'],
+            ttl=options['TTL'],
+            alias=options['ALIAS'],
+            key_prefix=options['KEY_PREFIX'],
+        )
+
+    def get(self, key):
+        if self.alias:
+            return caches[self.alias].get(self.key_prefix + key)
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at is not None and expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        if self.alias:
+            caches[self.alias].set(self.key_prefix + key, value, timeout=self.ttl)
+            return
+
+        expires_at = time.monotonic() + self.ttl if self.ttl else None
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, key):
+        if self.alias:
+            caches[self.alias].delete(self.key_prefix + key)
+            return
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        if self.alias:
+            caches[self.alias].clear()
+            return
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+_result_cache = None
+_result_cache_lock = threading.Lock()
+
+
+# Função para obter o cache de resultados configurado em settings.SOLVER_CACHE
+def get_result_cache():
+    global _result_cache
+    if _result_cache is None:
+        with _result_cache_lock:
+            if _result_cache is None:
+                _result_cache = ResultCache.from_settings()
+    return _result_cache
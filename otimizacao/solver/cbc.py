@@ -0,0 +1,100 @@
+import asyncio
+import weakref
+
+from django.conf import settings
+from pulp import PULP_CBC_CMD, LpMaximize, PulpSolverError
+
+DEFAULT_SETTINGS = {
+    'MAX_CONCURRENT': 8,   # Processos CBC simultâneos por processo ASGI
+    'TIMEOUT': 30,         # Tempo máximo por requisição (fila + resolução), em segundos
+}
+
+_semaphores = weakref.WeakKeyDictionary()
+
+
+def async_settings():
+    return {**DEFAULT_SETTINGS, **getattr(settings, 'SOLVER_ASYNC', {})}
+
+
+# Função para obter o semáforo que limita os processos CBC no event loop atual
+def _semaphore():
+    loop = asyncio.get_running_loop()
+    semaphore = _semaphores.get(loop)
+    if semaphore is None:
+        semaphore = _semaphores[loop] = asyncio.Semaphore(async_settings()['MAX_CONCURRENT'])
+    return semaphore
+
+
+async def _run_cbc(model, time_limit, solver):
+    if not solver.executable(solver.path):
+        raise PulpSolverError(f"Pulp: cannot execute {solver.path}")
+
+    tmp_mps, tmp_sol = solver.create_tmp_files(model.name, 'mps', 'sol')
+    try:
+        vs, variables_names, constraints_names, _ = model.writeMPS(tmp_mps, rename=1)
+
+        # Mesmos argumentos que PULP_CBC_CMD.solve_CBC monta a partir das opções do resolvedor
+        args = [solver.path, tmp_mps]
+        if model.sense == LpMaximize:
+            args.append('-max')
+        if solver.timeLimit is not None:
+            time_limit = min(time_limit, solver.timeLimit) if time_limit else solver.timeLimit
+        if time_limit:
+            args += ['-sec', str(time_limit)]
+        for option in solver.options + solver.getOptions():
+            args += ('-' + option).split()
+        args += ['-branch', '-printingOptions', 'all', '-solution', tmp_sol]
+
+        # Com logPath, a saída do CBC vai para o log (como em PULP_CBC_CMD.solve_CBC)
+        log_path = solver.optionsDict.get('logPath')
+        log = open(log_path, 'w') if log_path else None
+        async with _semaphore():
+            try:
+                process = await asyncio.create_subprocess_exec(
+                    *args,
+                    stdin=asyncio.subprocess.DEVNULL,
+                    stdout=log or asyncio.subprocess.DEVNULL,
+                    stderr=asyncio.subprocess.DEVNULL,
+                )
+                try:
+                    returncode = await process.wait()
+                except BaseException:
+                    # Timeout ou cliente desconectado: encerra o CBC imediatamente
+                    if process.returncode is None:
+                        process.kill()
+                    raise
+            finally:
+                if log is not None:
+                    log.close()
+
+        if returncode != 0:
+            raise PulpSolverError(f"Pulp: Error while trying to execute {solver.path}")
+
+        status, values, reduced_costs, shadow_prices, slacks, sol_status = solver.readsol_MPS(
+            tmp_sol, model, vs, variables_names, constraints_names
+        )
+        model.assignVarsVals(values)
+        model.assignVarsDj(reduced_costs)
+        model.assignConsPi(shadow_prices)
+        model.assignConsSlack(slacks, activity=True)
+        model.assignStatus(status, sol_status)
+        return status
+    finally:
+        solver.delete_tmp_files(tmp_mps, tmp_sol)
+
+
+# Função para resolver um modelo PuLP sem bloquear o event loop
+async def solve_async(model, timeout=None, solver=None):
+    """
+    Executa o CBC como subprocesso assíncrono, com as opções (threads,
+    gapRel, timeLimit...) de `solver`, um PULP_CBC_CMD. O número de processos CBC
+    simultâneos é limitado por settings.SOLVER_ASYNC['MAX_CONCURRENT'] e o
+    tempo total (espera na fila + resolução) por `timeout`. Se o tempo
+    estourar ou a tarefa for cancelada (cliente desconectou), o processo CBC
+    é encerrado. Levanta asyncio.TimeoutError quando o tempo estoura.
+    """
+    if timeout is None:
+        timeout = async_settings()['TIMEOUT']
+    if solver is None:
+        solver = PULP_CBC_CMD(msg=False)
+    return await asyncio.wait_for(_run_cbc(model, timeout, solver), timeout)
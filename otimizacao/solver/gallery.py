@@ -0,0 +1,249 @@
+import hashlib
+import json
+import os
+import re
+import threading
+
+from django.conf import settings
+
+# Problemas de livro-texto resolvidos por `python manage.py build_gallery`
+EXAMPLES = [
+    {
+        'slug': 'wyndor',
+        'title': 'Wyndor Glass',
+        'description': 'Mix de produção de duas linhas de produtos com três fábricas (Hillier e Lieberman).',
+        'problem': {
+            'objective': 'maximize',
+            'objectiveFunction': '3x1+5x2',
+            'constraints': ['x1<=4', '2x2<=12', '3x1+2x2<=18'],
+        },
+    },
+    {
+        'slug': 'reddy-mikks',
+        'title': 'Reddy Mikks',
+        'description': 'Tintas para exteriores e interiores com limites de matéria-prima e de demanda (Taha).',
+        'problem': {
+            'objective': 'maximize',
+            'objectiveFunction': '5x1+4x2',
+            'constraints': ['6x1+4x2<=24', 'x1+2x2<=6', '-x1+x2<=1', 'x2<=2'],
+        },
+    },
+    {
+        'slug': 'dieta',
+        'title': 'Problema da dieta',
+        'description': 'Menor custo de dois alimentos que atendem às exigências mínimas de nutrientes.',
+        'problem': {
+            'objective': 'minimize',
+            'objectiveFunction': '3x1+2x2',
+            'constraints': ['2x1+x2>=8', 'x1+3x2>=9', 'x1+x2>=5'],
+        },
+    },
+    {
+        'slug': 'solucoes-multiplas',
+        'title': 'Soluções ótimas múltiplas',
+        'description': 'A função objetivo é paralela a uma restrição ativa: todo o segmento é ótimo.',
+        'problem': {
+            'objective': 'maximize',
+            'objectiveFunction': '2x1+4x2',
+            'constraints': ['x1+2x2<=5', 'x1+x2<=4'],
+        },
+    },
+    {
+        'slug': 'inteiro',
+        'title': 'Programação inteira',
+        'description': 'O ótimo inteiro difere do arredondamento do ótimo da relaxação linear.',
+        'problem': {
+            'objective': 'maximize',
+            'objectiveFunction': 'x1+0.64x2',
+            'constraints': ['50x1+31x2<=250', '3x1-2x2>=-4'],
+            'variables': {'x1': 'integer', 'x2': 'integer'},
+        },
+    },
+]
+
+DEFAULT_SETTINGS = {
+    'CATALOG': None,        # Lista de problemas (como EXAMPLES) ou caminho de um arquivo JSON
+    'OUTPUT_DIR': None,     # Padrão: solver/static/gallery (incluída pelo collectstatic)
+    'STATIC_PREFIX': 'gallery',
+    # Gráficos gerados por problema: nome -> parâmetros de variante (ver solver/variants.py)
+    'VARIANTS': {
+        'graph': {},
+        'thumb': {'size': 'thumb', 'format': 'webp'},
+        'svg': {'format': 'svg'},
+    },
+    # Com True, as URLs da galeria apontam para STATIC_URL (arquivos servidos pelo servidor web)
+    'USE_STATIC_URL': False,
+    'MAX_AGE': 300,         # Cache-Control da listagem, em segundos
+}
+
+MANIFEST = 'manifest.json'
+
+# Arquivos com impressão digital nunca mudam de conteúdo
+IMMUTABLE_MAX_AGE = 365 * 24 * 60 * 60
+
+SLUG_PATTERN = re.compile(r'[a-z0-9]+(?:-[a-z0-9]+)*')
+FILE_PATTERN = re.compile(r'[a-z0-9-]+\.[0-9a-f]{12}\.(json|png|svg|webp)')
+
+CONTENT_TYPES = {
+    'json': 'application/json',
+    'png': 'image/png',
+    'svg': 'image/svg+xml',
+    'webp': 'image/webp',
+}
+
+
+def gallery_settings():
+    options = {**DEFAULT_SETTINGS, **getattr(settings, 'SOLVER_GALLERY', {})}
+    if options['OUTPUT_DIR'] is None:
+        options['OUTPUT_DIR'] = os.path.join(settings.BASE_DIR, 'solver', 'static', options['STATIC_PREFIX'])
+    return options
+
+
+# Função para ler e validar o catálogo de problemas da galeria
+def load_catalog(source=None):
+    """
+    `source` é uma lista de problemas, o caminho de um arquivo JSON com
+    essa lista ou None (usa SOLVER_GALLERY['CATALOG'] ou EXAMPLES). Cada
+    problema tem slug, title, description (opcional) e problem (o corpo
+    de /optimize/). Levanta ValueError para catálogos inválidos.
+    """
+    if source is None:
+        source = gallery_settings()['CATALOG']
+    if source is None:
+        source = EXAMPLES
+    if isinstance(source, (str, os.PathLike)):
+        try:
+            with open(source, encoding='utf-8') as f:
+                source = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            raise ValueError(f'Não foi possível ler o catálogo {source}: {e}')
+    if not isinstance(source, list):
+        raise ValueError('O catálogo deve ser uma lista de problemas.')
+
+    slugs = set()
+    for item in source:
+        if not isinstance(item, dict) or not isinstance(item.get('problem'), dict):
+            raise ValueError('Cada problema do catálogo precisa de "slug", "title" e "problem".')
+        slug = item.get('slug')
+        if not isinstance(slug, str) or not SLUG_PATTERN.fullmatch(slug):
+            raise ValueError(f'Slug inválido no catálogo: {slug!r} (use letras minúsculas, dígitos e hífens).')
+        if slug in slugs:
+            raise ValueError(f'Slug repetido no catálogo: {slug}')
+        slugs.add(slug)
+    return source
+
+
+# Função para o nome de arquivo com impressão digital (sha256 do conteúdo)
+def fingerprint(stem, extension, content):
+    return f'{stem}.{hashlib.sha256(content).hexdigest()[:12]}.{extension}'
+
+
+# Função para gravar um arquivo de forma atômica (leitores nunca veem um arquivo pela metade)
+def write_file(directory, name, content):
+    path = os.path.join(directory, name)
+    tmp = f'{path}.{os.getpid()}.tmp'
+    with open(tmp, 'wb') as f:
+        f.write(content)
+    os.replace(tmp, path)
+
+
+# Função para resolver o catálogo e gravar resultados e gráficos na pasta da galeria
+def build_gallery(catalog=None, output_dir=None, clean=True):
+    """
+    Cada problema é resolvido e desenhado no próprio processo (sem cache,
+    histórico ou fila de gráficos). Resultados e gráficos são gravados com
+    impressão digital no nome; manifest.json (gravado por último) lista os
+    problemas e seus arquivos. Com `clean`, arquivos de builds anteriores
+    que o novo manifesto não usa são removidos. Retorna o manifesto.
+    """
+    # Importações tardias: matplotlib e a view só são carregados por quem gera a galeria
+    from .backends import solve
+    from .problem import read_problem
+    from .rendering import render_graph
+    from .variants import read_variant
+    from .views import cache_key_for, solution_result
+
+    options = gallery_settings()
+    catalog = load_catalog(catalog)
+    output_dir = output_dir or options['OUTPUT_DIR']
+    os.makedirs(output_dir, exist_ok=True)
+    variants = {name: read_variant(params) for name, params in options['VARIANTS'].items()}
+
+    entries = []
+    for item in catalog:
+        slug = item['slug']
+        try:
+            problem = read_problem(item['problem'])
+        except (KeyError, TypeError) as e:
+            raise ValueError(f'Problema inválido no catálogo ({slug}): {e}')
+        cache_key = cache_key_for(problem)
+        # Sem exploração de resolvedores: o mesmo catálogo gera sempre os mesmos arquivos
+        solution = solve(problem, problem['solver'], explore=False)
+        result, render = solution_result(cache_key, problem['nonNegativity'], solution)
+
+        files = {}
+        if render is not None:
+            for name, variant in variants.items():
+                content = render_graph(*render, variant=variant)
+                files[name] = fingerprint(f'{slug}-{name}', variant['format'], content)
+                write_file(output_dir, files[name], content)
+        # O resultado não aponta para /graph/: os gráficos da galeria são os arquivos acima
+        content = json.dumps(
+            {**result, 'graph_path': None}, ensure_ascii=False, sort_keys=True,
+        ).encode('utf-8')
+        files['result'] = fingerprint(slug, 'json', content)
+        write_file(output_dir, files['result'], content)
+
+        entries.append({
+            'slug': slug,
+            'title': item.get('title', slug),
+            'description': item.get('description', ''),
+            'problem': item['problem'],
+            'objective_result': result['Resultado Objetivo'],
+            'status': result.get('Status'),
+            'files': files,
+        })
+
+    body = json.dumps(entries, ensure_ascii=False, sort_keys=True).encode('utf-8')
+    manifest = {'version': hashlib.sha256(body).hexdigest()[:16], 'entries': entries}
+    write_file(output_dir, MANIFEST, json.dumps(manifest, ensure_ascii=False, indent=2).encode('utf-8'))
+
+    if clean:
+        used = {name for entry in entries for name in entry['files'].values()}
+        for name in os.listdir(output_dir):
+            if FILE_PATTERN.fullmatch(name) and name not in used:
+                os.remove(os.path.join(output_dir, name))
+    return manifest
+
+
+_manifest = None
+_manifest_lock = threading.Lock()
+
+
+# Função para ler o manifesto da galeria (relido só quando o arquivo muda)
+def load_manifest():
+    """Retorna o manifesto gerado por build_gallery, ou None se a galeria não foi gerada."""
+    global _manifest
+    path = os.path.join(gallery_settings()['OUTPUT_DIR'], MANIFEST)
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    stamp = (path, st.st_mtime_ns, st.st_size)
+    with _manifest_lock:
+        if _manifest is None or _manifest[0] != stamp:
+            with open(path, encoding='utf-8') as f:
+                _manifest = (stamp, json.load(f))
+        return _manifest[1]
+
+
+# Função para o caminho de um arquivo da galeria (None para nomes inválidos ou ausentes)
+def asset_path(name):
+    if not FILE_PATTERN.fullmatch(name):
+        return None
+    path = os.path.join(gallery_settings()['OUTPUT_DIR'], name)
+    return path if os.path.isfile(path) else None
+
+
+def asset_content_type(name):
+    return CONTENT_TYPES[name.rsplit('.', 1)[1]]
@@ -0,0 +1,179 @@
+import numpy as np
+
+EPS = 1e-9
+
+
+# Função para converter as restrições em semiplanos a·x <= b no plano (x1, x2)
+def half_planes(constraint_lines, non_negativity):
+    """
+    Recebe as restrições como tuplas (coeficientes, operador, rhs), onde
+    coeficientes é um dicionário variável -> coeficiente. Restrições de
+    igualdade geram dois semiplanos; a não negatividade gera -xi <= 0.
+    """
+    planes = []
+    for coefficients, operator, rhs in constraint_lines:
+        a = np.array([coefficients.get('x1', 0.0), coefficients.get('x2', 0.0)], dtype=float)
+        if operator in ('<=', '='):
+            planes.append((a, float(rhs)))
+        if operator in ('>=', '='):
+            planes.append((-a, -float(rhs)))
+
+    if non_negativity.get('x1', True):
+        planes.append((np.array([-1.0, 0.0]), 0.0))
+    if non_negativity.get('x2', True):
+        planes.append((np.array([0.0, -1.0]), 0.0))
+    return planes
+
+
+# Função para recortar um polígono convexo por um semiplano a·x <= b
+def clip_polygon(vertices, a, b):
+    if len(vertices) == 0:
+        return vertices
+
+    s = vertices @ a - b
+    inside = s <= EPS
+    if inside.all():
+        return vertices
+    if not inside.any():
+        return np.empty((0, 2))
+
+    clipped = []
+    n = len(vertices)
+    for i in range(n):
+        j = (i + 1) % n
+        if inside[i]:
+            clipped.append(vertices[i])
+        if inside[i] != inside[j]:
+            t = s[i] / (s[i] - s[j])
+            clipped.append(vertices[i] + t * (vertices[j] - vertices[i]))
+    return np.array(clipped)
+
+
+# Função para remover vértices repetidos consecutivos
+def dedupe_vertices(vertices, tol=1e-7):
+    if len(vertices) < 2:
+        return vertices
+    keep = np.linalg.norm(vertices - np.roll(vertices, 1, axis=0), axis=1) > tol
+    if not keep.any():
+        return vertices[:1]
+    return vertices[keep]
+
+
+# Função para calcular a região factível como um polígono convexo
+def feasible_polygon(planes, bounds):
+    """
+    Intersecta os semiplanos com a caixa `bounds` = (xmin, xmax, ymin, ymax),
+    que limita regiões ilimitadas. Retorna os vértices em sentido anti-horário
+    (array vazio se o problema for infactível dentro da caixa).
+    """
+    xmin, xmax, ymin, ymax = bounds
+    vertices = np.array([[xmin, ymin], [xmax, ymin], [xmax, ymax], [xmin, ymax]], dtype=float)
+    for a, b in planes:
+        vertices = clip_polygon(vertices, a, b)
+        if len(vertices) == 0:
+            break
+    return dedupe_vertices(vertices)
+
+
+# Função para definir a caixa de visualização a partir dos interceptos das restrições
+def view_bounds(constraint_lines, non_negativity, extra_points=()):
+    xs, ys = [0.0], [0.0]
+    for coefficients, _, rhs in constraint_lines:
+        x1_coef = coefficients.get('x1', 0.0)
+        x2_coef = coefficients.get('x2', 0.0)
+        if x1_coef:
+            xs.append(rhs / x1_coef)
+        if x2_coef:
+            ys.append(rhs / x2_coef)
+    for x, y in extra_points:
+        xs.append(x)
+        ys.append(y)
+
+    x_pad = max((max(xs) - min(xs)) * 0.25, 1.0)
+    y_pad = max((max(ys) - min(ys)) * 0.25, 1.0)
+    xmin = 0.0 if non_negativity.get('x1', True) else min(xs) - x_pad
+    ymin = 0.0 if non_negativity.get('x2', True) else min(ys) - y_pad
+    return xmin, max(xs) + x_pad, ymin, max(ys) + y_pad
+
+
+# Função para ajustar os limites dos eixos aos vértices do polígono
+def fit_limits(points, non_negativity, margin=0.1):
+    points = np.asarray(points, dtype=float).reshape(-1, 2)
+    lower = points.min(axis=0)
+    upper = points.max(axis=0)
+    pad = np.maximum((upper - lower) * margin, 1.0)
+    lower = lower - pad
+    upper = upper + pad
+    if non_negativity.get('x1', True):
+        lower[0] = max(lower[0], 0.0)
+    if non_negativity.get('x2', True):
+        lower[1] = max(lower[1], 0.0)
+    return (lower[0], upper[0]), (lower[1], upper[1])
+
+
+# Função para obter os vértices da região factível exibida no gráfico
+def region_vertices(constraint_lines, non_negativity, optimum, vertices=None):
+    """Reaproveita `vertices` quando já calculados (resolvedor 2-D, região limitada)."""
+    if vertices is not None:
+        return np.asarray(vertices, dtype=float).reshape(-1, 2)
+    planes = half_planes(constraint_lines, non_negativity)
+    return feasible_polygon(planes, view_bounds(constraint_lines, non_negativity, [optimum]))
+
+
+# Função para calcular os limites dos eixos do gráfico (polígono e ponto ótimo)
+def plot_limits(vertices, optimum, non_negativity):
+    points = list(vertices) + [optimum] if len(vertices) else [optimum, (0, 0)]
+    return fit_limits(points, non_negativity)
+
+
+# Função para recortar a reta a·x = b pela caixa de visualização
+def clip_line(a, b, xlim, ylim):
+    """Retorna os dois extremos do trecho visível da reta, ou None se ela não cruzar a caixa."""
+    a1, a2 = a
+    points = []
+    if abs(a2) > EPS:
+        points += [(x, (b - a1 * x) / a2) for x in xlim]
+    if abs(a1) > EPS:
+        points += [((b - a2 * y) / a1, y) for y in ylim]
+    points = np.array([
+        p for p in points
+        if xlim[0] - EPS <= p[0] <= xlim[1] + EPS and ylim[0] - EPS <= p[1] <= ylim[1] + EPS
+    ]).reshape(-1, 2)
+    if len(points) < 2:
+        return None
+
+    # Extremos ao longo da direção da reta
+    t = points @ np.array([-a2, a1])
+    return points[np.argmin(t)], points[np.argmax(t)]
+
+
+# Função para descrever o gráfico em JSON (desenhado no navegador, sem matplotlib)
+def plot_geometry(constraint_lines, non_negativity, optimal_point, vertices=None, digits=6):
+    """
+    Retorna {'bounds': {'x': [min, max], 'y': [min, max]}, 'region': [[x, y], ...],
+    'lines': [{'label', 'operator', 'segment': [[x, y], [x, y]] ou None}], 'optimum': [x, y]},
+    com os mesmos vértices e limites do PNG de rendering.render_graph.
+    """
+    optimum = (float(optimal_point[0]), float(optimal_point[1]))
+    vertices = region_vertices(constraint_lines, non_negativity, optimum, vertices)
+    xlim, ylim = plot_limits(vertices, optimum, non_negativity)
+
+    def rounded(points):
+        return (np.round(np.asarray(points, dtype=float), digits) + 0.0).tolist()
+
+    lines = []
+    for i, (coefficients, operator, rhs) in enumerate(constraint_lines):
+        a = (coefficients.get('x1', 0.0), coefficients.get('x2', 0.0))
+        segment = clip_line(a, rhs, xlim, ylim)
+        lines.append({
+            'label': f'Restrição {i + 1}',
+            'operator': operator,
+            'segment': rounded(segment) if segment is not None else None,
+        })
+
+    return {
+        'bounds': {'x': rounded(xlim), 'y': rounded(ylim)},
+        'region': rounded(vertices),
+        'lines': lines,
+        'optimum': rounded(optimum),
+    }
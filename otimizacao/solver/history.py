@@ -0,0 +1,144 @@
+import atexit
+import copy
+import threading
+
+from django.conf import settings
+from django.db import connection, transaction
+
+from .models import Problem, Solution, SolveTiming
+
+DEFAULT_SETTINGS = {
+    'ENABLED': True,
+    'BATCH_SIZE': 50,        # Resoluções acumuladas antes de gravar (bulk_create)
+    'FLUSH_INTERVAL': 2.0,   # Tempo máximo, em segundos, até gravar o que estiver pendente
+    'PAGE_SIZE': 20,
+    'MAX_PAGE_SIZE': 100,
+}
+
+
+def history_settings():
+    return {**DEFAULT_SETTINGS, **getattr(settings, 'SOLVER_HISTORY', {})}
+
+
+class HistoryWriter:
+    """
+    Acumula as resoluções em memória e as grava em lote, em uma thread
+    própria: a requisição não espera nenhuma escrita no banco. Cada lote
+    custa poucas consultas (bulk_create de problemas, soluções e tempos)
+    em uma única transação, independentemente do número de resoluções.
+    """
+
+    def __init__(self, batch_size=50, flush_interval=2.0):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._pending = []
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread = None
+
+    def record(self, key, spec, entry, solution):
+        record = {
+            'key': key,
+            # Cópia: quem chamou (ex.: uma sessão) pode alterar o problema antes do flush()
+            'spec': copy.deepcopy(spec),
+            'result': {k: v for k, v in entry['result'].items() if k != 'graph_path'},
+            'render': entry['render'],
+            'optimal_point': solution['optimal_point'],
+            'objective_result': solution['objective_result'],
+            'backend': solution.get('backend', ''),
+            'solve_ms': solution.get('solve_ms'),
+            'timings': solution.get('timings', {}),
+            'variables': len(solution['optimal_point']),
+            'constraints': spec['shape'][0] if 'shape' in spec else len(spec['constraints']),
+        }
+        with self._lock:
+            self._pending.append(record)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='solver-history', daemon=True)
+                self._thread.start()
+            if len(self._pending) >= self.batch_size:
+                self._wake.set()
+
+    def _run(self):
+        while True:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            self.flush()
+            # A conexão da thread é fechada entre lotes
+            connection.close()
+
+    def flush(self):
+        with self._lock:
+            records, self._pending = self._pending, []
+        if not records:
+            return
+
+        try:
+            with transaction.atomic():
+                Problem.objects.bulk_create([
+                    Problem(
+                        key=r['key'],
+                        objective=r['spec']['objective'],
+                        spec=r['spec'],
+                        variables=r['variables'],
+                        constraints=r['constraints'],
+                    )
+                    for r in records
+                ], ignore_conflicts=True)
+                ids = dict(Problem.objects.filter(key__in={r['key'] for r in records}).values_list('key', 'id'))
+
+                Solution.objects.bulk_create([
+                    Solution(
+                        problem_id=ids[r['key']],
+                        backend=r['backend'],
+                        objective_result=r['objective_result'],
+                        optimal_point=r['optimal_point'],
+                        result=r['result'],
+                        render=r['render'],
+                    )
+                    for r in records
+                ], ignore_conflicts=True)
+                SolveTiming.objects.bulk_create([
+                    SolveTiming(
+                        problem_id=ids[r['key']],
+                        backend=r['backend'],
+                        solve_ms=r['solve_ms'],
+                        timings=r['timings'],
+                    )
+                    for r in records
+                ])
+        except Exception as e:
+            print(f"Erro ao gravar o histórico: {e}")
+
+
+_history = None
+_history_lock = threading.Lock()
+
+
+# Função para obter o gravador do histórico (None quando desativado em settings.SOLVER_HISTORY)
+def get_history():
+    global _history
+    options = history_settings()
+    if not options['ENABLED']:
+        return None
+    if _history is None:
+        with _history_lock:
+            if _history is None:
+                _history = HistoryWriter(options['BATCH_SIZE'], options['FLUSH_INTERVAL'])
+                atexit.register(_history.flush)
+    return _history
+
+
+# Função para buscar no banco a solução de um problema já resolvido
+def stored_entry(key):
+    """
+    Retorna a entrada no formato do cache de resultados ({'result',
+    'render', 'graph'}) ou None. Uma única consulta pelo índice da chave.
+    """
+    if not history_settings()['ENABLED']:
+        return None
+    row = Solution.objects.filter(problem__key=key).values_list('result', 'render').first()
+    if row is None:
+        return None
+    result, render = row
+    return {'result': result, 'render': render, 'graph': None}
@@ -0,0 +1,381 @@
+import atexit
+import logging
+import multiprocessing
+import os
+import signal
+import socket
+import threading
+import time
+from datetime import timedelta
+from multiprocessing.connection import wait
+
+from django.conf import settings
+from django.db import IntegrityError, close_old_connections, connection
+from django.db.models import F, Q
+from django.db.models.functions import Greatest
+from django.utils import timezone
+
+from .models import SolveJob
+from .timing import observe_spans
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SETTINGS = {
+    'WORKERS': 2,             # Processos que resolvem os jobs
+    'AUTOSTART': True,        # Inicia o pool no processo web no primeiro job (False: use o comando run_jobs)
+    'MAX_PENDING': 1000,      # Jobs pendentes antes de recusar novos
+    'DEFAULT_TIMEOUT': 60,    # Tempo máximo de resolução por job, em segundos
+    'MAX_TIMEOUT': 600,
+    'MAX_WAIT': 30,           # Espera máxima de GET /jobs/<id>/?wait=N (long-poll), em segundos
+    'POLL_INTERVAL': 0.5,     # Intervalo de consulta ao banco por jobs novos e cancelamentos
+    'STALE_GRACE': 30,        # Folga após o prazo até um job 'running' órfão ser encerrado
+}
+
+# Fração do prazo do job dada ao resolvedor como limite de tempo
+TIME_LIMIT_SHARE = 0.8
+
+# Opções de resposta guardadas junto com o problema em SolveJob.spec
+JOB_OPTIONS = ('graph', 'output')
+
+FINISHED = (SolveJob.DONE, SolveJob.FAILED, SolveJob.CANCELLED, SolveJob.TIMEOUT)
+
+# Notificado sempre que um job deste processo termina (acorda o long-poll)
+_finished = threading.Condition()
+
+
+def jobs_settings():
+    return {**DEFAULT_SETTINGS, **getattr(settings, 'SOLVER_JOBS', {})}
+
+
+class QueueFull(Exception):
+    pass
+
+
+# Função para enfileirar um problema, reaproveitando um job ativo idêntico
+def submit_job(key, problem, priority=0, timeout=None, result=None):
+    """
+    Retorna (job, created). Um pedido idêntico a um job pendente ou em
+    execução recebe esse job (a prioridade fica com o maior dos dois).
+    Com `result` (problema já resolvido), o job é criado concluído.
+    """
+    options = jobs_settings()
+    timeout = min(float(timeout or options['DEFAULT_TIMEOUT']), options['MAX_TIMEOUT'])
+    if timeout <= 0:
+        raise ValueError('timeout deve ser positivo.')
+
+    if result is not None:
+        now = timezone.now()
+        job = SolveJob.objects.create(
+            key=key, spec=problem, priority=priority, timeout=timeout,
+            status=SolveJob.DONE, result=result, started_at=now, finished_at=now,
+        )
+        return job, True
+
+    existing = SolveJob.objects.filter(key=key, status__in=SolveJob.ACTIVE).first()
+    if existing is None:
+        if SolveJob.objects.filter(status=SolveJob.PENDING).count() >= options['MAX_PENDING']:
+            raise QueueFull('Fila de jobs cheia.')
+        try:
+            job = SolveJob.objects.create(key=key, spec=problem, priority=priority, timeout=timeout)
+        except IntegrityError:
+            # Outro pedido idêntico criou o job entre a consulta e a inserção
+            existing = SolveJob.objects.filter(key=key, status__in=SolveJob.ACTIVE).first()
+            if existing is None:
+                raise
+        else:
+            pool = get_job_pool()
+            if pool is not None:
+                pool.wake()
+            return job, True
+
+    if priority > existing.priority:
+        SolveJob.objects.filter(id=existing.id, status=SolveJob.PENDING).update(
+            priority=Greatest(F('priority'), priority)
+        )
+        existing.refresh_from_db()
+    return existing, False
+
+
+# Função para cancelar um job: pendente sai da fila, em execução tem o processo encerrado
+def cancel_job(job_id):
+    """Retorna o job atualizado, ou None se ele não existir."""
+    now = timezone.now()
+    if not SolveJob.objects.filter(id=job_id, status=SolveJob.PENDING).update(
+        status=SolveJob.CANCELLED, finished_at=now
+    ):
+        SolveJob.objects.filter(id=job_id, status=SolveJob.RUNNING).update(cancel_requested=True)
+    return SolveJob.objects.filter(id=job_id).first()
+
+
+# Função para esperar (long-poll) até o job terminar ou `timeout` segundos passarem
+def wait_for_job(job_id, timeout):
+    deadline = time.monotonic() + timeout
+    poll_interval = jobs_settings()['POLL_INTERVAL']
+    while True:
+        job = SolveJob.objects.filter(id=job_id).first()
+        remaining = deadline - time.monotonic()
+        if job is None or job.status in FINISHED or remaining <= 0:
+            return job
+        # Jobs deste processo avisam ao terminar; os de outros processos são consultados no banco
+        with _finished:
+            _finished.wait(min(poll_interval, remaining))
+
+
+# Função para a posição de um job pendente na fila (0 = o próximo a ser executado)
+def queue_position(job):
+    return SolveJob.objects.filter(status=SolveJob.PENDING).filter(
+        Q(priority__gt=job.priority) | Q(priority=job.priority, created_at__lt=job.created_at)
+    ).count()
+
+
+class JobWorker:
+    """Um processo resolvedor e o job que ele está executando."""
+
+    def __init__(self, context):
+        # Importado aqui: as views importam este módulo, e o PuLP só é carregado com o pool de jobs
+        from .backends import serve_jobs
+
+        self.connection, child = context.Pipe()
+        self.process = context.Process(target=serve_jobs, args=(child,), daemon=True)
+        self.process.start()
+        child.close()
+        # O prazo dos jobs só começa a contar depois que o processo termina de importar o resolvedor
+        self.ready = False
+        self.job_id = None
+        self.problem = None
+        self.deadline = None
+
+    def run(self, job_id, problem, timeout):
+        self.job_id, self.problem = job_id, problem
+        self.deadline = time.monotonic() + timeout
+        # O resolvedor para antes do prazo e devolve a melhor solução encontrada;
+        # o processo só é encerrado se nem assim terminar a tempo
+        limits = problem.get('limits', {})
+        time_limit = min(limits.get('timeLimit') or timeout, timeout * TIME_LIMIT_SHARE)
+        self.connection.send((job_id, {**problem, 'limits': {**limits, 'timeLimit': time_limit}}))
+
+    def done(self):
+        self.job_id = self.problem = self.deadline = None
+
+    def kill(self):
+        # O processo e o CBC estão no mesmo grupo (ver backends.serve_jobs)
+        try:
+            os.killpg(self.process.pid, signal.SIGKILL)
+        except (AttributeError, OSError):
+            self.process.kill()
+        self.process.join(5)
+        self.connection.close()
+
+    def stop(self):
+        try:
+            self.connection.send(None)
+        except OSError:
+            pass
+        self.process.join(1)
+        if self.process.is_alive():
+            self.kill()
+
+
+class JobPool:
+    """
+    Pool de processos que resolve os jobs da tabela SolveJob. Uma thread de
+    supervisão pega o próximo job pendente (maior prioridade, depois o mais
+    antigo) para cada processo livre, grava o resultado e encerra o processo
+    cujo job estourou o prazo ou foi cancelado, criando outro no lugar. A
+    fila fica no banco: o pool pode rodar no processo web (AUTOSTART) ou em
+    um processo próprio (comando run_jobs), e vários pools dividem a mesma
+    fila sem pegar o mesmo job.
+    """
+
+    def __init__(self, workers=2, poll_interval=0.5, stale_grace=30):
+        self.workers = workers
+        self.poll_interval = poll_interval
+        self.stale_grace = stale_grace
+        self.name = f'{socket.gethostname()}:{os.getpid()}'
+        self._context = multiprocessing.get_context('spawn')
+        self._wake_r, self._wake_w = self._context.Pipe(duplex=False)
+        self._wake_lock = threading.Lock()
+        self._stopping = threading.Event()
+        self._thread = None
+        self._workers = []
+        self._last_stale_check = 0.0
+
+    @classmethod
+    def from_settings(cls, **overrides):
+        options = {**jobs_settings(), **overrides}
+        return cls(options['WORKERS'], options['POLL_INTERVAL'], options['STALE_GRACE'])
+
+    def start(self):
+        if self._thread is None:
+            self._workers = [JobWorker(self._context) for _ in range(self.workers)]
+            self._thread = threading.Thread(target=self._run, name='solver-jobs', daemon=True)
+            self._thread.start()
+
+    def wake(self):
+        with self._wake_lock:
+            self._wake_w.send(True)
+
+    def stop(self):
+        self._stopping.set()
+        self.wake()
+        if self._thread is not None:
+            self._thread.join(5)
+        for worker in self._workers:
+            if worker.job_id is not None:
+                # Volta para a fila: outro pool (ou o próximo início) executa o job
+                SolveJob.objects.filter(id=worker.job_id, status=SolveJob.RUNNING).update(
+                    status=SolveJob.PENDING, worker='', started_at=None,
+                )
+            worker.stop()
+
+    def join(self):
+        while self._thread is not None and self._thread.is_alive():
+            self._thread.join(1)
+
+    def _run(self):
+        while not self._stopping.is_set():
+            try:
+                self._tick()
+            except Exception:
+                logger.exception('Erro na supervisão da fila de jobs')
+                time.sleep(self.poll_interval)
+            finally:
+                close_old_connections()
+        connection.close()
+
+    def _tick(self):
+        self._dispatch()
+        # Processos executando um job ou ainda iniciando (avisam quando estão prontos)
+        watched = {w.connection: w for w in self._workers if w.job_id is not None or not w.ready}
+        for ready in wait(list(watched) + [self._wake_r], timeout=self.poll_interval):
+            if ready is self._wake_r:
+                while self._wake_r.poll():
+                    self._wake_r.recv()
+                continue
+            worker = watched[ready]
+            try:
+                message = ready.recv()
+            except (EOFError, OSError):
+                self._replace(worker, SolveJob.FAILED, 'O processo resolvedor terminou inesperadamente.')
+                continue
+            if message is None:
+                worker.ready = True
+                continue
+            job_id, solution, spans, error = message
+            self._finish(worker, solution, spans, error)
+        self._enforce()
+
+    def _dispatch(self):
+        for worker in list(self._workers):
+            if worker.job_id is not None or not worker.ready:
+                continue
+            if not worker.process.is_alive():
+                self._replace(worker, None, '')
+                continue
+            job = self._claim()
+            if job is None:
+                return
+            worker.run(job.id, job.spec, job.timeout)
+
+    def _claim(self):
+        # Compare-and-set: só um pool consegue passar o job de 'pending' para 'running'
+        while True:
+            job = SolveJob.objects.filter(status=SolveJob.PENDING).order_by('-priority', 'created_at').first()
+            if job is None:
+                return None
+            if SolveJob.objects.filter(id=job.id, status=SolveJob.PENDING).update(
+                status=SolveJob.RUNNING, worker=self.name, started_at=timezone.now(),
+            ):
+                return job
+
+    def _finish(self, worker, solution, spans, error):
+        job_id, problem = worker.job_id, worker.problem
+        worker.done()
+        if error is not None:
+            self._close(job_id, SolveJob.FAILED, error=error)
+            return
+        from .backends import record_latency
+
+        observe_spans(spans)
+        record_latency(solution)
+        try:
+            self._close(job_id, SolveJob.DONE, result=job_result(problem, solution))
+        except Exception as e:
+            self._close(job_id, SolveJob.FAILED, error=str(e))
+
+    def _close(self, job_id, status, result=None, error=''):
+        SolveJob.objects.filter(id=job_id, status=SolveJob.RUNNING).update(
+            status=status, result=result, error=error, finished_at=timezone.now(),
+        )
+        with _finished:
+            _finished.notify_all()
+
+    def _replace(self, worker, status, error):
+        job_id = worker.job_id
+        worker.done()
+        worker.kill()
+        self._workers[self._workers.index(worker)] = JobWorker(self._context)
+        if job_id is not None:
+            self._close(job_id, status, error=error)
+
+    def _enforce(self):
+        now = time.monotonic()
+        running = {w.job_id: w for w in self._workers if w.job_id is not None}
+        for worker in list(running.values()):
+            if now > worker.deadline:
+                self._replace(worker, SolveJob.TIMEOUT, 'Tempo limite de resolução excedido.')
+        if running:
+            cancelled = SolveJob.objects.filter(id__in=list(running), cancel_requested=True).values_list('id', flat=True)
+            for job_id in cancelled:
+                if running[job_id].job_id == job_id:
+                    self._replace(running[job_id], SolveJob.CANCELLED, '')
+
+        if now - self._last_stale_check > self.stale_grace:
+            self._last_stale_check = now
+            self._expire_stale()
+
+    def _expire_stale(self):
+        # Jobs 'running' de pools que pararam sem devolvê-los (processo morto)
+        now = timezone.now()
+        stale = SolveJob.objects.filter(status=SolveJob.RUNNING).exclude(worker=self.name)
+        for job_id, started_at, timeout in stale.values_list('id', 'started_at', 'timeout'):
+            if started_at + timedelta(seconds=timeout + self.stale_grace) < now:
+                SolveJob.objects.filter(id=job_id, status=SolveJob.RUNNING).update(
+                    status=SolveJob.TIMEOUT, error='O worker que executava o job parou de responder.',
+                    finished_at=now,
+                )
+
+
+# Função para montar o resultado de um job no formato da resposta de optimize
+def job_result(problem, solution):
+    # Importado aqui: as views importam este módulo
+    from .views import cache_key_for, finish_solve
+
+    spec = {k: v for k, v in problem.items() if k not in JOB_OPTIONS}
+    return finish_solve(
+        cache_key_for(spec), spec['nonNegativity'], solution,
+        graph=problem.get('graph', True), spec=spec, geometry=problem.get('output') == 'geometry',
+    )
+
+
+_job_pool = None
+_job_pool_lock = threading.Lock()
+
+
+# Função para obter o pool de jobs deste processo (None se SOLVER_JOBS['AUTOSTART'] for False)
+def get_job_pool():
+    if not jobs_settings()['AUTOSTART']:
+        return _job_pool
+    return start_job_pool()
+
+
+# Função para iniciar o pool de jobs neste processo (usada também pelo comando run_jobs)
+def start_job_pool(**overrides):
+    global _job_pool
+    if _job_pool is None:
+        with _job_pool_lock:
+            if _job_pool is None:
+                _job_pool = JobPool.from_settings(**overrides)
+                _job_pool.start()
+                atexit.register(_job_pool.stop)
+    return _job_pool
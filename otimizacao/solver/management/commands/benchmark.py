@@ -0,0 +1,73 @@
+import json
+import logging
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+from django.test.utils import setup_test_environment, teardown_test_environment
+
+from solver.benchmarks import QUICK_SIZES, SIZES, STAGES, compare, run_benchmarks
+
+
+class Command(BaseCommand):
+    help = (
+        'Mede as etapas do pipeline (parse, montagem, CBC, resolvedor, gráfico e a view optimize) '
+        'em problemas aleatórios de tamanho crescente e compara com uma linha de base.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--repeat', type=int, default=20, help='Execuções medidas por etapa.')
+        parser.add_argument('--seed', type=int, default=1234, help='Semente dos problemas gerados.')
+        parser.add_argument('--quick', action='store_true', help='Apenas os casos pequenos.')
+        parser.add_argument('--stages', nargs='+', choices=STAGES, default=list(STAGES))
+        parser.add_argument('--save', type=Path, help='Salva o resultado (JSON) como linha de base.')
+        parser.add_argument('--compare', type=Path, help='Linha de base (JSON) para comparar.')
+        parser.add_argument('--threshold', type=float, default=0.2,
+                            help='Aumento relativo do p50 considerado regressão (padrão: 0.2).')
+
+    def handle(self, *args, **options):
+        baseline = None
+        if options['compare']:
+            try:
+                baseline = json.loads(options['compare'].read_text())
+            except (OSError, ValueError) as e:
+                raise CommandError(f"Não foi possível ler a linha de base: {e}")
+
+        # O test client precisa do ambiente de teste (ALLOWED_HOSTS com 'testserver');
+        # o log por requisição da view é silenciado durante as medições
+        logging.getLogger('solver.timing').setLevel(logging.WARNING)
+        setup_test_environment()
+        try:
+            report = run_benchmarks(
+                sizes=QUICK_SIZES if options['quick'] else SIZES,
+                stages=options['stages'],
+                repeat=options['repeat'],
+                seed=options['seed'],
+            )
+        finally:
+            teardown_test_environment()
+
+        self.stdout.write(f"{'caso':<12}{'etapa':<10}{'p50 ms':>10}{'p95 ms':>10}{'op/s':>10}{'pico KiB':>11}")
+        for case, stages in report['results'].items():
+            for stage, stats in stages.items():
+                self.stdout.write(
+                    f"{case:<12}{stage:<10}{stats['p50_ms']:>10.3f}{stats['p95_ms']:>10.3f}"
+                    f"{stats['throughput_per_s'] or 0:>10.1f}{stats['peak_kib']:>11.1f}"
+                )
+        self.stdout.write(f"Tempo total: {report['meta']['elapsed_s']} s")
+
+        if options['save']:
+            options['save'].parent.mkdir(parents=True, exist_ok=True)
+            options['save'].write_text(json.dumps(report, indent=2))
+            self.stdout.write(self.style.SUCCESS(f"Linha de base salva em {options['save']}"))
+
+        if baseline is not None:
+            rows = compare(baseline, report, threshold=options['threshold'])
+            regressions = [row for row in rows if row['regression']]
+            for row in rows:
+                style = self.style.ERROR if row['regression'] else self.style.SUCCESS
+                self.stdout.write(style(
+                    f"{row['case']:<12}{row['stage']:<10}{row['baseline']:>10.3f} -> {row['current']:>10.3f}"
+                    f"  x{row['ratio']}"
+                ))
+            if regressions:
+                raise CommandError(f'{len(regressions)} etapa(s) ficaram mais lentas que a linha de base.')
@@ -0,0 +1,42 @@
+import json
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from solver.gallery import build_gallery, gallery_settings
+
+
+class Command(BaseCommand):
+    help = (
+        'Resolve os problemas do catálogo da galeria e grava resultados e gráficos como '
+        'arquivos estáticos com impressão digital (ver settings.SOLVER_GALLERY).'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--catalog', help='Arquivo JSON com a lista de problemas (padrão: SOLVER_GALLERY).')
+        parser.add_argument('--output', help='Pasta de saída (padrão: SOLVER_GALLERY["OUTPUT_DIR"]).')
+        parser.add_argument('--keep', action='store_true', help='Mantém arquivos de builds anteriores.')
+        parser.add_argument('--json', action='store_true', help='Imprime o manifesto em JSON.')
+
+    def handle(self, *args, **options):
+        output = options['output'] or gallery_settings()['OUTPUT_DIR']
+        started = time.perf_counter()
+        try:
+            manifest = build_gallery(options['catalog'], output, clean=not options['keep'])
+        except (ValueError, OSError) as e:
+            raise CommandError(f"Falha ao gerar a galeria: {e}")
+        elapsed = time.perf_counter() - started
+
+        if options['json']:
+            self.stdout.write(json.dumps(manifest, indent=2, ensure_ascii=False))
+            return
+
+        self.stdout.write(f"{'problema':<24}{'objetivo':>12}{'arquivos':>10}")
+        for entry in manifest['entries']:
+            objective = entry['objective_result']
+            objective = entry['status'] or '-' if objective is None else f'{objective:.4g}'
+            self.stdout.write(f"{entry['slug']:<24}{objective:>12}{len(entry['files']):>10}")
+        self.stdout.write(self.style.SUCCESS(
+            f"Galeria {manifest['version']} gravada em {output} ({elapsed:.1f} s). "
+            'Execute collectstatic para publicá-la junto aos demais arquivos estáticos.'
+        ))
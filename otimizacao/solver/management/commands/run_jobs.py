@@ -0,0 +1,31 @@
+import signal
+import threading
+
+from django.core.management.base import BaseCommand
+
+from solver.jobs import jobs_settings, start_job_pool
+
+
+class Command(BaseCommand):
+    help = (
+        'Executa o pool de processos que resolve a fila de jobs (/solver/jobs/). '
+        'Use com SOLVER_JOBS["AUTOSTART"] = False para tirar as resoluções dos processos web.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, help='Processos resolvedores (padrão: SOLVER_JOBS["WORKERS"]).')
+
+    def handle(self, *args, **options):
+        workers = options['workers'] or jobs_settings()['WORKERS']
+        stopping = threading.Event()
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            signal.signal(signum, lambda *_: stopping.set())
+
+        pool = start_job_pool(WORKERS=workers)
+        self.stdout.write(f'Fila de jobs: {workers} processo(s) em {pool.name}. Ctrl+C para encerrar.')
+        while not stopping.wait(1):
+            pass
+
+        # Jobs em execução voltam para a fila antes de os processos serem encerrados
+        pool.stop()
+        self.stdout.write('Pool de jobs encerrado.')
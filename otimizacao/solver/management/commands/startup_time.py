@@ -0,0 +1,61 @@
+import json
+import statistics
+
+from django.core.management.base import BaseCommand, CommandError
+
+from solver.startup import STAGES, measure_startup
+
+
+class Command(BaseCommand):
+    help = (
+        'Mede a partida a frio em processos novos: django.setup(), carga das URLs, '
+        'primeira requisição a index e primeira otimização.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--repeat', type=int, default=5, help='Processos medidos (mediana).')
+        parser.add_argument('--no-optimize', action='store_true', help='Não mede a primeira otimização.')
+        parser.add_argument('--imports', type=int, default=0, metavar='N',
+                            help='Lista as N importações de primeiro nível mais caras (python -X importtime).')
+        parser.add_argument('--json', action='store_true', help='Imprime o resultado em JSON.')
+
+    def handle(self, *args, **options):
+        runs = []
+        try:
+            for i in range(max(options['repeat'], 1)):
+                # As importações são listadas a partir do primeiro processo apenas
+                runs.append(measure_startup(
+                    optimize=not options['no_optimize'],
+                    importtime=bool(options['imports']) and i == 0,
+                ))
+        except RuntimeError as e:
+            raise CommandError(f"Falha ao iniciar o processo de medição: {e}")
+
+        stages = [stage for stage in STAGES if stage in runs[0]['stages']]
+        summary = {
+            stage: round(statistics.median(run['stages'][stage] for run in runs), 3)
+            for stage in stages
+        }
+        summary['total'] = round(sum(summary.values()), 3)
+        report = {
+            'runs': len(runs),
+            'median_ms': summary,
+            'modules': runs[0]['modules'],
+            'heavy': runs[0]['heavy'],
+            'imports': runs[0].get('imports', [])[:options['imports']],
+        }
+
+        if options['json']:
+            self.stdout.write(json.dumps(report, indent=2))
+            return
+
+        self.stdout.write(f"{'etapa':<16}{'mediana ms':>12}")
+        for stage, ms in summary.items():
+            self.stdout.write(f"{stage:<16}{ms:>12.1f}")
+        self.stdout.write(f"Módulos carregados: {report['modules']} ({report['runs']} processo(s))")
+        if report['heavy']:
+            self.stdout.write(self.style.WARNING(f"Dependências pesadas carregadas: {', '.join(report['heavy'])}"))
+        if report['imports']:
+            self.stdout.write(f"{'importação':<40}{'ms':>10}")
+            for ms, name in report['imports']:
+                self.stdout.write(f"{name:<40}{ms:>10.1f}")
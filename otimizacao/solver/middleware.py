@@ -0,0 +1,230 @@
+import json
+import logging
+import math
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.http import JsonResponse
+from django.urls import Resolver404, resolve
+
+from .admission import ADMITTED, QUEUE_FULL, admission_settings, get_admission
+from .timing import end_trace, get_histograms, server_timing, start_trace
+
+logger = logging.getLogger('solver.timing')
+
+
+class ServerTimingMiddleware:
+    """
+    Mede cada requisição: as etapas registradas com timing.span() durante
+    a view vão para o cabeçalho Server-Timing, para um log estruturado
+    (JSON, logger 'solver.timing') e para os histogramas de /metrics.
+    Funciona com views síncronas e assíncronas.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        started = time.perf_counter()
+        trace, token = start_trace()
+        try:
+            response = self.get_response(request)
+        finally:
+            end_trace(token)
+        return self.finish(request, response, trace, started)
+
+    async def __acall__(self, request):
+        started = time.perf_counter()
+        trace, token = start_trace()
+        try:
+            response = await self.get_response(request)
+        finally:
+            end_trace(token)
+        return self.finish(request, response, trace, started)
+
+    def finish(self, request, response, trace, started):
+        elapsed = time.perf_counter() - started
+        match = request.resolver_match
+        view = match.url_name if match and match.url_name else 'unknown'
+
+        response['Server-Timing'] = server_timing(trace, elapsed)
+        get_histograms().observe('solver_request_duration_seconds', {'view': view}, elapsed)
+        if trace.spans:
+            logger.info(json.dumps({
+                'event': 'request',
+                'method': request.method,
+                'path': request.path,
+                'view': view,
+                'status': response.status_code,
+                'total_ms': round(elapsed * 1000, 3),
+                'stages_ms': trace.totals(),
+            }))
+        return response
+
+
+class AdmissionMiddleware:
+    """
+    Controle de admissão das views de resolução e de gráficos (ver
+    solver/admission.py): limite de fichas por cliente (429), limite de
+    requisições simultâneas por processo com uma fila de espera limitada
+    (503 com a fila cheia ou após QUEUE_TIMEOUT). As respostas recusadas
+    trazem Retry-After. Em respostas em streaming, a vaga só é liberada
+    quando o stream termina.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.enabled = admission_settings()['ENABLED']
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        name = self.view_class(request)
+        if name is None:
+            return self.get_response(request)
+
+        admission = get_admission()
+        rejected = self.check_rate(admission, name, request)
+        if rejected is not None:
+            return rejected
+        if not admission.try_enter(name):
+            outcome = admission.enter(name)
+            if outcome != ADMITTED:
+                return self.unavailable(outcome)
+        return self.respond(request, admission, name)
+
+    async def __acall__(self, request):
+        name = self.view_class(request)
+        if name is None:
+            return await self.get_response(request)
+
+        admission = get_admission()
+        rejected = self.check_rate(admission, name, request)
+        if rejected is not None:
+            return rejected
+        if not admission.try_enter(name):
+            # A espera bloqueia uma thread, não o loop de eventos
+            outcome = await sync_to_async(admission.enter, thread_sensitive=False)(name)
+            if outcome != ADMITTED:
+                return self.unavailable(outcome)
+        try:
+            response = await self.get_response(request)
+        except BaseException:
+            admission.leave(name)
+            raise
+        return self.release_after(response, admission, name)
+
+    def view_class(self, request):
+        if not self.enabled:
+            return None
+        try:
+            match = resolve(request.path_info)
+        except Resolver404:
+            return None
+        return get_admission().view_class(match.url_name)
+
+    def check_rate(self, admission, name, request):
+        wait = admission.check_rate(name, admission.client(request))
+        if not wait:
+            return None
+        response = JsonResponse({'error': 'Limite de requisições excedido. Tente novamente.'}, status=429)
+        response['Retry-After'] = str(max(1, math.ceil(wait)))
+        return response
+
+    def unavailable(self, outcome):
+        if outcome == QUEUE_FULL:
+            message = 'Servidor ocupado: fila de espera cheia. Tente novamente.'
+        else:
+            message = 'Servidor ocupado: tempo de espera por uma vaga excedido. Tente novamente.'
+        response = JsonResponse({'error': message}, status=503)
+        response['Retry-After'] = str(get_admission().options['RETRY_AFTER'])
+        return response
+
+    def respond(self, request, admission, name):
+        try:
+            response = self.get_response(request)
+        except BaseException:
+            admission.leave(name)
+            raise
+        return self.release_after(response, admission, name)
+
+    def release_after(self, response, admission, name):
+        if not response.streaming:
+            admission.leave(name)
+            return response
+        released = []
+
+        def release():
+            if not released:
+                released.append(True)
+                admission.leave(name)
+
+        # A vaga é liberada quando o stream termina, falha ou é fechado (cliente desconectado)
+        stream = AsyncReleasingStream if response.is_async else ReleasingStream
+        response.streaming_content = stream(response.streaming_content, release)
+        return response
+
+
+class ReleasingStream:
+    """
+    Repassa os pedaços de um stream e chama `release` ao fim da iteração,
+    em caso de erro ou no close() que o servidor faz ao encerrar a resposta
+    (também quando o stream nem chegou a ser iterado).
+    """
+
+    def __init__(self, content, release):
+        self.content = iter(content)
+        self.release = release
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        try:
+            return next(self.content)
+        except BaseException:
+            self.release()
+            raise
+
+    def close(self):
+        try:
+            if hasattr(self.content, 'close'):
+                self.content.close()
+        finally:
+            self.release()
+
+
+# Não herda de ReleasingStream: o Django trata como síncrono todo stream que aceita iter()
+class AsyncReleasingStream:
+    """ReleasingStream para streams assíncronos (servidores ASGI)."""
+
+    def __init__(self, content, release):
+        self.content = content
+        self.release = release
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        try:
+            return await self.content.__anext__()
+        except BaseException:
+            self.release()
+            raise
+
+    def close(self):
+        self.release()
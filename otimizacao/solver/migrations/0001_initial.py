@@ -0,0 +1,57 @@
+# Generated by Django 5.1.4 on 2026-10-18 12:07
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Problem',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('key', models.CharField(max_length=64, unique=True)),
+                ('objective', models.CharField(max_length=8)),
+                ('spec', models.JSONField()),
+                ('variables', models.PositiveIntegerField(default=0)),
+                ('constraints', models.PositiveIntegerField(default=0)),
+                ('created_at', models.DateTimeField(auto_now_add=True, db_index=True)),
+            ],
+            options={
+                'ordering': ['-created_at'],
+            },
+        ),
+        migrations.CreateModel(
+            name='Solution',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('backend', models.CharField(blank=True, max_length=32)),
+                ('objective_result', models.FloatField(null=True)),
+                ('optimal_point', models.JSONField()),
+                ('result', models.JSONField()),
+                ('render', models.JSONField(null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('problem', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='solution', to='solver.problem')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='SolveTiming',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('backend', models.CharField(blank=True, max_length=32)),
+                ('solve_ms', models.FloatField(null=True)),
+                ('timings', models.JSONField(default=dict)),
+                ('created_at', models.DateTimeField(auto_now_add=True, db_index=True)),
+                ('problem', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='timings', to='solver.problem')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['backend', 'created_at'], name='solver_solv_backend_446e0b_idx')],
+            },
+        ),
+    ]
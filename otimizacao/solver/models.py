@@ -1,3 +1,84 @@
+import uuid
+
 from django.db import models
 
-# Create your models here.
+
+# Problema resolvido, identificado pela chave canônica (sha256) de solver/cache.py
+class Problem(models.Model):
+    key = models.CharField(max_length=64, unique=True)
+    objective = models.CharField(max_length=8)
+    spec = models.JSONField()   # Problema como recebido (read_problem) ou resumo do formato esparso
+    variables = models.PositiveIntegerField(default=0)
+    constraints = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    class Meta:
+        ordering = ['-created_at']
+
+    def __str__(self):
+        return f'{self.objective} {self.key[:12]}'
+
+
+# Solução de um problema: a resposta de optimize e os argumentos para redesenhar o gráfico
+class Solution(models.Model):
+    problem = models.OneToOneField(Problem, on_delete=models.CASCADE, related_name='solution')
+    backend = models.CharField(max_length=32, blank=True)
+    objective_result = models.FloatField(null=True)
+    optimal_point = models.JSONField()
+    result = models.JSONField()
+    render = models.JSONField(null=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f'{self.problem} = {self.objective_result}'
+
+
+# Tempos de cada resolução (um registro por vez que o problema foi resolvido)
+class SolveTiming(models.Model):
+    problem = models.ForeignKey(Problem, on_delete=models.CASCADE, related_name='timings')
+    backend = models.CharField(max_length=32, blank=True)
+    solve_ms = models.FloatField(null=True)
+    timings = models.JSONField(default=dict)
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    class Meta:
+        indexes = [models.Index(fields=['backend', 'created_at'])]
+
+
+# Job da fila de resolução (ver solver/jobs.py): o problema espera na tabela até um worker pegá-lo
+class SolveJob(models.Model):
+    PENDING = 'pending'
+    RUNNING = 'running'
+    DONE = 'done'
+    FAILED = 'failed'
+    CANCELLED = 'cancelled'
+    TIMEOUT = 'timeout'
+    STATUS_CHOICES = [(s, s) for s in (PENDING, RUNNING, DONE, FAILED, CANCELLED, TIMEOUT)]
+    ACTIVE = (PENDING, RUNNING)
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    key = models.CharField(max_length=64)
+    spec = models.JSONField()   # Problema como recebido (read_problem)
+    priority = models.IntegerField(default=0)
+    timeout = models.FloatField()
+    status = models.CharField(max_length=16, choices=STATUS_CHOICES, default=PENDING)
+    cancel_requested = models.BooleanField(default=False)
+    worker = models.CharField(max_length=64, blank=True)
+    result = models.JSONField(null=True)
+    error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True)
+    finished_at = models.DateTimeField(null=True)
+
+    class Meta:
+        ordering = ['-created_at']
+        indexes = [models.Index(fields=['status', '-priority', 'created_at'])]
+        constraints = [
+            # Um único job ativo por problema: pedidos idênticos reaproveitam o job pendente
+            models.UniqueConstraint(
+                fields=['key'], condition=models.Q(status__in=['pending', 'running']), name='solver_unique_active_job',
+            ),
+        ]
+
+    def __str__(self):
+        return f'{self.status} {self.key[:12]}'
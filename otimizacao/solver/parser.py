@@ -0,0 +1,63 @@
+import re
+from functools import lru_cache
+
+# Um termo é um coeficiente opcional (com sinal) seguido do nome da variável: 2x1, -x2, + 3.5 x3
+TERM_PATTERN = re.compile(r'([+-]?\s*\d*\.*\d*)\s*([a-zA-Z_][a-zA-Z0-9_]*)')
+CONSTRAINT_PATTERN = re.compile(r'(.+?)(<=|>=|=)(.+)')
+
+CACHE_SIZE = 4096
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _linear_terms(expression):
+    coefficients = {}
+    for coef, var in TERM_PATTERN.findall(expression):
+        coef = coef.replace(' ', '')
+        if coef in ('', '+'):
+            coef = 1.0
+        elif coef == '-':
+            coef = -1.0
+        else:
+            coef = float(coef)
+        coefficients[var] = coefficients.get(var, 0.0) + coef
+    return tuple(coefficients.items())
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _constraint(constraint):
+    match = CONSTRAINT_PATTERN.match(constraint.replace(' ', ''))
+    if not match:
+        return None
+    return _linear_terms(match.group(1)), match.group(2), float(match.group(3))
+
+
+# Função para converter uma expressão linear em coeficientes (variável -> coeficiente)
+def parse_linear(expression):
+    """
+    A expressão é lida uma única vez; leituras repetidas da mesma string
+    vêm do cache. Termos da mesma variável são somados e a ordem de
+    primeira ocorrência é mantida.
+    """
+    try:
+        return dict(_linear_terms(expression))
+    except Exception as e:
+        raise ValueError(f"Erro ao analisar a expressão: {expression}. Detalhes: {str(e)}")
+
+
+# Função para separar uma restrição em (coeficientes, operador, rhs)
+def parse_constraint(constraint):
+    """Retorna None quando a string não tem um operador <=, >= ou =."""
+    parsed = _constraint(constraint)
+    if parsed is None:
+        return None
+    terms, operator, rhs = parsed
+    return dict(terms), operator, rhs
+
+
+def cache_info():
+    return {'expressions': _linear_terms.cache_info(), 'constraints': _constraint.cache_info()}
+
+
+def cache_clear():
+    _linear_terms.cache_clear()
+    _constraint.cache_clear()
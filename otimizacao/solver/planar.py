@@ -0,0 +1,99 @@
+import numpy as np
+
+MAX_CONSTRAINTS = 200   # Acima disso, o número de pares de retas torna o CBC mais vantajoso
+TOL = 1e-9
+
+
+# Função para montar o sistema A·x <= b de um problema 2-D (x1, x2 >= 0 sempre, como no modelo PuLP)
+def planar_system(constraint_lines):
+    rows = []
+    rhs = []
+    for coefficients, operator, b in constraint_lines:
+        a = (coefficients.get('x1', 0.0), coefficients.get('x2', 0.0))
+        if operator in ('<=', '='):
+            rows.append(a)
+            rhs.append(b)
+        if operator in ('>=', '='):
+            rows.append((-a[0], -a[1]))
+            rhs.append(-b)
+    rows += [(-1.0, 0.0), (0.0, -1.0)]
+    rhs += [0.0, 0.0]
+    return np.array(rows, dtype=float), np.array(rhs, dtype=float)
+
+
+# Função para enumerar os vértices da região factível {x : A·x <= b}
+def feasible_vertices(A, b):
+    """
+    Intersecta todos os pares de retas de fronteira de uma vez (regra de
+    Cramer vetorizada) e mantém os pontos que satisfazem todas as
+    restrições. Retorna os vértices distintos em sentido anti-horário.
+    """
+    i, j = np.triu_indices(len(A), k=1)
+    det = A[i, 0] * A[j, 1] - A[i, 1] * A[j, 0]
+    ok = np.abs(det) > TOL
+    i, j, det = i[ok], j[ok], det[ok]
+
+    x = (b[i] * A[j, 1] - b[j] * A[i, 1]) / det
+    y = (A[i, 0] * b[j] - A[j, 0] * b[i]) / det
+    points = np.column_stack((x, y))
+
+    slack = points @ A.T - b
+    feasible = np.all(slack <= TOL * (1.0 + np.abs(b)), axis=1)
+    points = points[feasible]
+    if len(points) == 0:
+        return points
+
+    # Arredonda só para identificar vértices repetidos; mantém as coordenadas exatas
+    _, first = np.unique(np.round(points, 9) + 0.0, axis=0, return_index=True)
+    points = points[np.sort(first)] + 0.0
+    center = points.mean(axis=0)
+    angles = np.arctan2(points[:, 1] - center[1], points[:, 0] - center[0])
+    return points[np.argsort(angles)]
+
+
+# Função para encontrar as direções extremas (raios) da região, se ela for ilimitada
+def recession_rays(A):
+    """
+    As direções extremas do cone {d : A·d <= 0} ficam sobre alguma reta de
+    fronteira, então basta testar ±(-a2, a1) para cada linha de A.
+    """
+    directions = np.vstack((np.column_stack((-A[:, 1], A[:, 0])), np.column_stack((A[:, 1], -A[:, 0]))))
+    norms = np.linalg.norm(directions, axis=1)
+    directions = directions[norms > TOL] / norms[norms > TOL, None]
+    inside = np.all(directions @ A.T <= TOL, axis=1)
+    return directions[inside]
+
+
+# Função principal do resolvedor 2-D
+def solve_2d(maximize, cost, constraint_lines):
+    """
+    Resolve max/min cost·x sujeito às restrições em (x1, x2), com x >= 0.
+    Retorna {'status', 'optimal_point', 'objective_result', 'vertices',
+    'bounded'}, com status 'Optimal', 'Infeasible' ou 'Unbounded'.
+    """
+    A, b = planar_system(constraint_lines)
+    c = np.array([cost.get('x1', 0.0), cost.get('x2', 0.0)], dtype=float)
+    direction = c if maximize else -c
+
+    vertices = feasible_vertices(A, b)
+    rays = recession_rays(A)
+    result = {
+        'status': 'Optimal',
+        'optimal_point': None,
+        'objective_result': None,
+        'vertices': vertices,
+        'bounded': len(rays) == 0,
+    }
+
+    # Com x >= 0 a região não contém retas; se não há vértice, ela é vazia
+    if len(vertices) == 0:
+        result['status'] = 'Infeasible'
+        return result
+    if len(rays) and np.any(rays @ direction > TOL):
+        result['status'] = 'Unbounded'
+        return result
+
+    best = int(np.argmax(vertices @ direction))
+    result['optimal_point'] = vertices[best].tolist()
+    result['objective_result'] = float(vertices[best] @ c)
+    return result
@@ -0,0 +1,251 @@
+import math
+
+from .parser import parse_constraint, parse_linear
+
+# Tolerância das comparações entre coeficientes, limites e lados direitos
+TOLERANCE = 1e-9
+
+# Contadores das estatísticas, na ordem em que as reduções são aplicadas
+REDUCTIONS = ('empty', 'bounds', 'duplicate', 'dominated', 'redundant')
+
+
+# Função para reduzir o problema antes de resolvê-lo
+def presolve(problem):
+    """
+    Retorna (problema reduzido, estatísticas). Restrições sem variáveis,
+    restrições de uma variável (que viram limites), duplicadas, múltiplas
+    umas das outras, dominadas ou já implicadas pelos limites das variáveis
+    são removidas. As estatísticas trazem o número de restrições lidas,
+    quantas ficaram ('kept', sem contar os limites), quantas saíram por
+    cada motivo (REDUCTIONS) e 'status':
+    'Infeasible' ou 'Unbounded' quando isso já é evidente (o problema não
+    precisa ir ao resolvedor), None caso contrário.
+    """
+    declared = problem.get('variables', {})
+    cost = {var: coef for var, coef in parse_linear(problem['objectiveFunction']).items()}
+    rows = []
+    for c in problem['constraints']:
+        parsed = parse_constraint(c)
+        if parsed:
+            coefficients, operator, rhs = parsed
+            rows.append(({var: coef for var, coef in coefficients.items() if coef != 0}, operator, rhs, c))
+
+    names = set(cost).union(*(coefficients for coefficients, _, _, _ in rows))
+    # Sem declaração, a variável é contínua e >= 0 (como em build_model)
+    bounds = {}
+    for var in names:
+        spec = declared.get(var, {'lowBound': 0, 'upBound': None})
+        bounds[var] = [
+            -math.inf if spec['lowBound'] is None else spec['lowBound'],
+            math.inf if spec['upBound'] is None else spec['upBound'],
+        ]
+    integer = {var for var, spec in declared.items() if spec['cat'] != 'Continuous'}
+
+    stats = {'constraints': len(rows), 'kept': 0, **{name: 0 for name in REDUCTIONS}, 'status': None}
+
+    def stop(status):
+        stats['status'] = status
+        return problem, stats
+
+    # Restrições sem variáveis (0 <= 3) e de uma variável só (2x1 <= 8 → x1 <= 4)
+    remaining = []
+    for coefficients, operator, rhs, text in rows:
+        if not coefficients:
+            if not satisfied(0.0, operator, rhs):
+                return stop('Infeasible')
+            stats['empty'] += 1
+        elif len(coefficients) == 1:
+            (var, coef), = coefficients.items()
+            tighten(bounds[var], coef, operator, rhs)
+            stats['bounds'] += 1
+        else:
+            remaining.append((coefficients, operator, rhs, text))
+
+    for var in integer:
+        low, up = bounds[var]
+        bounds[var] = [
+            low if low == -math.inf else math.ceil(low - TOLERANCE),
+            up if up == math.inf else math.floor(up + TOLERANCE),
+        ]
+    if any(low > up + TOLERANCE for low, up in bounds.values()):
+        return stop('Infeasible')
+
+    # Restrições paralelas: a mesma combinação de variáveis, a menos de escala e sinal
+    kept, status = parallel_rows(remaining, stats)
+    if status:
+        return stop(status)
+
+    # Restrições que os limites das variáveis já garantem (ou que eles tornam impossíveis)
+    rows = []
+    for coefficients, operator, rhs, text in kept:
+        low, up = activity(coefficients, bounds)
+        if (operator != '>=' and low > rhs + TOLERANCE) or (operator != '<=' and up < rhs - TOLERANCE):
+            return stop('Infeasible')
+        if (operator == '<=' and up <= rhs + TOLERANCE) or (operator == '>=' and low >= rhs - TOLERANCE) \
+                or (operator == '=' and up - low <= TOLERANCE):
+            stats['redundant'] += 1
+        else:
+            rows.append((coefficients, operator, rhs, text))
+
+    # Uma variável fora de todas as restrições que melhora o objetivo sem limite torna o
+    # problema ilimitado, desde que o restante seja factível (verificado em um ponto)
+    used = set().union(*(coefficients for coefficients, _, _, _ in rows))
+    maximize = problem['objective'] == 'maximize'
+    for var, coef in cost.items():
+        if var in used or coef == 0:
+            continue
+        improving = bounds[var][1] if (coef > 0) == maximize else -bounds[var][0]
+        if improving == math.inf and all(
+            satisfied(sum(c * clamp(bounds[v]) for v, c in coefficients.items()), operator, rhs)
+            for coefficients, operator, rhs, _ in rows
+        ):
+            return stop('Unbounded')
+
+    stats['kept'] = len(rows)
+    return reduced_problem(problem, names, bounds, rows, integer), stats
+
+
+# Função para verificar `valor operador rhs`, com tolerância
+def satisfied(value, operator, rhs):
+    if operator == '<=':
+        return value <= rhs + TOLERANCE
+    if operator == '>=':
+        return value >= rhs - TOLERANCE
+    return abs(value - rhs) <= TOLERANCE
+
+
+# Função para apertar os limites [low, up] de uma variável com `coef * x operador rhs`
+def tighten(bound, coef, operator, rhs):
+    value = rhs / coef
+    if coef < 0 and operator != '=':
+        operator = '>=' if operator == '<=' else '<='
+    if operator in ('<=', '='):
+        bound[1] = min(bound[1], value)
+    if operator in ('>=', '='):
+        bound[0] = max(bound[0], value)
+
+
+# Função para o menor e o maior valor de uma combinação linear dentro dos limites
+def activity(coefficients, bounds):
+    low = up = 0.0
+    for var, coef in coefficients.items():
+        a, b = coef * bounds[var][0], coef * bounds[var][1]
+        low += min(a, b)
+        up += max(a, b)
+    return low, up
+
+
+# Função para o ponto mais próximo de 0 dentro dos limites de uma variável
+def clamp(bound):
+    return min(max(0.0, bound[0]), bound[1])
+
+
+# Função para remover restrições paralelas duplicadas ou dominadas
+def parallel_rows(rows, stats):
+    """
+    Cada restrição é normalizada (variáveis em ordem, primeiro coeficiente
+    1) e vira um intervalo para essa combinação: `a·x <= b` é (-inf, b].
+    Em cada combinação ficam só as restrições que dão o intervalo mais
+    apertado; as demais são duplicadas (iguais a uma que ficou) ou
+    dominadas. Retorna (restrições mantidas, 'Infeasible' ou None).
+    """
+    groups = {}
+    for index, (coefficients, operator, rhs, text) in enumerate(rows):
+        ordered = sorted(coefficients.items())
+        scale = ordered[0][1]
+        key = tuple((var, round(coef / scale, 9)) for var, coef in ordered)
+        value = rhs / scale
+        if scale < 0 and operator != '=':
+            operator = '>=' if operator == '<=' else '<='
+        low = value if operator in ('>=', '=') else -math.inf
+        up = value if operator in ('<=', '=') else math.inf
+        groups.setdefault(key, []).append((index, low, up))
+
+    kept = set()
+    for entries in groups.values():
+        low = max(entry[1] for entry in entries)
+        up = min(entry[2] for entry in entries)
+        if low > up + TOLERANCE:
+            return [], 'Infeasible'
+
+        # Uma restrição que dá os dois limites (uma igualdade) basta sozinha
+        both = [entry for entry in entries if close(entry[1], low) and close(entry[2], up)]
+        if both:
+            chosen = both[:1]
+        else:
+            chosen = [
+                next(entry for entry in entries if close(limit, entry[position]))
+                for limit, position in ((low, 1), (up, 2))
+                if abs(limit) != math.inf
+            ]
+        kept.update(entry[0] for entry in chosen)
+        for index, entry_low, entry_up in entries:
+            if index in kept:
+                continue
+            if any(close(entry_low, c[1]) and close(entry_up, c[2]) for c in chosen):
+                stats['duplicate'] += 1
+            else:
+                stats['dominated'] += 1
+    return [row for index, row in enumerate(rows) if index in kept], None
+
+
+# Função para comparar dois limites (possivelmente infinitos), com tolerância relativa
+def close(a, b):
+    if abs(a) == math.inf or abs(b) == math.inf:
+        return a == b
+    return abs(a - b) <= TOLERANCE * max(1.0, abs(a))
+
+
+# Função para montar o problema reduzido
+def reduced_problem(problem, names, bounds, rows, integer):
+    """
+    Em problemas de duas variáveis (x1, x2) sem declarações, os limites
+    voltam como restrições de uma variável (uma por lado), para que o
+    resolvedor 2-D e o gráfico continuem valendo. Nos demais, eles vão
+    para as declarações de "variables".
+    """
+    reduced = {**problem, 'constraints': [text for _, _, _, text in rows]}
+    declared = problem.get('variables', {})
+    if names == {'x1', 'x2'} and not declared:
+        used = set(parse_linear(problem['objectiveFunction'])).union(*(c for c, _, _, _ in rows))
+        for var in sorted(names):
+            low, up = bounds[var]
+            if low == up:
+                reduced['constraints'].append(f'{var}={low!r}')
+                continue
+            if low > 0:
+                reduced['constraints'].append(f'{var}>={low!r}')
+            if up < math.inf:
+                reduced['constraints'].append(f'{var}<={up!r}')
+            elif low <= 0 and var not in used:
+                # Mantém a variável no modelo (e no ponto ótimo do gráfico)
+                reduced['constraints'].append(f'{var}>=0')
+        return reduced
+
+    variables = {}
+    for var in sorted(names):
+        low, up = bounds[var]
+        variables[var] = {
+            'cat': declared.get(var, {}).get('cat', 'Continuous'),
+            'lowBound': None if low == -math.inf else low,
+            'upBound': None if up == math.inf else up,
+        }
+    reduced['variables'] = variables
+    return reduced
+
+
+# Função para a solução de um problema que o presolve já mostrou ser inviável ou ilimitado
+def presolved_solution(problem, stats):
+    names = set(parse_linear(problem['objectiveFunction'])).union(problem.get('variables', {}))
+    for c in problem['constraints']:
+        parsed = parse_constraint(c)
+        if parsed:
+            names.update(parsed[0])
+    return {
+        'optimal_point': [None] * len(names),
+        'objective_result': None,
+        'constraint_lines': None,
+        'restriction_points': [],
+        'status': stats['status'],
+        'presolve': stats,
+    }
@@ -0,0 +1,265 @@
+from pulp import (
+    LpAffineExpression, LpProblem, LpSolutionIntegerFeasible, LpStatus, LpVariable, LpMaximize, LpMinimize,
+    value,
+)
+
+from .parser import parse_constraint, parse_linear
+from .planar import MAX_CONSTRAINTS, solve_2d
+
+
+# Função para parsear expressões matemáticas
+def parse_expression(expression, variables):
+    return linear_expression(parse_linear(expression), variables)
+
+
+# Função para montar a expressão PuLP a partir dos coeficientes já parseados
+def linear_expression(coefficients, variables):
+    for var in coefficients:
+        if var not in variables:
+            variables[var] = LpVariable(var, lowBound=0)
+    return LpAffineExpression([(variables[var], coef) for var, coef in coefficients.items()])
+
+
+# Função para calcular dois pontos de uma reta
+def find_line_points(lhs: str, rhs: float):
+    """
+    Encontra dois pontos para uma restrição:
+    - Para equações com duas variáveis: Ponto A (0, ?) e Ponto B (?, 0)
+    - Para equações com apenas x1: Ponto A (rhs, 0) e Ponto B (rhs, 2)
+    - Para equações com apenas x2: Ponto A (0, rhs/coef) e Ponto B (2, rhs/coef)
+    """
+    try:
+        return line_points(parse_linear(lhs), rhs)
+    except ValueError as e:
+        print(f"Erro ao calcular pontos da restrição: {e}")
+        return (0, 0), (0, 0)
+
+
+# Função para calcular dois pontos de uma reta a partir dos coeficientes já parseados
+def line_points(coefficients, rhs):
+    has_x1 = 'x1' in coefficients
+    has_x2 = 'x2' in coefficients
+
+    # Captura os coeficientes ou assume 1 quando omitidos
+    x1_coef = coefficients.get('x1', 1)
+    x2_coef = coefficients.get('x2', 1)
+
+    try:
+        # Resolução da Equação
+        # Caso com apenas x1 (ex: x1 <= 5)
+        if has_x1 and not has_x2:
+            return (rhs / x1_coef, 0), (rhs / x1_coef, 2)
+
+        # Caso com apenas x2 (ex: 2x2 <= 30)
+        if has_x2 and not has_x1:
+            resolved_rhs = rhs / x2_coef
+            return (0, resolved_rhs), (2, resolved_rhs)
+
+        # Caso padrão com duas variáveis (ex: -x1 + 2x2 <= 4)
+        y_intercept = rhs / x2_coef if x2_coef != 0 else 0
+        x_intercept = rhs / x1_coef if x1_coef != 0 else 0
+
+        return (0, y_intercept), (x_intercept, 0)
+
+    except ZeroDivisionError:
+        print("Erro: Divisão por zero ao calcular pontos de restrição.")
+        return (0, 0), (0, 0)
+
+
+# Tipos de variável aceitos em "variables" e a categoria correspondente do PuLP
+VARIABLE_TYPES = {'continuous': 'Continuous', 'integer': 'Integer', 'binary': 'Binary'}
+
+
+# Função para ler o problema do corpo JSON da requisição
+def read_problem(data):
+    problem = {
+        'objective': data['objective'],
+        'objectiveFunction': data['objectiveFunction'],
+        'constraints': data['constraints'],
+        'nonNegativity': data.get('nonNegativity', {'x1': True, 'x2': True}),
+        'solver': data.get('solver'),
+    }
+    # Campos opcionais: ausentes, o problema (e sua chave no cache) fica como antes
+    variables = read_variables(data.get('variables'))
+    if variables:
+        problem['variables'] = variables
+    limits = read_limits(data.get('limits'))
+    if limits:
+        problem['limits'] = limits
+    return problem
+
+
+# Função para ler o tipo e os limites declarados das variáveis
+def read_variables(spec):
+    """
+    `spec` mapeia o nome da variável para o tipo ("integer") ou para
+    {"type": ..., "lowBound": ..., "upBound": ...}. lowBound padrão é 0
+    (como nas variáveis não declaradas); null deixa a variável livre.
+    Retorna {nome: {'cat', 'lowBound', 'upBound'}}.
+    """
+    if not spec:
+        return {}
+    if not isinstance(spec, dict):
+        raise ValueError('"variables" deve mapear cada variável ao seu tipo e limites.')
+
+    variables = {}
+    for name, options in spec.items():
+        if isinstance(options, str):
+            options = {'type': options}
+        if not isinstance(options, dict):
+            raise ValueError(f'Declaração inválida para a variável {name}.')
+        kind = options.get('type', 'continuous')
+        if kind not in VARIABLE_TYPES:
+            raise ValueError(f'Tipo de variável desconhecido para {name}: {kind}')
+
+        bounds = []
+        for bound, default in (('lowBound', 0), ('upBound', None)):
+            number = options.get(bound, default)
+            if number is not None and not isinstance(number, (int, float)):
+                raise ValueError(f'{bound} de {name} deve ser um número ou null.')
+            bounds.append(number)
+        if kind == 'binary':
+            bounds = [0, 1]
+        if None not in bounds and bounds[0] > bounds[1]:
+            raise ValueError(f'lowBound maior que upBound na variável {name}.')
+
+        variables[name] = {'cat': VARIABLE_TYPES[kind], 'lowBound': bounds[0], 'upBound': bounds[1]}
+    return variables
+
+
+# Função para ler os limites de resolução pedidos (o servidor aplica os seus máximos)
+def read_limits(spec):
+    if not spec:
+        return {}
+    if not isinstance(spec, dict):
+        raise ValueError('"limits" deve ser um objeto com timeLimit e/ou gapRel.')
+    limits = {}
+    for name in ('timeLimit', 'gapRel'):
+        if spec.get(name) is None:
+            continue
+        number = spec[name]
+        if not isinstance(number, (int, float)) or number < 0:
+            raise ValueError(f'{name} deve ser um número não negativo.')
+        limits[name] = number
+    return limits
+
+
+# Função para criar a restrição PuLP a partir de (coeficientes, operador, rhs)
+def make_constraint(parsed, variables):
+    coefficients, operator, rhs = parsed
+    lhs = linear_expression(coefficients, variables)
+    if operator == '<=':
+        return lhs <= rhs
+    elif operator == '>=':
+        return lhs >= rhs
+    return lhs == rhs
+
+
+# Função para calcular as retas do gráfico e os pontos de cada restrição
+def constraint_geometry(constraints):
+    restriction_points = []
+    constraint_lines = []
+    for i, c in enumerate(constraints):
+        parsed = parse_constraint(c)
+        if parsed:
+            coefficients, operator, rhs = parsed
+            constraint_lines.append(parsed)
+
+            # Calcular pontos para o gráfico
+            A, B = line_points(coefficients, rhs)
+            restriction_points.append({
+                'Restrição': f'Restrição {i + 1}',
+                'Pontos': [A, B]
+            })
+    return constraint_lines, restriction_points
+
+
+# Função para montar o modelo PuLP a partir do problema
+def build_model(problem):
+    """
+    Retorna (model, constraint_lines, restriction_points): o modelo pronto
+    para ser resolvido, as restrições como (coeficientes, operador, rhs) para
+    o gráfico e os dois pontos de cada reta exibidos na resposta.
+    """
+    non_negativity = problem['nonNegativity']
+
+    # Criar modelo de otimização
+    sense = LpMaximize if problem['objective'] == 'maximize' else LpMinimize
+    model = LpProblem('Optimization', sense)
+
+    # Variáveis declaradas (tipo e limites); as demais são criadas contínuas, >= 0
+    variables = {
+        name: LpVariable(name, lowBound=spec['lowBound'], upBound=spec['upBound'], cat=spec['cat'])
+        for name, spec in problem.get('variables', {}).items()
+    }
+    constraint_lines, restriction_points = constraint_geometry(problem['constraints'])
+
+    # Adicionar função objetivo
+    model += parse_expression(problem['objectiveFunction'], variables), 'Objective'
+
+    # Adicionar restrições (nomeadas R1, R2, ... pela posição na lista)
+    for i, c in enumerate(problem['constraints']):
+        parsed = parse_constraint(c)
+        if parsed:
+            model += make_constraint(parsed, variables), f'R{i + 1}'
+
+    # Adicionar restrições de não negatividade
+    if non_negativity.get('x1', True):
+        model += variables['x1'] >= 0, 'NN_x1'
+    if non_negativity.get('x2', True):
+        model += variables['x2'] >= 0, 'NN_x2'
+
+    return model, constraint_lines, restriction_points
+
+
+# Função para extrair a solução de um modelo já resolvido
+def model_solution(model, constraint_lines, restriction_points):
+    return {
+        'optimal_point': [v.varValue for v in model.variables()],
+        'objective_result': value(model.objective),
+        'constraint_lines': constraint_lines,
+        'restriction_points': restriction_points,
+        'status': solution_status(model),
+    }
+
+
+# Função para o status da solução: 'Feasible' é a melhor solução inteira encontrada
+# antes do limite de tempo, sem prova de otimalidade
+def solution_status(model):
+    if model.sol_status == LpSolutionIntegerFeasible:
+        return 'Feasible'
+    return LpStatus[model.status]
+
+
+# Função para resolver problemas em (x1, x2) por enumeração de vértices, sem chamar o CBC
+def solve_planar(problem):
+    """
+    Retorna a solução no formato de model_solution, acrescida dos vértices
+    da região factível, ou None quando o problema não é 2-D, tem restrições
+    demais, declara tipos ou limites de variáveis ou não tem ótimo finito
+    (esses casos seguem para o PuLP).
+    """
+    if problem.get('variables'):
+        return None
+    cost = parse_linear(problem['objectiveFunction'])
+    constraint_lines, restriction_points = constraint_geometry(problem['constraints'])
+    if len(constraint_lines) > MAX_CONSTRAINTS:
+        return None
+
+    names = set(cost).union(*(coefficients for coefficients, _, _ in constraint_lines))
+    if names != {'x1', 'x2'}:
+        return None
+
+    planar = solve_2d(problem['objective'] == 'maximize', cost, constraint_lines)
+    if planar['status'] != 'Optimal':
+        return None
+    return {
+        'optimal_point': planar['optimal_point'],
+        'objective_result': planar['objective_result'],
+        'constraint_lines': constraint_lines,
+        'restriction_points': restriction_points,
+        'vertices': planar['vertices'].tolist(),
+        'bounded': planar['bounded'],
+        'status': 'Optimal',
+    }
+
@@ -0,0 +1,131 @@
+import matplotlib
+matplotlib.use('Agg')
+
+import io
+from matplotlib import rc_context
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+from matplotlib.patches import Polygon
+import numpy as np
+from PIL import Image
+
+from .geometry import plot_limits, region_vertices
+from .timing import span
+from .variants import DEFAULT_VARIANT
+
+# SVG menor: texto como <text> (sem contornos das letras), caminhos simplificados;
+# hashsalt fixo para que o mesmo gráfico gere sempre o mesmo SVG (ids estáveis)
+SVG_RC = {'svg.fonttype': 'none', 'svg.hashsalt': 'solver', 'path.simplify': True, 'path.simplify_threshold': 0.5}
+
+# Qualidade do codificador WebP e número de cores do PNG simplificado
+WEBP_QUALITY = {'high': 85, 'low': 55}
+LOW_PNG_COLORS = 64
+
+
+# Função para desenhar o gráfico da região factível e retornar a imagem em bytes
+def render_graph(constraint_lines, non_negativity, optimal_point, vertices=None, variant=None):
+    """
+    A região factível é calculada exatamente (interseção de semiplanos) e
+    desenhada como um único polígono; as restrições são retas infinitas
+    (axline), sem amostragem de pontos. Usa apenas a API orientada a objetos
+    (Figure), sem o estado global do pyplot, podendo rodar em qualquer thread
+    ou processo. Se o resolvedor 2-D já calculou os vértices da região
+    (limitada), eles são reaproveitados em `vertices`. `variant` (ver
+    solver/variants.py) escolhe formato, largura, DPI e qualidade.
+    """
+    variant = variant or DEFAULT_VARIANT
+    optimum = (optimal_point[0], optimal_point[1])
+    with span('geometry'):
+        vertices = region_vertices(constraint_lines, non_negativity, optimum, vertices)
+
+    width, dpi = variant['width'], variant['dpi']
+    detail = variant['quality'] == 'high'
+    with span('draw'):
+        fig = draw_figure(
+            constraint_lines, non_negativity, optimum, vertices,
+            figsize=(width / dpi, width * 0.8 / dpi), dpi=dpi, detail=detail,
+        )
+    with span(variant['format']):
+        return encode_figure(fig, variant['format'], dpi, detail)
+
+
+# Função para gravar a figure no formato pedido
+def encode_figure(fig, fmt, dpi, detail=True):
+    buffer = io.BytesIO()
+    if fmt == 'svg':
+        with rc_context(SVG_RC):
+            fig.savefig(buffer, format='svg', dpi=dpi, metadata={'Date': None})
+    elif fmt == 'webp':
+        fig.savefig(buffer, format='webp', dpi=dpi, pil_kwargs={'quality': WEBP_QUALITY['high' if detail else 'low']})
+    elif detail:
+        fig.savefig(buffer, format='png', dpi=dpi)
+    else:
+        # PNG com paleta reduzida: bem menor para miniaturas, sem diferença visível
+        canvas = FigureCanvasAgg(fig)
+        canvas.draw()
+        image = Image.fromarray(np.asarray(canvas.buffer_rgba())).convert('RGB')
+        image.quantize(LOW_PNG_COLORS).save(buffer, format='png', optimize=True)
+    return buffer.getvalue()
+
+
+# Função para montar a figure (retas, região factível e ponto ótimo), sem rasterizar
+def draw_figure(constraint_lines, non_negativity, optimum, vertices, figsize=(10, 8), dpi=100, detail=True):
+    """Sem `detail`, a figure sai sem título, grade, legenda e rótulo do ponto ótimo."""
+    fig = Figure(figsize=figsize, dpi=dpi)
+    ax = fig.add_subplot()
+    ax.set_xlabel('x1')
+    ax.set_ylabel('x2')
+    if detail:
+        ax.set_title('Gráfico da Região Factível e Solução Ótima')
+
+    # Desenhar eixos principais
+    ax.axhline(0, color='black', linewidth=2)  # Eixo X
+    ax.axvline(0, color='black', linewidth=2)  # Eixo Y
+
+    for i, (coefficients, operator, rhs) in enumerate(constraint_lines):
+        x1_coef = coefficients.get('x1', 0.0)
+        x2_coef = coefficients.get('x2', 0.0)
+        label = f'Restrição {i + 1}'
+
+        # Restrições verticais (ex: x1 <= 5)
+        if x2_coef == 0 and x1_coef != 0:
+            ax.axvline(x=rhs / x1_coef, color='purple', linewidth=2, label=label)
+        # Restrições horizontais (ex: x2 <= 6)
+        elif x1_coef == 0 and x2_coef != 0:
+            ax.axhline(y=rhs / x2_coef, color='green', linewidth=2, label=label)
+        # Restrições lineares
+        elif x1_coef != 0 and x2_coef != 0:
+            ax.axline((0, rhs / x2_coef), slope=-x1_coef / x2_coef, color=f'C{i % 10}', linewidth=2, label=label)
+
+    if len(vertices) >= 3:
+        ax.add_patch(Polygon(vertices, closed=True, alpha=0.2, color='gray', label='Região Factível'))
+    elif len(vertices) == 2:
+        # Região degenerada (restrições de igualdade): um segmento
+        ax.plot(vertices[:, 0], vertices[:, 1], color='gray', alpha=0.5, linewidth=6, label='Região Factível')
+
+    # Adicionar ponto ótimo ao gráfico
+    ax.scatter(optimum[0], optimum[1], color='red', s=100 if detail else 40, label='Solução Ótima', zorder=3)
+    if detail:
+        ax.text(optimum[0], optimum[1], f'({optimum[0]}, {optimum[1]})', fontsize=10, color='red')
+
+    # Ajustar os eixos aos vértices do polígono (e ao ponto ótimo)
+    xlim, ylim = plot_limits(vertices, optimum, non_negativity)
+    ax.set_xlim(*xlim)
+    ax.set_ylim(*ylim)
+
+    if detail:
+        ax.grid(color='gray', linestyle='--', linewidth=0.5, alpha=0.7)
+        ax.legend()
+    else:
+        fig.tight_layout(pad=0.3)
+    return fig
+
+
+# Função executada ao iniciar cada processo de renderização
+def warm_up():
+    """Carrega o backend Agg, fontes e o codificador PNG antes da primeira requisição."""
+    fig = Figure(figsize=(1, 1))
+    ax = fig.add_subplot()
+    ax.plot([0, 1], [0, 1], label='warm-up')
+    ax.legend()
+    fig.savefig(io.BytesIO(), format='png')
@@ -0,0 +1,121 @@
+import time
+
+import numpy as np
+from django.conf import settings
+from pulp import LpStatus, PULP_CBC_CMD, value
+
+from .backends import solver_limits
+from .problem import build_model
+
+DEFAULT_SETTINGS = {
+    'MAX_STEPS': 1000,   # Número máximo de resoluções por varredura
+}
+
+
+def sweep_settings():
+    return {**DEFAULT_SETTINGS, **getattr(settings, 'SOLVER_SWEEP', {})}
+
+
+# Função para expandir os valores de um parâmetro ("values" ou "start"/"stop"/"num")
+def parameter_values(parameter):
+    if 'values' in parameter:
+        return np.asarray(parameter['values'], dtype=float)
+    return np.linspace(float(parameter['start']), float(parameter['stop']), int(parameter['num']))
+
+
+# Função para validar os parâmetros da varredura e associá-los aos objetos do modelo
+def read_parameters(model, parameters):
+    """
+    Cada parâmetro é {"type": "rhs", "constraint": N} (N a partir de 1, como
+    em "Restrição N") ou {"type": "objective", "variable": "x1"}, com os
+    valores em "values" ou em "start"/"stop"/"num". Com mais de um parâmetro,
+    todos devem ter o mesmo número de valores: o passo k usa o k-ésimo valor
+    de cada um.
+    """
+    variables = {v.name: v for v in model.variables()}
+    columns = {}
+    setters = []
+    for parameter in parameters:
+        values = parameter_values(parameter)
+        if parameter.get('type', 'rhs') == 'rhs':
+            name = f"R{int(parameter['constraint'])}"
+            if name not in model.constraints:
+                raise ValueError(f"Restrição {parameter['constraint']} não existe.")
+            constraint = model.constraints[name]
+            setters.append(lambda v, c=constraint: c.changeRHS(v))
+            columns[f'{name}.rhs'] = values
+        elif parameter['type'] == 'objective':
+            var = variables.get(parameter['variable'])
+            if var is None:
+                raise ValueError(f"Variável {parameter['variable']} não existe.")
+
+            def set_cost(v, x=var):
+                model.objective[x] = v
+            setters.append(set_cost)
+            columns[f'{var.name}.cost'] = values
+        else:
+            raise ValueError(f"Tipo de parâmetro inválido: {parameter['type']}")
+
+    sizes = {len(values) for values in columns.values()}
+    if len(sizes) != 1:
+        raise ValueError('Todos os parâmetros devem ter o mesmo número de valores.')
+    steps = sizes.pop()
+    if steps > sweep_settings()['MAX_STEPS']:
+        raise ValueError(f"A varredura excede o limite de {sweep_settings()['MAX_STEPS']} passos.")
+    return columns, setters, steps
+
+
+def _floats(values):
+    return [np.nan if x is None else x for x in values]
+
+
+# Função para executar a varredura paramétrica reutilizando um único modelo
+def run_sweep(problem, parameters):
+    """
+    Monta o modelo uma única vez e, a cada passo, altera apenas os
+    coeficientes varridos antes de resolver. Retorna o resultado em colunas
+    (uma lista por grandeza, com um valor por passo): status, objetivo,
+    valores das variáveis, preços sombra (pi), folgas (slack) e custos
+    reduzidos (dj).
+    """
+    started = time.perf_counter()
+    model, _, _ = build_model(problem)
+    columns, setters, steps = read_parameters(model, parameters)
+
+    variables = model.variables()
+    constraints = list(model.constraints.items())
+    status = []
+    objective = np.full(steps, np.nan)
+    var_values = np.full((steps, len(variables)), np.nan)
+    reduced_costs = np.full((steps, len(variables)), np.nan)
+    shadow_prices = np.full((steps, len(constraints)), np.nan)
+    slacks = np.full((steps, len(constraints)), np.nan)
+
+    solver = PULP_CBC_CMD(msg=False, **solver_limits(problem))
+    for k in range(steps):
+        for setter, values in zip(setters, columns.values()):
+            setter(float(values[k]))
+        model.solve(solver)
+        status.append(LpStatus[model.status])
+        if model.status != 1:
+            continue
+        objective[k] = value(model.objective)
+        var_values[k] = _floats(v.varValue for v in variables)
+        reduced_costs[k] = _floats(v.dj for v in variables)
+        shadow_prices[k] = _floats(c.pi for _, c in constraints)
+        slacks[k] = _floats(c.slack for _, c in constraints)
+
+    def column(array):
+        return [None if np.isnan(x) else float(x) for x in array]
+
+    return {
+        'steps': steps,
+        'parameters': {name: values.tolist() for name, values in columns.items()},
+        'status': status,
+        'objective': column(objective),
+        'variables': {v.name: column(var_values[:, j]) for j, v in enumerate(variables)},
+        'reduced_costs': {v.name: column(reduced_costs[:, j]) for j, v in enumerate(variables)},
+        'shadow_prices': {name: column(shadow_prices[:, i]) for i, (name, _) in enumerate(constraints)},
+        'slacks': {name: column(slacks[:, i]) for i, (name, _) in enumerate(constraints)},
+        'elapsed_ms': round((time.perf_counter() - started) * 1000, 3),
+    }
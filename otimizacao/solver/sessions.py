@@ -0,0 +1,199 @@
+import os
+import tempfile
+import threading
+import time
+import uuid
+import weakref
+
+from django.conf import settings
+from pulp import LpMaximize, LpMinimize, PULP_CBC_CMD
+
+from .backends import solver_limits
+from .cache import ResultCache
+from .parser import CONSTRAINT_PATTERN, parse_constraint, parse_linear
+from .problem import (
+    build_model, constraint_geometry, make_constraint, model_solution, parse_expression,
+)
+
+DEFAULT_SETTINGS = {
+    'MAX_ENTRIES': 128,    # Sessões mantidas em memória (LRU)
+    'TTL': 30 * 60,        # Tempo sem uso até a sessão expirar, em segundos
+}
+
+
+def _ms(start, end):
+    return round((end - start) * 1000, 3)
+
+
+# Campos aceitos em um delta de sessão
+DELTA_FIELDS = ('objective', 'objectiveFunction', 'constraints', 'rhs')
+
+
+class SolveSession:
+    """
+    Mantém o modelo PuLP de um problema entre requisições. Alterações
+    (delta) são aplicadas no próprio modelo, sem parsear nem reconstruir o
+    restante. Em LPs, o CBC exporta a base ótima de cada resolução
+    (basisO) e a próxima parte dela (basisI), precisando de poucas
+    iterações do simplex; em modelos inteiros, recebe a solução anterior
+    como ponto de partida (warmStart). O tempo de iniciar o CBC e de
+    gravar o modelo continua em toda resolução, então o ganho aparece em
+    modelos médios e grandes.
+    """
+
+    def __init__(self, problem):
+        self.id = uuid.uuid4().hex
+        self.problem = {**problem, 'constraints': list(problem['constraints'])}
+        self.lock = threading.Lock()
+        self.solves = 0
+
+        # Arquivo da base do simplex, removido junto com a sessão
+        fd, self.basis_path = tempfile.mkstemp(prefix='solver-session-', suffix='.bas')
+        os.close(fd)
+        weakref.finalize(self, _remove, self.basis_path)
+        self.basis_layout = None
+
+        started = time.perf_counter()
+        self.model, self.constraint_lines, self.restriction_points = build_model(self.problem)
+        self.variables = {v.name: v for v in self.model.variables()}
+        built = time.perf_counter()
+        self._solve(warm_start=False)
+        solved = time.perf_counter()
+        self.initial_timings = {'build_ms': _ms(started, built), 'solve_ms': _ms(built, solved)}
+        self.timings = dict(self.initial_timings)
+
+    def _layout(self):
+        # O MPS do PuLP renomeia linhas e colunas pela posição: a base só vale com o mesmo leiaute
+        return [v.name for v in self.model.variables()], list(self.model.constraints)
+
+    def _solve(self, warm_start):
+        options = []
+        mip = self.model.isMIP()
+        if not mip:
+            layout = self._layout()
+            if warm_start and layout == self.basis_layout:
+                options.append(f'basisI {self.basis_path}')
+            # As opções vêm antes do comando de resolução do PuLP: resolve aqui para exportar a
+            # base ótima; a resolução seguinte, pedida pelo PuLP, parte dela e não itera
+            options.append(f'initialSolve -basisO {self.basis_path}')
+            self.basis_layout = layout
+        self.model.solve(PULP_CBC_CMD(
+            msg=False, warmStart=warm_start and mip, options=options, **solver_limits(self.problem)
+        ))
+        self.variables.update((v.name, v) for v in self.model.variables())
+        self.solves += 1
+
+    def _set_constraint(self, index, constraint):
+        parsed = parse_constraint(constraint)
+        name = f'R{index + 1}'
+        new = make_constraint(parsed, self.variables)
+        new.name = name
+        self.model.constraints[name] = new
+        self.model.addVariables(list(new.keys()))
+        self.problem['constraints'][index] = constraint
+
+    def _set_rhs(self, index, rhs):
+        self.model.constraints[f'R{index + 1}'].changeRHS(float(rhs))
+
+        # Mantém o texto da restrição (usado na chave do cache) coerente com o modelo
+        match = CONSTRAINT_PATTERN.match(self.problem['constraints'][index].replace(' ', ''))
+        self.problem['constraints'][index] = f'{match.group(1)}{match.group(2)}{float(rhs)}'
+
+    def apply(self, delta):
+        """
+        Aplica um delta e resolve de novo. Chaves aceitas (índices a partir de 1,
+        como nos rótulos "Restrição N"):
+            "objective": "maximize" | "minimize"
+            "objectiveFunction": "2x1+4x2"
+            "constraints": {"2": "2x2<=14"}
+            "rhs": {"2": 14}
+        """
+        started = time.perf_counter()
+        self.validate(delta)
+
+        if 'objective' in delta:
+            self.problem['objective'] = delta['objective']
+            self.model.sense = LpMaximize if delta['objective'] == 'maximize' else LpMinimize
+        if 'objectiveFunction' in delta:
+            self.problem['objectiveFunction'] = delta['objectiveFunction']
+            self.model.setObjective(parse_expression(delta['objectiveFunction'], self.variables))
+        for index, constraint in delta.get('constraints', {}).items():
+            self._set_constraint(int(index) - 1, constraint)
+        for index, rhs in delta.get('rhs', {}).items():
+            self._set_rhs(int(index) - 1, rhs)
+
+        self.constraint_lines, self.restriction_points = constraint_geometry(self.problem['constraints'])
+        applied = time.perf_counter()
+        self._solve(warm_start=True)
+        solved = time.perf_counter()
+        self.timings = {'apply_ms': _ms(started, applied), 'solve_ms': _ms(applied, solved)}
+
+    def validate(self, delta):
+        """Valida o delta inteiro antes de alterar o modelo; levanta ValueError."""
+        if not isinstance(delta, dict):
+            raise ValueError('O delta deve ser um objeto JSON.')
+        unknown = set(delta) - set(DELTA_FIELDS)
+        if unknown:
+            raise ValueError(f"Campos desconhecidos no delta: {', '.join(sorted(unknown))}")
+        if delta.get('objective', 'maximize') not in ('maximize', 'minimize'):
+            raise ValueError('"objective" deve ser "maximize" ou "minimize".')
+        if 'objectiveFunction' in delta:
+            if not isinstance(delta['objectiveFunction'], str):
+                raise ValueError('"objectiveFunction" deve ser um texto.')
+            parse_linear(delta['objectiveFunction'])
+        for field in ('constraints', 'rhs'):
+            if not isinstance(delta.get(field, {}), dict):
+                raise ValueError(f'"{field}" deve mapear o número da restrição ao novo valor.')
+
+        total = len(self.problem['constraints'])
+        for index, constraint in delta.get('constraints', {}).items():
+            if not isinstance(constraint, str) or parse_constraint(constraint) is None:
+                raise ValueError(f'Restrição {index} inválida: {constraint}')
+            self._index(index, total)
+        for index, rhs in delta.get('rhs', {}).items():
+            if isinstance(rhs, bool) or not isinstance(rhs, (int, float)):
+                raise ValueError(f'O lado direito da restrição {index} deve ser um número.')
+            self._index(index, total)
+
+    def _index(self, index, total):
+        try:
+            number = int(index)
+        except ValueError:
+            raise ValueError(f'Número de restrição inválido: {index}')
+        if not 1 <= number <= total or f'R{number}' not in self.model.constraints:
+            raise ValueError(f'Restrição {index} não existe.')
+        return number
+
+    def solution(self):
+        return model_solution(self.model, self.constraint_lines, self.restriction_points)
+
+    def timing_report(self):
+        report = {**self.timings, 'solves': self.solves}
+        if self.solves > 1:
+            initial = self.initial_timings['build_ms'] + self.initial_timings['solve_ms']
+            current = self.timings['apply_ms'] + self.timings['solve_ms']
+            report['initial'] = self.initial_timings
+            report['speedup'] = round(initial / current, 2) if current else None
+        return report
+
+
+def _remove(path):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+_session_store = None
+_session_store_lock = threading.Lock()
+
+
+# Função para obter o armazenamento de sessões (sempre em memória: guarda modelos PuLP vivos)
+def get_session_store():
+    global _session_store
+    if _session_store is None:
+        with _session_store_lock:
+            if _session_store is None:
+                options = {**DEFAULT_SETTINGS, **getattr(settings, 'SOLVER_SESSIONS', {})}
+                _session_store = ResultCache(max_entries=options['MAX_ENTRIES'], ttl=options['TTL'])
+    return _session_store
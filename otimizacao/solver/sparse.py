@@ -0,0 +1,205 @@
+import hashlib
+import json
+
+import numpy as np
+from pulp import (
+    LpAffineExpression, LpConstraint, LpConstraintEQ, LpConstraintGE, LpConstraintLE,
+    LpMaximize, LpMinimize, LpProblem, LpVariable, value,
+)
+
+from .problem import line_points, solution_status
+
+SENSES = {'<=': LpConstraintLE, '>=': LpConstraintGE, '=': LpConstraintEQ}
+
+
+def is_sparse_problem(data):
+    return isinstance(data, dict) and data.get('format') == 'sparse'
+
+
+# Função para converter triplas COO em CSR canônica (ordenada, sem entradas repetidas)
+def coo_to_csr(row, col, values, shape):
+    m, n = shape
+    if not (len(row) == len(col) == len(values)):
+        raise ValueError('row, col e data da matriz devem ter o mesmo tamanho.')
+    if len(row) and (row.min() < 0 or row.max() >= m or col.min() < 0 or col.max() >= n):
+        raise ValueError('Índices da matriz fora do formato (shape) informado.')
+
+    # Índice linear = linha * n + coluna: ordenar por ele ordena por (linha, coluna)
+    linear, inverse = np.unique(row * n + col, return_inverse=True)
+    summed = np.bincount(inverse, weights=values, minlength=len(linear))
+    keep = summed != 0
+    linear, summed = linear[keep], summed[keep]
+
+    indices = linear % n
+    counts = np.bincount(linear // n, minlength=m)
+    indptr = np.concatenate(([0], np.cumsum(counts)))
+    return indptr, indices, summed
+
+
+# Função para ler o formato esparso: custo, matriz COO/CSR, sentidos, rhs e limites
+def read_sparse_problem(data):
+    """
+    Formato aceito:
+        {"format": "sparse", "objective": "maximize",
+         "cost": [c1, ..., cn], "variables": ["x1", ...] (opcional),
+         "matrix": {"format": "coo", "shape": [m, n], "row": [...], "col": [...], "data": [...]}
+                ou {"format": "csr", "shape": [m, n], "indptr": [...], "indices": [...], "data": [...]},
+         "senses": "<=" ou ["<=", ">=", "=", ...], "rhs": [b1, ..., bm],
+         "bounds": [[lb, ub], ...] ou [lb, ub] para todas (null = ilimitado; padrão [0, null]),
+         "integers": [j, ...] (opcional, índices das variáveis inteiras),
+         "offset": constante do objetivo (opcional)}
+    """
+    cost = np.asarray(data['cost'], dtype=float)
+    n = cost.size
+
+    matrix = data['matrix']
+    m, n_cols = (int(d) for d in matrix['shape'])
+    if n_cols != n:
+        raise ValueError(f'A matriz tem {n_cols} colunas, mas o custo tem {n} variáveis.')
+
+    values = np.asarray(matrix['data'], dtype=float)
+    if matrix.get('format', 'coo') == 'csr':
+        indptr = np.asarray(matrix['indptr'], dtype=np.int64)
+        if len(indptr) != m + 1 or indptr[0] != 0 or np.any(np.diff(indptr) < 0) or indptr[-1] != len(values):
+            raise ValueError('indptr inválido para a matriz CSR.')
+        row = np.repeat(np.arange(m, dtype=np.int64), np.diff(indptr))
+        col = np.asarray(matrix['indices'], dtype=np.int64)
+    else:
+        row = np.asarray(matrix['row'], dtype=np.int64)
+        col = np.asarray(matrix['col'], dtype=np.int64)
+    indptr, indices, values = coo_to_csr(row, col, values, (m, n))
+
+    rhs = np.asarray(data['rhs'], dtype=float)
+    if rhs.size != m:
+        raise ValueError(f'rhs deve ter {m} valores.')
+
+    senses = data.get('senses', '<=')
+    senses = [senses] * m if isinstance(senses, str) else list(senses)
+    if len(senses) != m or any(s not in SENSES for s in senses):
+        raise ValueError('senses deve ter um operador (<=, >=, =) por restrição.')
+
+    bounds = data.get('bounds', [0, None])
+    if len(bounds) == 2 and not isinstance(bounds[0], (list, tuple)):
+        bounds = [bounds] * n
+    if len(bounds) != n:
+        raise ValueError(f'bounds deve ter {n} pares [lb, ub].')
+    lower = np.array([-np.inf if lb is None else lb for lb, _ in bounds], dtype=float)
+    upper = np.array([np.inf if ub is None else ub for _, ub in bounds], dtype=float)
+
+    names = list(data.get('variables') or [f'x{j + 1}' for j in range(n)])
+    if len(names) != n or len(set(names)) != n:
+        raise ValueError(f'variables deve ter {n} nomes distintos.')
+
+    integers = np.unique(np.asarray(data.get('integers') or [], dtype=np.int64))
+    if integers.size and (integers[0] < 0 or integers[-1] >= n):
+        raise ValueError('integers deve conter índices de variáveis.')
+
+    return {
+        'objective': data.get('objective', 'maximize'),
+        'shape': (m, n),
+        'cost': cost,
+        'indptr': indptr,
+        'indices': indices,
+        'values': values,
+        'rhs': rhs,
+        'senses': senses,
+        'lower': lower,
+        'upper': upper,
+        'variables': names,
+        'integers': integers,
+        'offset': float(data.get('offset') or 0.0),
+    }
+
+
+# Função para gerar a chave canônica de um problema esparso
+def sparse_problem_key(problem):
+    header = {
+        'format': 'sparse',
+        'sense': 'maximize' if problem['objective'] == 'maximize' else 'minimize',
+        'shape': list(problem['shape']),
+        'senses': problem['senses'],
+        'variables': problem['variables'],
+    }
+    # Campos opcionais: ausentes, a chave fica como antes
+    if problem['integers'].size:
+        header['integers'] = problem['integers'].tolist()
+    if problem['offset']:
+        header['offset'] = problem['offset']
+    digest = hashlib.sha256(json.dumps(header, sort_keys=True).encode('utf-8'))
+    for name in ('cost', 'indptr', 'indices', 'values', 'rhs', 'lower', 'upper'):
+        digest.update(np.ascontiguousarray(problem[name]).tobytes())
+    return digest.hexdigest()
+
+
+# Função para montar o modelo PuLP em bloco, linha a linha da matriz CSR
+def build_sparse_model(problem):
+    """
+    Cada restrição é criada diretamente a partir da fatia da linha na CSR,
+    sem expressões intermediárias (coef * variável) nem parse de strings.
+    """
+    m, n = problem['shape']
+    sense = LpMaximize if problem['objective'] == 'maximize' else LpMinimize
+    model = LpProblem('Optimization', sense)
+
+    lower = [None if np.isinf(lb) else lb for lb in problem['lower'].tolist()]
+    upper = [None if np.isinf(ub) else ub for ub in problem['upper'].tolist()]
+    variables = [LpVariable(name, lowBound=lb, upBound=ub) for name, lb, ub in zip(problem['variables'], lower, upper)]
+    for j in problem['integers'].tolist():
+        variables[j].cat = 'Integer'
+
+    cost = problem['cost']
+    nonzero = np.flatnonzero(cost)
+    # Variáveis fora do objetivo e das restrições entram no objetivo com custo 0: sem isso,
+    # o MPS gerado pelo PuLP teria limites para colunas inexistentes (erro no CBC)
+    unused = np.setdiff1d(np.arange(n), np.union1d(nonzero, problem['indices']))
+    terms = [(variables[j], float(cost[j])) for j in np.union1d(nonzero, unused).tolist()]
+    model.setObjective(LpAffineExpression(terms, constant=problem['offset']))
+
+    indptr = problem['indptr'].tolist()
+    indices = problem['indices'].tolist()
+    values = problem['values'].tolist()
+    rhs = problem['rhs'].tolist()
+    for i in range(m):
+        start, end = indptr[i], indptr[i + 1]
+        terms = [(variables[j], v) for j, v in zip(indices[start:end], values[start:end])]
+        model.addConstraint(LpConstraint(terms, SENSES[problem['senses'][i]], rhs=rhs[i]), name=f'R{i + 1}')
+
+    # Garante que variáveis fora do objetivo e das restrições também apareçam na solução
+    model.addVariables(variables)
+    return model, variables
+
+
+# Função para extrair a solução de um modelo esparso resolvido
+def sparse_solution(model, variables, problem):
+    """
+    Retorna o mesmo formato de problem.model_solution. Com exatamente duas
+    variáveis, inclui as retas das restrições para o gráfico 2-D; com mais,
+    constraint_lines é None e o gráfico é dispensado.
+    """
+    m, n = problem['shape']
+    solution = {
+        'optimal_point': [v.varValue for v in variables],
+        'objective_result': value(model.objective),
+        'variables': {v.name: v.varValue for v in variables},
+        'constraint_lines': None,
+        'restriction_points': [],
+        'status': solution_status(model),
+    }
+    if n != 2:
+        return solution
+
+    indptr, indices, values, rhs = problem['indptr'], problem['indices'], problem['values'], problem['rhs']
+    solution['constraint_lines'] = []
+    for i in range(m):
+        row = slice(indptr[i], indptr[i + 1])
+        coefficients = {f'x{j + 1}': float(v) for j, v in zip(indices[row], values[row])}
+        solution['constraint_lines'].append((coefficients, problem['senses'][i], float(rhs[i])))
+        A, B = line_points(coefficients, float(rhs[i]))
+        solution['restriction_points'].append({'Restrição': f'Restrição {i + 1}', 'Pontos': [A, B]})
+    return solution
+
+
+# Restrições de não negatividade equivalentes aos limites inferiores (usadas no gráfico 2-D)
+def sparse_non_negativity(problem):
+    lower = problem['lower']
+    return {f'x{j + 1}': bool(lower[j] >= 0) for j in range(min(len(lower), 2))}
@@ -0,0 +1,119 @@
+import importlib
+import json
+import subprocess
+import sys
+import time
+
+from django.conf import settings
+
+DEFAULT_SETTINGS = {
+    'PRELOAD': False,   # Importa MODULES em SolverConfig.ready() (servidor com preload antes do fork)
+    'MODULES': (
+        'solver.backends',    # PuLP e numpy
+        'solver.views',
+    ),
+}
+
+# Dependências que não devem ser carregadas só para atender requisições
+HEAVY_MODULES = ('matplotlib', 'dash', 'plotly')
+
+# Etapas medidas por measure_startup(), na ordem em que acontecem em um processo novo
+STAGES = ('django_setup', 'urlconf', 'first_index', 'first_optimize')
+
+# Script executado em um processo novo: cada etapa é medida uma única vez (partida a frio)
+_PROBE = '''
+import json, os, sys, time
+started = time.perf_counter()
+stages = {}
+def mark(name):
+    global started
+    now = time.perf_counter()
+    stages[name] = round((now - started) * 1000, 3)
+    started = now
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', %(settings)r)
+import django
+django.setup()
+mark('django_setup')
+from django.test.utils import setup_test_environment, override_settings
+from django.urls import get_resolver
+get_resolver().url_patterns
+mark('urlconf')
+setup_test_environment()
+from django.test import Client
+client = Client()
+with override_settings(SOLVER_HISTORY={'ENABLED': False}):
+    status = [client.get('/solver/').status_code]
+    mark('first_index')
+    if %(optimize)r:
+        status.append(client.post('/solver/optimize/', %(body)r, content_type='application/json').status_code)
+        mark('first_optimize')
+if any(code != 200 for code in status):
+    raise SystemExit(f'respostas inesperadas: {status}')
+heavy = [name for name in %(heavy)r if name in sys.modules]
+print(json.dumps({'stages': stages, 'status': status, 'modules': len(sys.modules), 'heavy': heavy}))
+'''
+
+_OPTIMIZE_BODY = json.dumps({
+    'objective': 'maximize',
+    'objectiveFunction': '3x1+5x2',
+    'constraints': ['x1<=4', '2x2<=12', '3x1+2x2<=18'],
+    'nonNegativity': {'x1': True, 'x2': True},
+    'output': 'geometry',
+})
+
+
+def startup_settings():
+    return {**DEFAULT_SETTINGS, **getattr(settings, 'SOLVER_STARTUP', {})}
+
+
+# Função para importar os módulos pesados no processo atual (antes do fork dos workers)
+def preload(modules=None):
+    """
+    Retorna {módulo: ms} com o tempo de importação de cada um. Em um servidor
+    que carrega a aplicação antes do fork (gunicorn --preload), os workers
+    herdam os módulos já importados em vez de importá-los de novo.
+    """
+    timings = {}
+    for name in modules or startup_settings()['MODULES']:
+        started = time.perf_counter()
+        importlib.import_module(name)
+        timings[name] = round((time.perf_counter() - started) * 1000, 3)
+    return timings
+
+
+# Função para medir a partida a frio em um processo Python novo
+def measure_startup(optimize=True, importtime=False):
+    """
+    Retorna {'stages': {etapa: ms}, 'status': [...], 'modules': n, 'heavy':
+    [HEAVY_MODULES carregados]} e, com
+    `importtime`, também {'imports': [(ms acumulado, módulo), ...]} a partir
+    de `python -X importtime` (ordenado do mais caro para o mais barato).
+    """
+    code = _PROBE % {
+        'settings': settings.SETTINGS_MODULE,
+        'optimize': optimize,
+        'body': _OPTIMIZE_BODY,
+        'heavy': HEAVY_MODULES,
+    }
+    command = [sys.executable] + (['-X', 'importtime'] if importtime else []) + ['-c', code]
+    completed = subprocess.run(command, capture_output=True, text=True, cwd=settings.BASE_DIR)
+    if completed.returncode != 0:
+        raise RuntimeError(completed.stderr.strip().splitlines()[-1] if completed.stderr else 'falha')
+
+    report = json.loads(completed.stdout.strip().splitlines()[-1])
+    if importtime:
+        report['imports'] = parse_importtime(completed.stderr)
+    return report
+
+
+# Função para ler a saída de `python -X importtime` (tempos em microssegundos)
+def parse_importtime(output):
+    imports = []
+    for line in output.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        # Apenas as raízes de cada árvore de importação, para não contar duas vezes
+        if name.startswith(' ') and not name.startswith('  '):
+            imports.append((round(int(cumulative) / 1000, 3), name.strip()))
+    return sorted(imports, reverse=True)
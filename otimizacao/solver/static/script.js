@@ -28,7 +28,7 @@ function getCSRFToken() {
     return null;
 }
 
-// Envia os dados para otimização
+// Envia os dados para otimização e acompanha o progresso (Server-Sent Events)
 async function fetchResults() {
     const objective = document.getElementById('objectiveType').value;
     const objectiveFunction = document.getElementById('objectiveFunction').value;
@@ -41,16 +41,18 @@ async function fetchResults() {
         x2: document.getElementById('nonNegativityX2').checked
     };
 
+    // O gráfico é desenhado no navegador a partir da geometria (sem PNG no servidor)
     const data = {
         objective,
         objectiveFunction,
         constraints,
-        nonNegativity
+        nonNegativity,
+        output: 'geometry'
     };
 
     try {
         const csrfToken = getCSRFToken();
-        const response = await fetch('/solver/optimize/', {
+        const response = await fetch('/solver/optimize/stream/', {
             method: 'POST',
             headers: {
                 'Content-Type': 'application/json',
@@ -59,20 +61,264 @@ async function fetchResults() {
             body: JSON.stringify(data)
         });
 
-        const result = await response.json();
-
-        document.getElementById('result').innerHTML =
-        `<div><strong>Ponto Ótimo:</strong> ${result['Ponto Ótimo']}</div><div><strong>Resultado Objetivo:</strong> ${result['Resultado Objetivo']}</div>
-    `;
-
-        document.getElementById('restrictionPoints').innerHTML = result['Pontos Restrição']
-            .map(r => `${r['Restrição']}: (${r['Pontos'][0][0]}, ${r['Pontos'][0][1]}) → (${r['Pontos'][1][0]}, ${r['Pontos'][1][1]})`)
-            .join('<br>');
+        if (!response.ok) {
+            const result = await response.json();
+            throw new Error(result['error']);
+        }
 
-        document.getElementById('graph-image').src = result['graph_path'] + '?t=' + new Date().getTime();
-        document.getElementById('graphSection').style.display = 'block';
+        setStatus('Enviando...');
+        await readEvents(response, handleEvent);
     } catch (error) {
         console.error('Erro:', error);
+        setStatus('');
         alert('Erro inesperado.');
     }
 }
+
+// Lê o corpo text/event-stream da resposta, chamando onEvent(evento, dados) para cada evento
+async function readEvents(response, onEvent) {
+    const reader = response.body.getReader();
+    const decoder = new TextDecoder();
+    let buffer = '';
+
+    while (true) {
+        const { value, done } = await reader.read();
+        if (done) {
+            break;
+        }
+        buffer += decoder.decode(value, { stream: true });
+
+        let end;
+        while ((end = buffer.indexOf('\n\n')) >= 0) {
+            const block = buffer.slice(0, end);
+            buffer = buffer.slice(end + 2);
+
+            let event = 'message';
+            let data = '';
+            for (const line of block.split('\n')) {
+                if (line.startsWith('event: ')) {
+                    event = line.slice(7);
+                } else if (line.startsWith('data: ')) {
+                    data += line.slice(6);
+                }
+            }
+            // Blocos sem dados são apenas keepalive
+            if (data) {
+                onEvent(event, JSON.parse(data));
+            }
+        }
+    }
+}
+
+// Trata cada evento do fluxo de otimização
+function handleEvent(event, data) {
+    const stages = {
+        received: 'Recebido.',
+        parsed: 'Problema lido.',
+        solving: 'Resolvendo...',
+        solved: 'Resolvido.',
+        rendering: 'Gerando gráfico...'
+    };
+
+    if (event === 'stage') {
+        setStatus(stages[data.stage] || data.stage);
+    } else if (event === 'progress') {
+        setStatus(data.line);
+    } else if (event === 'result') {
+        showResult(data);
+    } else if (event === 'graph') {
+        showGraph(data);
+    } else if (event === 'done') {
+        setStatus('');
+    } else if (event === 'error') {
+        throw new Error(data.error);
+    }
+}
+
+// Exibe uma linha de andamento abaixo dos resultados
+function setStatus(text) {
+    document.getElementById('status').textContent = text;
+}
+
+// Exibe o ponto ótimo, o valor objetivo e os pontos das restrições
+function showResult(result) {
+    document.getElementById('result').innerHTML =
+    `<div><strong>Ponto Ótimo:</strong> ${result['Ponto Ótimo']}</div><div><strong>Resultado Objetivo:</strong> ${result['Resultado Objetivo']}</div>
+`;
+
+    document.getElementById('restrictionPoints').innerHTML = result['Pontos Restrição']
+        .map(r => `${r['Restrição']}: (${r['Pontos'][0][0]}, ${r['Pontos'][0][1]}) → (${r['Pontos'][1][0]}, ${r['Pontos'][1][1]})`)
+        .join('<br>');
+}
+
+// Exibe o gráfico: desenhado no canvas (geometria) ou a imagem PNG gerada no servidor
+function showGraph(result) {
+    const canvas = document.getElementById('graph-canvas');
+    const image = document.getElementById('graph-image');
+
+    if (result['geometry']) {
+        drawGeometry(canvas, result['geometry']);
+        canvas.style.display = 'block';
+        image.style.display = 'none';
+    } else if (result['graph_path']) {
+        // O PNG é renderizado em segundo plano; a imagem carrega quando ficar pronta
+        image.src = result['graph_path'];
+        image.style.display = 'block';
+        canvas.style.display = 'none';
+    } else {
+        document.getElementById('graphSection').style.display = 'none';
+        return;
+    }
+    document.getElementById('graphSection').style.display = 'block';
+}
+
+// Exemplos da galeria, resolvidos de antemão no servidor (arquivos estáticos)
+let galleryEntries = [];
+
+// Lista os exemplos da galeria; sem galeria gerada, o seletor continua oculto
+async function loadGallery() {
+    const response = await fetch('/solver/gallery/');
+    if (!response.ok) {
+        return;
+    }
+    galleryEntries = (await response.json()).results;
+    const select = document.getElementById('gallerySelect');
+    for (const entry of galleryEntries) {
+        const option = document.createElement('option');
+        option.value = entry.slug;
+        option.textContent = entry.title;
+        option.title = entry.description;
+        select.appendChild(option);
+    }
+    document.getElementById('gallery').style.display = 'inline-block';
+}
+
+// Preenche o formulário com um exemplo e exibe o resultado e o gráfico já calculados
+async function showExample(slug) {
+    const entry = galleryEntries.find(e => e.slug === slug);
+    if (!entry) {
+        return;
+    }
+    const problem = entry.problem;
+    document.getElementById('objectiveType').value = problem.objective;
+    document.getElementById('objectiveFunction').value = problem.objectiveFunction;
+    document.querySelectorAll('.constraint').forEach(el => el.remove());
+    for (const constraint of problem.constraints) {
+        addConstraint();
+        const inputs = document.querySelectorAll('.con-restriction');
+        inputs[inputs.length - 1].value = constraint;
+    }
+    const nonNegativity = problem.nonNegativity || {};
+    document.getElementById('nonNegativityX1').checked = nonNegativity.x1 !== false;
+    document.getElementById('nonNegativityX2').checked = nonNegativity.x2 !== false;
+
+    const response = await fetch(entry.files.result);
+    showResult(await response.json());
+    showGraph({graph_path: entry.files.graph});
+    setStatus('');
+}
+
+document.addEventListener('DOMContentLoaded', loadGallery);
+
+// Desenha a região factível, as restrições e o ponto ótimo no canvas
+function drawGeometry(canvas, geometry) {
+    const ctx = canvas.getContext('2d');
+    const margin = 50;
+    const [xmin, xmax] = geometry.bounds.x;
+    const [ymin, ymax] = geometry.bounds.y;
+    const width = canvas.width - 2 * margin;
+    const height = canvas.height - 2 * margin;
+
+    // Converte coordenadas do problema em pixels (o eixo y do canvas cresce para baixo)
+    const px = x => margin + (x - xmin) / (xmax - xmin) * width;
+    const py = y => canvas.height - margin - (y - ymin) / (ymax - ymin) * height;
+
+    ctx.clearRect(0, 0, canvas.width, canvas.height);
+    ctx.fillStyle = '#ffffff';
+    ctx.fillRect(0, 0, canvas.width, canvas.height);
+
+    // Grade e marcações dos eixos
+    ctx.font = '12px Montserrat, Arial, sans-serif';
+    ctx.fillStyle = '#333333';
+    ctx.strokeStyle = 'rgba(128, 128, 128, 0.5)';
+    ctx.lineWidth = 0.5;
+    ctx.setLineDash([4, 4]);
+    for (let i = 0; i <= 10; i++) {
+        const x = xmin + (xmax - xmin) * i / 10;
+        const y = ymin + (ymax - ymin) * i / 10;
+        ctx.beginPath();
+        ctx.moveTo(px(x), margin);
+        ctx.lineTo(px(x), canvas.height - margin);
+        ctx.moveTo(margin, py(y));
+        ctx.lineTo(canvas.width - margin, py(y));
+        ctx.stroke();
+        ctx.fillText(+x.toFixed(2), px(x) - 10, canvas.height - margin + 16);
+        ctx.fillText(+y.toFixed(2), 5, py(y) + 4);
+    }
+    ctx.setLineDash([]);
+    ctx.fillText('x1', canvas.width - margin + 10, canvas.height - margin + 4);
+    ctx.fillText('x2', margin - 6, margin - 12);
+
+    // Eixos principais
+    ctx.strokeStyle = '#000000';
+    ctx.lineWidth = 2;
+    ctx.beginPath();
+    if (ymin <= 0 && ymax >= 0) {
+        ctx.moveTo(margin, py(0));
+        ctx.lineTo(canvas.width - margin, py(0));
+    }
+    if (xmin <= 0 && xmax >= 0) {
+        ctx.moveTo(px(0), margin);
+        ctx.lineTo(px(0), canvas.height - margin);
+    }
+    ctx.stroke();
+
+    // Região factível
+    if (geometry.region.length >= 2) {
+        ctx.beginPath();
+        geometry.region.forEach(([x, y], i) => i ? ctx.lineTo(px(x), py(y)) : ctx.moveTo(px(x), py(y)));
+        ctx.closePath();
+        ctx.fillStyle = 'rgba(128, 128, 128, 0.2)';
+        ctx.fill();
+        ctx.strokeStyle = 'rgba(128, 128, 128, 0.6)';
+        ctx.lineWidth = geometry.region.length === 2 ? 6 : 1;
+        ctx.stroke();
+    }
+
+    // Restrições (mesmas cores do gráfico do matplotlib)
+    const colors = ['#1f77b4', '#ff7f0e', '#2ca02c', '#d62728', '#9467bd',
+                    '#8c564b', '#e377c2', '#7f7f7f', '#bcbd22', '#17becf'];
+    const legend = [];
+    geometry.lines.forEach((line, i) => {
+        if (!line.segment) {
+            return;
+        }
+        const [[x1, y1], [x2, y2]] = line.segment;
+        const color = x1 === x2 ? 'purple' : (y1 === y2 ? 'green' : colors[i % colors.length]);
+        ctx.strokeStyle = color;
+        ctx.lineWidth = 2;
+        ctx.beginPath();
+        ctx.moveTo(px(x1), py(y1));
+        ctx.lineTo(px(x2), py(y2));
+        ctx.stroke();
+        legend.push([line.label, color]);
+    });
+
+    // Ponto ótimo
+    const [ox, oy] = geometry.optimum;
+    ctx.fillStyle = 'red';
+    ctx.beginPath();
+    ctx.arc(px(ox), py(oy), 6, 0, 2 * Math.PI);
+    ctx.fill();
+    ctx.fillText(`(${ox}, ${oy})`, px(ox) + 8, py(oy) - 8);
+    legend.push(['Solução Ótima', 'red']);
+
+    // Legenda
+    legend.forEach(([label, color], i) => {
+        const y = margin + 10 + i * 18;
+        ctx.fillStyle = color;
+        ctx.fillRect(canvas.width - margin - 140, y - 8, 12, 12);
+        ctx.fillStyle = '#333333';
+        ctx.fillText(label, canvas.width - margin - 122, y + 2);
+    });
+}
@@ -0,0 +1,22 @@
+from django.conf import settings
+from django.test.runner import DiscoverRunner
+from django.test.utils import override_settings
+
+
+class SolverTestRunner(DiscoverRunner):
+    """
+    Executa os testes sem exploração de resolvedores (SOLVER_BACKENDS['EXPLORE']
+    = 0): a escolha depende só do formato do problema e das métricas, e duas
+    resoluções do mesmo problema usam o mesmo resolvedor. Testes que
+    sobrescrevem SOLVER_BACKENDS herdam o padrão de backends.DEFAULT_SETTINGS,
+    que também não explora.
+    """
+
+    def setup_test_environment(self, **kwargs):
+        super().setup_test_environment(**kwargs)
+        self._without_exploration = override_settings(SOLVER_BACKENDS={**settings.SOLVER_BACKENDS, 'EXPLORE': 0})
+        self._without_exploration.enable()
+
+    def teardown_test_environment(self, **kwargs):
+        self._without_exploration.disable()
+        super().teardown_test_environment(**kwargs)
@@ -1,3 +1,1118 @@
-from django.test import TestCase
+import asyncio
+import importlib.util
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock, skipUnless
 
-# Create your tests here.
+import numpy as np
+from django.conf import settings
+from django.http import StreamingHttpResponse
+from django.test import SimpleTestCase, TestCase, override_settings
+from pulp import PULP_CBC_CMD
+
+from .artifacts import ArtifactStore
+from .admission import ADMITTED, QUEUE_FULL, TIMEOUT, Gate, TokenBuckets, get_admission
+from .parser import cache_clear, cache_info, parse_constraint, parse_linear
+from .planar import solve_2d
+from .backends import (
+    BACKENDS, LatencyMetrics, SolverBackend, mip_report, model_arrays, problem_shape, select_backend, shape_bucket,
+    solve, solve_async_problem, solve_problem,
+)
+from .jobs import cancel_job, queue_position, submit_job
+from .middleware import AsyncReleasingStream
+from .history import HistoryWriter, stored_entry
+from .models import Problem, Solution, SolveJob, SolveTiming
+from .cbc import solve_async
+from .benchmarks import compare, random_spec, run_benchmarks
+from .cache import ResultCache, get_result_cache, problem_key
+from .geometry import clip_line, clip_polygon, feasible_polygon, half_planes, plot_geometry
+from .gallery import EXAMPLES, build_gallery, load_catalog
+from .presolve import presolve
+from .sensitivity import run_sweep
+from .sessions import SolveSession, get_session_store
+from .problem import build_model, constraint_geometry, read_problem, solve_planar
+from .sparse import build_sparse_model, read_sparse_problem, sparse_problem_key
+from .startup import measure_startup, parse_importtime
+from .timing import Histograms, Trace, server_timing
+from .upload import read_upload
+from .variants import DEFAULT_VARIANT, read_variant, variant_name, variant_query
+
+
+# Função para resolver o mesmo problema pelo PuLP (CBC), sem o atalho 2-D
+def solve_with_pulp(problem):
+    from pulp import LpStatus, PULP_CBC_CMD, value
+    from .problem import build_model
+
+    model, _, _ = build_model(problem)
+    model.solve(PULP_CBC_CMD(msg=False))
+    return LpStatus[model.status], value(model.objective)
+
+
+def random_problem(rng):
+    constraints = []
+    for _ in range(rng.randint(1, 6)):
+        a1, a2 = rng.randint(-5, 9), rng.randint(-5, 9)
+        operator = rng.choice(['<=', '<=', '>=', '='])
+        constraints.append(f'{a1}x1+{a2}x2{operator}{rng.randint(0, 40)}'.replace('+-', '-'))
+    return read_problem({
+        'objective': rng.choice(['maximize', 'minimize']),
+        'objectiveFunction': f'{rng.randint(-6, 9)}x1+{rng.randint(-6, 9)}x2'.replace('+-', '-'),
+        'constraints': constraints,
+    })
+
+
+# Função para executar um script em um interpretador novo, com o Django configurado
+def fresh_python(script):
+    setup = "import os, sys, django; os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'otimizacao.settings'); django.setup()\n"
+    return subprocess.run(
+        [sys.executable, '-c', setup + script], cwd=settings.BASE_DIR, capture_output=True, text=True, check=True,
+    ).stdout.strip()
+
+
+WYNDOR = {
+    'objective': 'maximize',
+    'objectiveFunction': '3x1+5x2',
+    'constraints': ['x1<=4', '2x2<=12', '3x1+2x2<=18'],
+}
+
+
+class ResultCacheTests(SimpleTestCase):
+    def test_key_normalization(self):
+        key = problem_key('maximize', '3x1+5x2', ['x1<=4', '3x1+2x2<=18'], {'x1': True})
+        self.assertEqual(key, problem_key('maximize', ' 5x2 + 3 x1', ['1x1 <= 4', '2x2+3x1<=18'], {}))
+        # A ordem das restrições define os rótulos e entra na chave
+        self.assertNotEqual(key, problem_key('maximize', '3x1+5x2', ['3x1+2x2<=18', 'x1<=4'], {}))
+        self.assertNotEqual(key, problem_key('minimize', '3x1+5x2', ['x1<=4', '3x1+2x2<=18'], {}))
+        self.assertNotEqual(key, problem_key('maximize', '3x1+5x2', ['x1<=4', '3x1+2x2<=18'], {}, solver='pulp-cbc'))
+
+    def test_lru_and_ttl(self):
+        cache = ResultCache(max_entries=2, ttl=10)
+        with mock.patch('solver.cache.time.monotonic', return_value=100.0) as clock:
+            cache.set('a', 1)
+            cache.set('b', 2)
+            cache.get('a')          # 'a' passa a ser o mais recente
+            cache.set('c', 3)
+            self.assertEqual((cache.get('a'), cache.get('b'), cache.get('c')), (1, None, 3))
+            clock.return_value = 110.0
+            self.assertIsNone(cache.get('a'))
+            self.assertEqual(len(cache), 1)
+
+    @override_settings(SOLVER_HISTORY={'ENABLED': False})
+    def test_requested_solver_bypasses_other_backends(self):
+        get_result_cache().clear()
+        data = {**WYNDOR, 'output': 'geometry'}
+        first = self.client.post('/solver/optimize/', data, content_type='application/json').json()
+        self.assertEqual(first['Resolvedor'], 'numpy-2d')
+        cbc = self.client.post('/solver/optimize/', {**data, 'solver': 'pulp-cbc'},
+                               content_type='application/json').json()
+        self.assertEqual((cbc['Resolvedor'], cbc['Resultado Objetivo']), ('pulp-cbc', 36.0))
+
+
+class ParserTests(SimpleTestCase):
+    def test_parse_linear(self):
+        self.assertEqual(parse_linear('3x1+5x2'), {'x1': 3.0, 'x2': 5.0})
+        self.assertEqual(list(parse_linear('x2 - x1 + 2.5 x1 + y')), ['x2', 'x1', 'y'])
+        self.assertEqual(parse_linear('x2 - x1 + 2.5 x1 + y'), {'x2': 1.0, 'x1': 1.5, 'y': 1.0})
+
+    def test_parse_constraint(self):
+        self.assertEqual(parse_constraint('2x1 + x2 <= 10'), ({'x1': 2.0, 'x2': 1.0}, '<=', 10.0))
+        self.assertEqual(parse_constraint('-x1>=-4.5'), ({'x1': -1.0}, '>=', -4.5))
+        self.assertEqual(parse_constraint('x1+x2=3')[1], '=')
+        self.assertIsNone(parse_constraint('x1+x2'))
+
+    def test_repeated_strings_come_from_cache(self):
+        cache_clear()
+        first = parse_linear('3x1+5x2')
+        first['x1'] = 0.0
+        self.assertEqual(parse_linear('3x1+5x2'), {'x1': 3.0, 'x2': 5.0})
+        parse_constraint('3x1+2x2<=18')
+        parse_constraint('3x1+2x2<=18')
+        info = cache_info()
+        self.assertEqual((info['expressions'].hits, info['expressions'].misses), (1, 2))
+        self.assertEqual((info['constraints'].hits, info['constraints'].misses), (1, 1))
+
+    def test_invalid_expressions(self):
+        with self.assertRaisesRegex(ValueError, 'Erro ao analisar a expressão'):
+            parse_linear('2..5x1')
+        with self.assertRaises(ValueError):
+            parse_constraint('x1<=abc')
+
+    @override_settings(SOLVER_HISTORY={'ENABLED': False})
+    def test_invalid_expression_returns_400(self):
+        response = self.client.post('/solver/optimize/', {**WYNDOR, 'objectiveFunction': '2..5x1'},
+                                    content_type='application/json')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('Erro ao analisar a expressão', response.json()['error'])
+
+
+class PlanarSolverTests(SimpleTestCase):
+    def test_textbook_problem(self):
+        problem = read_problem({
+            'objective': 'maximize',
+            'objectiveFunction': '3x1+5x2',
+            'constraints': ['x1<=4', '2x2<=12', '3x1+2x2<=18'],
+        })
+        solution = solve_planar(problem)
+        self.assertEqual(solution['optimal_point'], [2.0, 6.0])
+        self.assertAlmostEqual(solution['objective_result'], 36.0)
+        self.assertTrue(solution['bounded'])
+        self.assertEqual(len(solution['vertices']), 5)
+
+    def test_not_eligible_falls_back(self):
+        problem = read_problem({
+            'objective': 'maximize',
+            'objectiveFunction': 'x1+x2+x3',
+            'constraints': ['x1+x2+x3<=4'],
+        })
+        self.assertIsNone(solve_planar(problem))
+        self.assertAlmostEqual(solve_problem(problem)['objective_result'], 4.0)
+
+    def test_matches_pulp_on_random_problems(self):
+        rng = random.Random(2024)
+        statuses = {'Optimal': 0, 'Infeasible': 0, 'Unbounded': 0}
+        for _ in range(150):
+            problem = random_problem(rng)
+            constraint_lines, _ = constraint_geometry(problem['constraints'])
+            cost = parse_linear(problem['objectiveFunction'])
+            planar = solve_2d(problem['objective'] == 'maximize', cost, constraint_lines)
+            status, objective = solve_with_pulp(problem)
+            statuses[planar['status']] += 1
+
+            with self.subTest(problem=problem):
+                self.assertEqual(planar['status'], status)
+                if status == 'Optimal':
+                    self.assertAlmostEqual(planar['objective_result'], objective, places=6)
+                    # O ponto ótimo é um dos vértices devolvidos
+                    self.assertIn(planar['optimal_point'], planar['vertices'].tolist())
+
+        # A amostra cobre os três desfechos
+        self.assertTrue(all(statuses.values()), statuses)
+
+
+class GeometryTests(SimpleTestCase):
+    LINES = [({'x1': 1.0}, '<=', 4.0), ({'x2': 2.0}, '<=', 12.0), ({'x1': 3.0, 'x2': 2.0}, '<=', 18.0)]
+
+    @staticmethod
+    def signed_area(vertices):
+        x, y = vertices[:, 0], vertices[:, 1]
+        return 0.5 * float((x * np.roll(y, -1) - np.roll(x, -1) * y).sum())
+
+    def test_half_planes(self):
+        planes = half_planes([({'x1': 1.0, 'x2': 1.0}, '=', 2.0)], {'x1': True, 'x2': False})
+        self.assertEqual([(list(a), b) for a, b in planes], [([1.0, 1.0], 2.0), ([-1.0, -1.0], -2.0), ([-1.0, 0.0], 0.0)])
+
+    def test_clip_polygon(self):
+        square = np.array([[0.0, 0.0], [2.0, 0.0], [2.0, 2.0], [0.0, 2.0]])
+        self.assertIs(clip_polygon(square, np.array([1.0, 0.0]), 5.0), square)
+        self.assertEqual(len(clip_polygon(square, np.array([1.0, 0.0]), -1.0)), 0)
+        half = clip_polygon(square, np.array([1.0, 0.0]), 1.0)
+        self.assertEqual(sorted(map(tuple, half.tolist())), [(0.0, 0.0), (0.0, 2.0), (1.0, 0.0), (1.0, 2.0)])
+
+    def test_feasible_polygon(self):
+        planes = half_planes(self.LINES, {})
+        vertices = feasible_polygon(planes, (0.0, 10.0, 0.0, 10.0))
+        self.assertEqual(
+            sorted(tuple(np.round(v, 9)) for v in vertices),
+            [(0.0, 0.0), (0.0, 6.0), (2.0, 6.0), (4.0, 0.0), (4.0, 3.0)],
+        )
+        # Sentido anti-horário: área com sinal positiva
+        self.assertAlmostEqual(self.signed_area(vertices), 21.0)
+
+        # Região ilimitada é limitada pela caixa
+        unbounded = feasible_polygon(half_planes([({'x1': 1.0}, '>=', 1.0)], {}), (0.0, 5.0, 0.0, 5.0))
+        self.assertAlmostEqual(self.signed_area(unbounded), 20.0)
+
+    def test_equality_and_infeasible_regions(self):
+        segment = feasible_polygon(half_planes([({'x1': 1.0, 'x2': 1.0}, '=', 2.0)], {}), (0.0, 5.0, 0.0, 5.0))
+        self.assertAlmostEqual(self.signed_area(segment), 0.0)
+        self.assertTrue(np.allclose(segment.sum(axis=1), 2.0))
+
+        lines = self.LINES + [({'x1': 1.0, 'x2': 1.0}, '>=', 20.0)]
+        self.assertEqual(len(feasible_polygon(half_planes(lines, {}), (0.0, 30.0, 0.0, 30.0))), 0)
+
+    def test_clip_line(self):
+        segment = clip_line((3.0, 2.0), 18.0, (0.0, 10.0), (0.0, 10.0))
+        self.assertEqual(sorted(tuple(np.round(p, 9)) for p in segment), [(0.0, 9.0), (6.0, 0.0)])
+        self.assertIsNone(clip_line((1.0, 0.0), 20.0, (0.0, 10.0), (0.0, 10.0)))
+
+
+class GeometryOutputTests(SimpleTestCase):
+    def test_plot_geometry(self):
+        geometry = plot_geometry(GeometryTests.LINES, {}, (2.0, 6.0))
+        self.assertEqual(geometry['bounds'], {'x': [0.0, 5.0], 'y': [0.0, 7.0]})
+        self.assertEqual(geometry['optimum'], [2.0, 6.0])
+        self.assertEqual(sorted(map(tuple, geometry['region'])), [(0.0, 0.0), (0.0, 6.0), (2.0, 6.0), (4.0, 0.0), (4.0, 3.0)])
+        self.assertEqual([line['label'] for line in geometry['lines']], ['Restrição 1', 'Restrição 2', 'Restrição 3'])
+        self.assertEqual(geometry['lines'][0], {'label': 'Restrição 1', 'operator': '<=', 'segment': [[4.0, 0.0], [4.0, 7.0]]})
+        # Vértices já calculados (resolvedor 2-D) são reaproveitados
+        self.assertEqual(plot_geometry(GeometryTests.LINES, {}, (2.0, 6.0), vertices=geometry['region']), geometry)
+
+    @override_settings(SOLVER_HISTORY={'ENABLED': False})
+    def test_optimize_returns_geometry_without_rendering(self):
+        get_result_cache().clear()
+        with mock.patch('solver.views.get_render_pool') as pool:
+            # A segunda resposta vem do cache de resultados
+            first, cached = (
+                self.client.post('/solver/optimize/', {**WYNDOR, 'output': 'geometry'},
+                                 content_type='application/json').json()
+                for _ in range(2)
+            )
+        pool.assert_not_called()
+        self.assertIsNone(first['graph_path'])
+        self.assertEqual(first['geometry'], plot_geometry(GeometryTests.LINES, {}, (2.0, 6.0)))
+        self.assertEqual(cached, first)
+
+
+class AsyncSolveTests(SimpleTestCase):
+    def setUp(self):
+        self.model, _, _ = build_model(read_problem(WYNDOR))
+
+    # Função para um "CBC" que nunca termina: testa o encerramento do processo
+    def hanging_solver(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        path = os.path.join(tmp.name, 'cbc')
+        with open(path, 'w') as f:
+            f.write('#!/bin/sh\nexec sleep 30\n')
+        os.chmod(path, 0o755)
+        solver = PULP_CBC_CMD(msg=False)
+        solver.path = path
+        return solver
+
+    async def run_hanging(self, cancel):
+        processes = []
+        create = asyncio.create_subprocess_exec
+
+        async def spawn(*args, **kwargs):
+            processes.append(await create(*args, **kwargs))
+            return processes[-1]
+
+        with mock.patch('asyncio.create_subprocess_exec', spawn):
+            if cancel:
+                task = asyncio.ensure_future(solve_async(self.model, timeout=30, solver=self.hanging_solver()))
+                while not processes:
+                    await asyncio.sleep(0.01)
+                task.cancel()
+                with self.assertRaises(asyncio.CancelledError):
+                    await task
+            else:
+                with self.assertRaises(asyncio.TimeoutError):
+                    await solve_async(self.model, timeout=0.3, solver=self.hanging_solver())
+        return await asyncio.wait_for(processes[0].wait(), 5)
+
+    def test_solve_async(self):
+        status = asyncio.run(solve_async(self.model))
+        self.assertEqual(status, 1)
+        self.assertAlmostEqual(self.model.objective.value(), 36.0)
+        self.assertEqual({v.name: v.varValue for v in self.model.variables()}, {'x1': 2.0, 'x2': 6.0})
+
+    def test_timeout_kills_cbc(self):
+        self.assertEqual(asyncio.run(self.run_hanging(cancel=False)), -9)
+
+    def test_cancel_kills_cbc(self):
+        self.assertEqual(asyncio.run(self.run_hanging(cancel=True)), -9)
+
+
+class SparseFormatTests(SimpleTestCase):
+    # Wyndor com A = [[1, 0], [0, 2], [3, 2]]
+    CSR = {'format': 'csr', 'shape': [3, 2], 'indptr': [0, 1, 2, 4], 'indices': [0, 1, 0, 1], 'data': [1, 2, 3, 2]}
+    # As mesmas entradas fora de ordem, com (2, 1) repetida e um par que se anula em (1, 0)
+    COO = {
+        'format': 'coo', 'shape': [3, 2],
+        'row': [2, 1, 0, 1, 2, 2, 1], 'col': [1, 0, 0, 1, 0, 1, 0], 'data': [1.5, 1, 1, 2, 3, 0.5, -1],
+    }
+
+    def sparse(self, matrix, **extra):
+        return {'format': 'sparse', 'objective': 'maximize', 'cost': [3, 5], 'matrix': matrix, 'rhs': [4, 12, 18], **extra}
+
+    def test_coo_and_csr_are_equivalent(self):
+        coo = read_sparse_problem(self.sparse(self.COO))
+        csr = read_sparse_problem(self.sparse(self.CSR))
+        for name in ('indptr', 'indices', 'values'):
+            self.assertEqual(coo[name].tolist(), csr[name].tolist())
+        self.assertEqual(csr['values'].tolist(), [1.0, 2.0, 3.0, 2.0])
+        self.assertEqual(sparse_problem_key(coo), sparse_problem_key(csr))
+        self.assertNotEqual(sparse_problem_key(coo), sparse_problem_key(read_sparse_problem(self.sparse(self.CSR, rhs=[4, 12, 19]))))
+
+    def test_sparse_model_solves_like_dense(self):
+        model, variables = build_sparse_model(read_sparse_problem(self.sparse(self.COO)))
+        model.solve(PULP_CBC_CMD(msg=False))
+        self.assertAlmostEqual(model.objective.value(), 36.0)
+        self.assertEqual([v.varValue for v in variables], [2.0, 6.0])
+
+    def test_invalid_matrices(self):
+        for matrix in (
+            {**self.CSR, 'indptr': [0, 1, 2, 3]},
+            {**self.CSR, 'indptr': [0, 2, 1, 4]},
+            {**self.COO, 'row': [3, 1, 0, 1, 2, 2, 1]},
+            {**self.COO, 'col': [1, 0]},
+            {**self.CSR, 'shape': [3, 3]},
+        ):
+            with self.assertRaises(ValueError):
+                read_sparse_problem(self.sparse(matrix))
+        with self.assertRaises(ValueError):
+            read_sparse_problem(self.sparse(self.CSR, senses=['<=', '<']))
+
+
+class BenchmarkTests(SimpleTestCase):
+    def test_random_specs_are_feasible_and_bounded(self):
+        rng = random.Random(7)
+        for variables, constraints in ((2, 5), (2, 30), (8, 12)):
+            problem = read_problem(random_spec(rng, variables, constraints))
+            status, objective = solve_with_pulp(problem)
+            self.assertEqual(status, 'Optimal')
+            self.assertGreater(objective, 0)
+
+    def test_suite_is_reproducible_and_comparable(self):
+        first = run_benchmarks(sizes=((2, 5), (6, 4)), stages=('parse', 'build', 'backend'), repeat=2, seed=3)
+        second = run_benchmarks(sizes=((2, 5), (6, 4)), stages=('parse', 'build', 'backend'), repeat=2, seed=3)
+        self.assertEqual(list(first['results']), ['n2-m5', 'n6-m4'])
+        self.assertEqual(set(first['results']['n2-m5']), {'parse', 'build', 'backend'})
+        for stats in first['results']['n6-m4'].values():
+            self.assertLessEqual(stats['p50_ms'], stats['p95_ms'])
+
+        rows = compare(first, second, threshold=1e9)
+        self.assertEqual(len(rows), 6)
+        self.assertFalse(any(row['regression'] for row in rows))
+
+
+class StartupTests(SimpleTestCase):
+    def test_cold_start_does_not_import_matplotlib(self):
+        report = measure_startup(importtime=True)
+        self.assertEqual(report['status'], [200, 200])
+        self.assertEqual(report['heavy'], [])
+        self.assertIn('solver.views', {name for _, name in report['imports']})
+
+    def test_urlconf_does_not_import_solver_dependencies(self):
+        loaded = fresh_python(
+            "import otimizacao.urls, solver.urls\n"
+            "print(sorted(name for name in ('pulp', 'numpy', 'matplotlib') if name in sys.modules))"
+        )
+        self.assertEqual(loaded, '[]')
+
+    def test_parse_importtime(self):
+        output = (
+            'import time: self [us] | cumulative | imported package\n'
+            'import time:       100 |        150 |   pulp.constants\n'
+            'import time:       400 |       2500 | pulp\n'
+            'import time:       900 |        900 | json\n'
+        )
+        self.assertEqual(parse_importtime(output), [(2.5, 'pulp'), (0.9, 'json')])
+
+
+class RenderPoolStartupTests(SimpleTestCase):
+    def test_prewarm_follows_settings(self):
+        from .workers import prewarm_render_pool
+
+        with mock.patch('solver.workers.get_render_pool') as get_pool:
+            self.assertTrue(prewarm_render_pool())
+            with override_settings(SOLVER_RENDER={'PREWARM': False}):
+                self.assertFalse(prewarm_render_pool())
+            with override_settings(SOLVER_RENDER={'WORKERS': 0}):
+                self.assertFalse(prewarm_render_pool())
+            with override_settings(SOLVER_STARTUP={'PRELOAD': True}):
+                self.assertFalse(prewarm_render_pool())
+        self.assertEqual(get_pool.call_count, 1)
+
+    def test_only_the_server_entry_points_prewarm(self):
+        import importlib
+
+        # django.setup() sozinho (scripts, testes, celery) não cria o pool
+        self.assertEqual(fresh_python('from solver import workers; print(workers._render_pool is None)'), 'True')
+
+        for module in ('otimizacao.wsgi', 'otimizacao.asgi'):
+            with mock.patch.dict(sys.modules), mock.patch('solver.workers.get_render_pool') as get_pool:
+                sys.modules.pop(module, None)
+                importlib.import_module(module)
+            get_pool.assert_called_once_with()
+
+
+class SessionTests(SimpleTestCase):
+    def test_delta_reuses_lp_basis(self):
+        session = SolveSession(read_problem(WYNDOR))
+        with mock.patch('solver.sessions.PULP_CBC_CMD', wraps=PULP_CBC_CMD) as cbc:
+            session.apply({'rhs': {'3': 12}, 'objectiveFunction': '3x1+2x2'})
+        self.assertTrue(cbc.call_args.kwargs['options'][0].startswith('basisI '))
+        solution = session.solution()
+        self.assertEqual((solution['objective_result'], session.solves), (12.0, 2))
+        self.assertEqual(session.problem['constraints'][2], '3x1+2x2<=12.0')
+        # Uma variável nova muda o leiaute do MPS: a base anterior não é usada
+        with mock.patch('solver.sessions.PULP_CBC_CMD', wraps=PULP_CBC_CMD) as cbc:
+            session.apply({'constraints': {'1': 'x1+x3<=4'}})
+        self.assertFalse(any(o.startswith('basisI') for o in cbc.call_args.kwargs['options']))
+
+    def test_invalid_deltas(self):
+        session = SolveSession(read_problem(WYNDOR))
+        get_session_store().set(session.id, session)
+        for delta in (
+            ['x1<=3'], {'constraints': ['x1<=3']}, {'constraints': {'4': 'x1<=3'}}, {'constraints': {'1': 3}},
+            {'rhs': {'1': None}}, {'rhs': {'um': 2}}, {'objective': 'max'}, {'objectiveFunction': 3}, {'cost': 1},
+        ):
+            response = self.client.post(f'/solver/sessions/{session.id}/', delta, content_type='application/json')
+            self.assertEqual(response.status_code, 400, delta)
+        # Deltas recusados não alteram o modelo
+        self.assertEqual((session.solves, session.problem['constraints']), (1, WYNDOR['constraints']))
+
+
+class SweepTests(SimpleTestCase):
+    def test_rhs_columns(self):
+        report = run_sweep(read_problem(WYNDOR), [{'constraint': 3, 'values': [18, 20, 30]}])
+        self.assertEqual((report['steps'], report['status']), (3, ['Optimal'] * 3))
+        for name, expected in (
+            ('objective', [36, 38, 42]),
+            (('variables', 'x1'), [2, 8 / 3, 4]),
+            (('shadow_prices', 'R2'), [1.5, 1.5, 2.5]),   # pi
+            (('shadow_prices', 'R3'), [1, 1, 0]),
+            (('slacks', 'R1'), [2, 4 / 3, 0]),
+            (('slacks', 'R3'), [0, 0, 6]),
+            (('reduced_costs', 'x2'), [0, 0, 0]),         # dj
+        ):
+            column = report[name] if isinstance(name, str) else report[name[0]][name[1]]
+            for value, wanted in zip(column, expected):
+                self.assertAlmostEqual(value, wanted, places=5, msg=name)
+
+        # Custo de x1 abaixo de 0: x1 sai da base e o custo reduzido aparece em dj
+        report = run_sweep(read_problem(WYNDOR), [{'type': 'objective', 'variable': 'x1', 'values': [-1]}])
+        self.assertEqual(report['variables']['x1'], [0.0])
+        self.assertAlmostEqual(report['reduced_costs']['x1'][0], -1, places=5)
+
+    def test_malformed_parameters(self):
+        for parameters in (None, [{}], [{'constraint': 1}], [{'constraint': 9, 'values': [1]}], [{'type': 'objective'}]):
+            response = self.client.post('/solver/sweep/', {**WYNDOR, 'parameters': parameters},
+                                        content_type='application/json')
+            self.assertEqual(response.status_code, 400, parameters)
+        response = self.client.post('/solver/sweep/', WYNDOR, content_type='application/json')
+        self.assertEqual(response.status_code, 400)
+
+
+@override_settings(SOLVER_HISTORY={'ENABLED': False})
+class SolveStreamTests(SimpleTestCase):
+    def setUp(self):
+        get_result_cache().clear()
+
+    # Função para ler o corpo text/event-stream como uma lista de (evento, dados)
+    def stream(self, data, query='?output=geometry'):
+        response = self.client.post(f'/solver/optimize/stream/{query}', data, content_type='application/json')
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+        self.assertEqual(response['Cache-Control'], 'no-cache')
+        body = b''.join(response.streaming_content).decode()
+        self.assertTrue(body.endswith('\n\n'))
+        events = []
+        for block in body.split('\n\n'):
+            fields = dict(line.split(': ', 1) for line in block.splitlines() if not line.startswith(':'))
+            if fields:
+                events.append((fields['event'], json.loads(fields['data'])))
+        return events
+
+    @staticmethod
+    def names(events):
+        return [data['stage'] if event == 'stage' else event for event, data in events]
+
+    def test_event_order(self):
+        events = self.stream({**WYNDOR, 'solver': 'pulp-cbc'})
+        names = self.names(events)
+        progress = [i for i, name in enumerate(names) if name == 'progress']
+        self.assertTrue(progress)
+        self.assertEqual(
+            [name for name in names if name != 'progress'],
+            ['received', 'parsed', 'solving', 'solved', 'result', 'graph', 'done'],
+        )
+        # O log do CBC chega entre o início e o fim da resolução
+        self.assertLess(names.index('solving'), progress[0])
+        self.assertLess(progress[-1], names.index('solved'))
+
+        data = dict((name, payload) for name, (_, payload) in zip(names, events))
+        self.assertEqual(data['parsed'], {'stage': 'parsed', 'variables': 2, 'constraints': 3})
+        self.assertEqual(data['solving']['backend'], 'pulp-cbc')
+        self.assertEqual(data['result']['Resultado Objetivo'], 36.0)
+        self.assertNotIn('geometry', data['result'])
+        self.assertEqual(data['graph']['geometry']['optimum'], [2.0, 6.0])
+
+    def test_cached_problem_skips_solving(self):
+        self.stream(WYNDOR)
+        self.assertEqual(self.names(self.stream(WYNDOR)), ['received', 'parsed', 'result', 'graph', 'done'])
+
+    def test_errors(self):
+        events = self.stream({'objective': 'maximize'})
+        self.assertEqual(self.names(events), ['received', 'error'])
+        self.assertTrue(events[-1][1]['error'].startswith('Erro inesperado'))
+        sparse = {'format': 'sparse', 'cost': [1], 'matrix': {'shape': [0, 1], 'row': [], 'col': [], 'data': []}, 'rhs': []}
+        self.assertEqual(self.client.post('/solver/optimize/stream/', sparse, content_type='application/json').status_code, 400)
+
+
+@override_settings(SOLVER_HISTORY={'ENABLED': False})
+class BatchTests(SimpleTestCase):
+    DIET = {'objective': 'minimize', 'objectiveFunction': '3x1+2x2', 'constraints': ['2x1+x2>=8', 'x1+3x2>=9']}
+
+    def setUp(self):
+        get_result_cache().clear()
+        executor = ThreadPoolExecutor(max_workers=2)
+        self.addCleanup(executor.shutdown)
+        self.submit = mock.patch.object(executor, 'submit', wraps=executor.submit).start()
+        patcher = mock.patch('solver.views.get_solve_executor', return_value=executor)
+        patcher.start()
+        self.addCleanup(mock.patch.stopall)
+
+    def post_batch(self, items, query='?output=geometry'):
+        response = self.client.post(f'/solver/optimize/batch/{query}', items, content_type='application/json')
+        self.assertEqual(response.status_code, 200)
+        return response, b''.join(response.streaming_content).decode()
+
+    def test_results_follow_batch_order(self):
+        items = [WYNDOR, {'objective': 'maximize'}, self.DIET, WYNDOR]
+        response, body = self.post_batch(items)
+        self.assertEqual(response['Content-Type'], 'application/json')
+        results = json.loads(body)
+        self.assertEqual(len(results), 4)
+        self.assertEqual(results[0]['Resultado Objetivo'], 36.0)
+        self.assertTrue(results[1]['error'].startswith('Erro inesperado'))
+        self.assertAlmostEqual(results[2]['Resultado Objetivo'], 13.0)
+        self.assertEqual(results[3], results[0])
+        self.assertIn('geometry', results[0])
+        # Modelos idênticos no mesmo lote são resolvidos uma única vez
+        self.assertEqual(self.submit.call_count, 2)
+
+    def test_ndjson_framing(self):
+        response, body = self.post_batch([WYNDOR, 'x', self.DIET], query='?format=ndjson&output=geometry')
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        self.assertTrue(body.endswith('\n'))
+        lines = [json.loads(line) for line in body.splitlines()]
+        self.assertEqual(sorted(line['index'] for line in lines), [0, 1, 2])
+        by_index = {line.pop('index'): line for line in lines}
+        self.assertEqual(by_index[0]['Resultado Objetivo'], 36.0)
+        self.assertIn('error', by_index[1])
+        self.assertAlmostEqual(by_index[2]['Resultado Objetivo'], 13.0)
+
+    def test_invalid_batch(self):
+        for body in ('{', '{"a": 1}'):
+            response = self.client.post('/solver/optimize/batch/', body, content_type='application/json')
+            self.assertEqual(response.status_code, 400)
+        with override_settings(SOLVER_BATCH={'MAX_ITEMS': 1}):
+            response = self.client.post('/solver/optimize/batch/', [WYNDOR, WYNDOR], content_type='application/json')
+        self.assertEqual(response.status_code, 400)
+
+
+# Sem o pool de jobs: a supervisão em segundo plano sobreviveria ao banco de testes
+@override_settings(SOLVER_JOBS={'AUTOSTART': False})
+class JobQueueTests(TestCase):
+    def test_identical_pending_jobs_are_deduplicated(self):
+        spec = read_problem({'objective': 'maximize', 'objectiveFunction': '3x1+5x2', 'constraints': ['x1<=4']})
+        first, created = submit_job('a' * 64, spec, priority=1)
+        second, created_again = submit_job('a' * 64, spec, priority=5)
+        self.assertTrue(created)
+        self.assertFalse(created_again)
+        self.assertEqual(first.id, second.id)
+        self.assertEqual(second.priority, 5)
+
+        # Depois de cancelado, o mesmo problema gera um job novo
+        self.assertEqual(cancel_job(first.id).status, SolveJob.CANCELLED)
+        third, created = submit_job('a' * 64, spec)
+        self.assertTrue(created)
+        self.assertNotEqual(third.id, first.id)
+
+    def test_queue_position_follows_priority_then_age(self):
+        spec = read_problem({'objective': 'maximize', 'objectiveFunction': 'x1', 'constraints': ['x1<=1']})
+        low, _ = submit_job('b' * 64, spec, priority=0)
+        later, _ = submit_job('c' * 64, spec, priority=0)
+        urgent, _ = submit_job('d' * 64, spec, priority=3)
+        self.assertEqual([queue_position(job) for job in (urgent, low, later)], [0, 1, 2])
+
+
+class HistoryTests(TestCase):
+    def setUp(self):
+        get_result_cache().clear()
+        self.writer = HistoryWriter()
+        mock.patch('solver.history._history', self.writer).start()
+        # Sem a thread de gravação: o teste chama flush() na própria conexão
+        mock.patch('solver.history.threading.Thread').start()
+        self.addCleanup(mock.patch.stopall)
+
+    def optimize(self):
+        response = self.client.post('/solver/optimize/', {**WYNDOR, 'output': 'geometry'}, content_type='application/json')
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_solved_problem_is_read_back_from_database(self):
+        first = self.optimize()
+        self.assertEqual(Problem.objects.count(), 0)
+        self.writer.flush()
+        self.assertEqual((Problem.objects.count(), Solution.objects.count(), SolveTiming.objects.count()), (1, 1, 1))
+
+        key = first['graph_key']
+        with self.assertNumQueries(1):
+            entry = stored_entry(key)
+        self.assertEqual(entry['result']['Resultado Objetivo'], 36.0)
+        self.assertNotIn('graph_path', entry['result'])
+        self.assertIsNotNone(entry['render'])
+        self.assertIsNone(stored_entry('0' * 64))
+
+        # Sem o cache em memória, a resposta vem do banco com uma única consulta
+        get_result_cache().clear()
+        with self.assertNumQueries(1):
+            second = self.optimize()
+        self.assertEqual(second, first)
+
+        listing = self.client.get('/solver/history/').json()
+        self.assertEqual(listing['count'], 1)
+        self.assertEqual((listing['results'][0]['key'], listing['results'][0]['objective_result']), (key, 36.0))
+
+    def test_spec_is_copied_at_record_time(self):
+        problem = read_problem({**WYNDOR, 'constraints': list(WYNDOR['constraints'])})
+        solution = solve(problem)
+        self.writer.record('e' * 64, problem, {'result': {'Resultado Objetivo': 36.0}, 'render': None}, solution)
+        # Uma sessão altera o problema no lugar depois de registrá-lo
+        problem['objective'] = 'minimize'
+        problem['constraints'][1] = '3x1+2x2<=12.0'
+        self.writer.flush()
+        stored = Problem.objects.get(key='e' * 64)
+        self.assertEqual(stored.objective, 'maximize')
+        self.assertEqual(stored.spec['constraints'], ['x1<=4', '2x2<=12', '3x1+2x2<=18'])
+
+    def test_disabled_history_skips_database(self):
+        key = self.optimize()['graph_key']
+        self.writer.flush()
+        with override_settings(SOLVER_HISTORY={'ENABLED': False}), self.assertNumQueries(0):
+            self.assertIsNone(stored_entry(key))
+
+
+class BackendSelectionTests(SimpleTestCase):
+    SHAPE = {'variables': 2, 'constraints': 3, 'planar': True, 'integer': False}
+
+    def candidates(self):
+        return [b.name for b in BACKENDS.values() if b.available() and b.supports(self.SHAPE)]
+
+    def test_backends_must_implement_solve(self):
+        class Incomplete(SolverBackend):
+            name = 'incompleto'
+
+        with self.assertRaises(TypeError):
+            Incomplete()
+
+    def test_fastest_measured_backend(self):
+        metrics = LatencyMetrics()
+        bucket = shape_bucket(self.SHAPE)
+        with mock.patch('solver.backends._metrics', metrics), \
+                override_settings(SOLVER_BACKENDS={'MIN_SAMPLES': 2}):
+            self.assertEqual(select_backend(self.SHAPE).name, 'numpy-2d')
+            for name in self.candidates():
+                for _ in range(2):
+                    metrics.record(name, bucket, 0.001 if name == 'pulp-cbc-tuned' else 0.01)
+            self.assertEqual(select_backend(self.SHAPE).name, 'pulp-cbc-tuned')
+
+    def test_exploration_samples_every_candidate(self):
+        metrics = LatencyMetrics()
+        with mock.patch('solver.backends._metrics', metrics), \
+                override_settings(SOLVER_BACKENDS={'MIN_SAMPLES': 2, 'EXPLORE': 1.0}):
+            problem = read_problem({'objective': 'maximize', 'objectiveFunction': '3x1+5x2',
+                                    'constraints': ['x1<=4', '2x2<=12', '3x1+2x2<=18']})
+            used = [solve(problem)['backend'] for _ in range(2 * len(self.candidates()))]
+            self.assertEqual(sorted(set(used)), sorted(self.candidates()))
+            self.assertTrue(all(metrics.count(name, shape_bucket(self.SHAPE)) == 2 for name in self.candidates()))
+
+
+class MixedIntegerTests(SimpleTestCase):
+    def problem(self, **extra):
+        return read_problem({
+            'objective': 'maximize',
+            'objectiveFunction': '3x1+5x2',
+            'constraints': ['x1<=4.5', '2x2<=12.5', '3x1+2x2<=18.2'],
+            **extra,
+        })
+
+    def test_integer_variables_and_bounds(self):
+        problem = self.problem(variables={'x1': 'integer', 'x2': {'type': 'integer', 'upBound': 5}})
+        self.assertTrue(problem_shape(problem)['integer'])
+        self.assertFalse(problem_shape(problem)['planar'])
+
+        solution = solve_problem(problem)
+        self.assertEqual(solution['optimal_point'], [2.0, 5.0])
+        self.assertEqual(solution['status'], 'Optimal')
+        self.assertEqual(solution['gap'], 0.0)
+
+    def test_invalid_declarations(self):
+        for extra in (
+            {'variables': {'x1': 'real'}},
+            {'variables': {'x1': {'lowBound': 3, 'upBound': 1}}},
+            {'limits': {'timeLimit': -1}},
+        ):
+            with self.assertRaises(ValueError):
+                self.problem(**extra)
+
+    def test_gap_of_incumbent(self):
+        self.assertEqual(mip_report(100.0, 110.0, 'Feasible'), {'bound': 110.0, 'gap': 0.1})
+        self.assertEqual(mip_report(None, None, 'Not Solved'), {'bound': None, 'gap': None})
+
+
+@skipUnless(importlib.util.find_spec('scipy'), 'scipy não está instalado')
+class ScipyHighsTests(SimpleTestCase):
+    def test_model_arrays(self):
+        model, _, _ = build_model(read_problem({
+            'objective': 'maximize', 'objectiveFunction': '3x1+5x2',
+            'constraints': ['x1<=4', 'x1+x2>=1', 'x1-x2=0'],
+            'variables': {'x2': {'type': 'integer', 'upBound': 5}},
+        }))
+        variables, arrays = model_arrays(model)
+        self.assertEqual([v.name for v in variables], ['x1', 'x2'])
+        # linprog minimiza e só aceita <=: o objetivo e as linhas >= trocam de sinal
+        self.assertEqual(arrays['c'].tolist(), [-3.0, -5.0])
+        # A não negatividade vem de build_model como restrições x1 >= 0 e x2 >= 0
+        self.assertEqual(arrays['A_ub'].tolist(), [[1.0, 0.0], [-1.0, -1.0], [-1.0, 0.0], [0.0, -1.0]])
+        self.assertEqual(arrays['b_ub'].tolist(), [4.0, -1.0, 0.0, 0.0])
+        self.assertEqual((arrays['A_eq'].tolist(), arrays['b_eq'].tolist()), ([[1.0, -1.0]], [0.0]))
+        self.assertEqual(arrays['bounds'], [(0, None), (0, 5)])
+        self.assertEqual(arrays['integrality'].tolist(), [0, 1])
+
+    def test_matches_cbc(self):
+        highs, cbc = BACKENDS['scipy-highs'], BACKENDS['pulp-cbc']
+        self.assertTrue(highs.available())
+        rng = random.Random(12)
+        problems = [read_problem(EXAMPLES[-1]['problem'])] + [random_problem(rng) for _ in range(30)]
+        for problem in problems:
+            expected = cbc.solve(problem)
+            solution = highs.solve(problem)
+            if expected['status'] != 'Optimal':
+                # Sem ótimo, o problema segue para o 'pulp-cbc' (ver backends.solve)
+                self.assertIsNone(solution, problem)
+                continue
+            self.assertEqual(solution['status'], 'Optimal', problem)
+            self.assertAlmostEqual(solution['objective_result'], expected['objective_result'], places=6)
+
+    def test_integer_report(self):
+        solution = BACKENDS['scipy-highs'].solve(read_problem(EXAMPLES[-1]['problem']))
+        self.assertEqual(solution['optimal_point'], [5.0, 0.0])
+        self.assertEqual(solution['gap'], 0.0)
+        self.assertAlmostEqual(solution['bound'], solution['objective_result'])
+
+
+class TimingTests(SimpleTestCase):
+    def test_histograms_are_cumulative(self):
+        histograms = Histograms(buckets=(0.01, 0.1))
+        for seconds in (0.005, 0.05, 0.05, 2.0):
+            histograms.observe('latency', {'stage': 'cbc'}, seconds)
+        lines = histograms.render({'latency': 'Latência.'}).splitlines()
+        self.assertEqual(lines[:2], ['# HELP latency Latência.', '# TYPE latency histogram'])
+        self.assertEqual(lines[2:], [
+            'latency_bucket{stage="cbc",le="0.01"} 1',
+            'latency_bucket{stage="cbc",le="0.1"} 3',
+            'latency_bucket{stage="cbc",le="+Inf"} 4',
+            'latency_sum{stage="cbc"} 2.105000',
+            'latency_count{stage="cbc"} 4',
+        ])
+
+    def test_server_timing_sums_repeated_stages(self):
+        trace = Trace()
+        for name, seconds in (('parse', 0.001), ('cbc', 0.01), ('parse', 0.002)):
+            trace.add(name, seconds)
+        self.assertEqual(server_timing(trace, 0.0125), 'parse;dur=3.0, cbc;dur=10.0, total;dur=12.5')
+
+    @override_settings(SOLVER_HISTORY={'ENABLED': False})
+    def test_request_timing_header_log_and_metrics(self):
+        get_result_cache().clear()
+        with self.assertLogs('solver.timing', 'INFO') as logs:
+            response = self.client.post('/solver/optimize/', {**WYNDOR, 'output': 'geometry'},
+                                        content_type='application/json')
+        stages = [entry.split(';dur=')[0] for entry in response['Server-Timing'].split(', ')]
+        self.assertEqual(stages[0], 'json')
+        self.assertIn('parse', stages)
+        self.assertEqual(stages[-1], 'total')
+        event = json.loads(logs.records[-1].getMessage())
+        self.assertEqual((event['view'], event['status']), ('optimize', 200))
+        self.assertIn('parse', event['stages_ms'])
+
+        metrics = self.client.get('/metrics')
+        self.assertTrue(metrics['Content-Type'].startswith('text/plain; version=0.0.4'))
+        body = metrics.content.decode()
+        self.assertIn('solver_request_duration_seconds_count{view="optimize"}', body)
+        self.assertIn('solver_stage_duration_seconds_bucket{stage="parse",le="+Inf"}', body)
+        self.assertIn('# TYPE solver_backend_solve_seconds summary', body)
+        self.assertIn('solver_backend_solve_seconds_count{backend="numpy-2d",', body)
+
+
+class GraphVariantTests(SimpleTestCase):
+    def test_read_variant(self):
+        self.assertEqual(read_variant({}), DEFAULT_VARIANT)
+        thumb = read_variant({'format': 'webp', 'size': 'thumb'})
+        self.assertEqual((thumb['format'], thumb['width'], thumb['quality']), ('webp', 320, 'low'))
+        self.assertEqual(read_variant({'size': 'thumb', 'quality': 'high'})['quality'], 'high')
+        for params in ({'format': 'gif'}, {'width': '5'}, {'dpi': 'x'}, {'quality': 'max'}):
+            with self.assertRaises(ValueError):
+                read_variant(params)
+
+    def test_variant_names_and_urls(self):
+        key = 'ab' * 32
+        self.assertEqual(variant_name(key, DEFAULT_VARIANT), key)
+        self.assertEqual(variant_query(DEFAULT_VARIANT), '')
+        svg = read_variant({'format': 'svg'})
+        self.assertEqual(variant_name(key, svg), f'{key}-w1000-d100-high.svg')
+        self.assertEqual(variant_query(svg), '?format=svg')
+
+
+@override_settings(SOLVER_HISTORY={'ENABLED': False})
+class GraphCacheTests(SimpleTestCase):
+    KEY = 'cd' * 32
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.store = ArtifactStore(tmp.name, max_bytes=1000)
+        patcher = mock.patch('solver.artifacts._artifact_store', self.store)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_graph_etag_and_not_modified(self):
+        self.store.put(self.KEY, b'png')
+        response = self.client.get(f'/solver/graph/{self.KEY}/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(b''.join(response.streaming_content), b'png')
+        self.assertEqual(response['ETag'], f'"{self.KEY}"')
+        self.assertIn('Last-Modified', response)
+        self.assertIn('public', response['Cache-Control'])
+
+        again = self.client.get(f'/solver/graph/{self.KEY}/', HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(again.status_code, 304)
+        # Outra variante tem outra ETag: a do PNG original não vale para ela
+        svg = self.client.get(f'/solver/graph/{self.KEY}/?format=svg', HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertNotEqual(svg.status_code, 304)
+
+    def test_missing_graph_and_invalid_variant(self):
+        self.assertEqual(self.client.get(f'/solver/graph/{self.KEY}/').status_code, 404)
+        self.assertEqual(self.client.get(f'/solver/graph/{self.KEY}/?format=gif').status_code, 400)
+
+    def test_store_evicts_oldest_and_expired(self):
+        keys = [f'{i:x}' * 16 for i in range(1, 4)]
+        for i, key in enumerate(keys):
+            self.store.put(key, b'x' * 400)
+            os.utime(self.store.path(key), (time.time() - 10 + i, time.time() - 10 + i))
+        self.store.evict()
+        self.assertEqual([self.store.exists(key) for key in keys], [False, True, True])
+
+        self.store.max_age = 5
+        self.store.evict()
+        self.assertFalse(self.store.exists(keys[1]))
+        self.assertIsNone(self.store.open(keys[2]))
+
+
+class PresolveTests(SimpleTestCase):
+    def test_reductions(self):
+        problem = read_problem({
+            'objective': 'maximize',
+            'objectiveFunction': '3x1+5x2',
+            'constraints': [
+                'x1<=4', '2x2<=12', '3x1+2x2<=18',
+                '6x1+4x2<=36',   # múltipla da anterior
+                '3x1+2x2<=20',   # dominada
+                'x1>=-2',        # já garantida por x1 >= 0
+                'x1+x2<=100',    # garantida pelos limites x1 <= 4, x2 <= 6
+            ],
+        })
+        reduced, stats = presolve(problem)
+        self.assertEqual(reduced['constraints'], ['3x1+2x2<=18', 'x1<=4.0', 'x2<=6.0'])
+        self.assertEqual(
+            (stats['bounds'], stats['duplicate'], stats['dominated'], stats['redundant'], stats['kept']),
+            (3, 1, 1, 1, 1),
+        )
+        solution = solve(problem)
+        self.assertEqual(solution['objective_result'], 36.0)
+        # Rótulos, pontos e retas seguem as restrições do usuário, não as do problema reduzido
+        lines, points = constraint_geometry(problem['constraints'])
+        self.assertEqual(solution['constraint_lines'], lines)
+        self.assertEqual(solution['restriction_points'], points)
+        self.assertEqual(solution['restriction_points'][2], {'Restrição': 'Restrição 3', 'Pontos': [(0, 9.0), (6.0, 0)]})
+
+    def test_trivial_infeasible_and_unbounded(self):
+        for constraints, status in (
+            (['x1+x2<=3', '2x1+2x2>=8'], 'Infeasible'),
+            (['x1<=4', 'x1>=6'], 'Infeasible'),
+            (['x1<=4', 'x3<=2'], 'Unbounded'),
+        ):
+            problem = read_problem({'objective': 'maximize', 'objectiveFunction': 'x1+x2', 'constraints': constraints})
+            self.assertEqual(presolve(problem)[1]['status'], status)
+            self.assertEqual(solve(problem)['status'], status)
+
+    @override_settings(SOLVER_HISTORY={'ENABLED': False})
+    def test_matches_solution_without_presolve(self):
+        rng = random.Random(22)
+        for _ in range(40):
+            problem = random_problem(rng)
+            problem['constraints'] += problem['constraints'][:2]
+            with override_settings(SOLVER_BACKENDS={'PRESOLVE': False}):
+                expected = solve(problem)
+            solution = solve(problem)
+            self.assertEqual(solution['status'], expected['status'], problem)
+            if expected['status'] == 'Optimal':
+                self.assertAlmostEqual(solution['objective_result'], expected['objective_result'], places=6)
+
+    # x3 vira limite (x3 >= 14/3) e sai das restrições: o CBC dava o reduzido como inviável
+    def test_unbounded_in_folded_variable(self):
+        problem = read_problem({
+            'objective': 'maximize',
+            'objectiveFunction': '-1x1+2x2+4x3',
+            'constraints': ['3x3>=14', '3x2>=3', '3x2>=-1', '2x1-4x2=-2'],
+        })
+        with override_settings(SOLVER_BACKENDS={'PRESOLVE': False}):
+            expected = solve(problem)
+        self.assertEqual(expected['status'], 'Unbounded')
+        self.assertEqual(solve(problem)['status'], expected['status'])
+        self.assertEqual(asyncio.run(solve_async_problem(problem))['status'], expected['status'])
+
+
+class AdmissionTests(SimpleTestCase):
+    def test_gate_queue_and_timeout(self):
+        gate = Gate(limit=1, queue=0)
+        self.assertTrue(gate.try_acquire())
+        self.assertFalse(gate.try_acquire())
+        self.assertEqual(gate.acquire(timeout=0.01), QUEUE_FULL)
+        gate.queue = 1
+        self.assertEqual(gate.acquire(timeout=0.01), TIMEOUT)
+        gate.release()
+        self.assertEqual(gate.acquire(timeout=0.01), ADMITTED)
+
+    def test_token_bucket_per_client(self):
+        buckets = TokenBuckets(rate=1.0, burst=2, max_clients=10)
+        self.assertEqual([buckets.take('a') for _ in range(2)], [0.0, 0.0])
+        self.assertGreater(buckets.take('a'), 0.5)
+        self.assertEqual(buckets.take('b'), 0.0)
+
+    @override_settings(SOLVER_HISTORY={'ENABLED': False})
+    def test_streaming_response_holds_slot_until_closed(self):
+        gate = get_admission().gates['solve']
+        for consume in (True, False):
+            response = self.client.post('/solver/optimize/stream/', {**WYNDOR, 'output': 'geometry'},
+                                        content_type='application/json')
+            self.assertEqual(gate.active, 1)
+            if consume:
+                b''.join(response.streaming_content)
+                self.assertEqual(gate.active, 0)
+            # Cliente desconectado antes do fim: o servidor só chama close()
+            response.close()
+            self.assertEqual(gate.active, 0)
+
+    def test_async_stream_release(self):
+        async def chunks():
+            yield b'a'
+            yield b'b'
+
+        release = mock.Mock()
+        response = StreamingHttpResponse(AsyncReleasingStream(chunks(), release))
+        self.assertTrue(response.is_async)
+
+        async def consume():
+            return [chunk async for chunk in response.streaming_content]
+        self.assertEqual(asyncio.run(consume()), [b'a', b'b'])
+        response.close()
+        self.assertTrue(release.called)
+
+
+class UploadTests(SimpleTestCase):
+    MPS = """NAME          TESTE
+OBJSENSE
+    MAX
+ROWS
+ N  COST
+ L  LIM1
+ L  MYR
+COLUMNS
+    X1        COST         3.0   LIM1         1.0
+    X1        MYR          1.0
+    MARKER    'MARKER'     'INTORG'
+    X2        COST         5.0   MYR          2.0
+    MARKER    'MARKER'     'INTEND'
+RHS
+    RHS       LIM1         4.0   MYR         18.0
+    RHS       COST       -10.0
+RANGES
+    RNG       MYR          8.0
+BOUNDS
+ UP BND       X1           3.5
+ UP BND       X2           6.5
+ENDATA
+"""
+
+    LP = """\\ o objetivo e a restrição c2 ocupam duas linhas
+Maximize
+ obj: 3 x1 + 5 x2
+   + 10
+Subject To
+ c1: x1 <= 4
+ c2: 3 x1 + 2 x2
+     - 1 <= 17
+Bounds
+ 0 <= x1 <= 3.5
+ x2 <= 6.5
+General
+ x2
+End
+"""
+
+    def solve(self, data):
+        problem = read_sparse_problem(data)
+        model, variables = build_sparse_model(problem)
+        model.solve(PULP_CBC_CMD(msg=False))
+        return [v.varValue for v in variables], model.objective.value()
+
+    def test_mps(self):
+        data = read_upload(self.MPS.splitlines(True), 'mps')
+        self.assertEqual((data['objective'], data['offset'], data['integers']), ('maximize', 10.0, [1]))
+        # A faixa de MYR (10 <= X1 + 2 X2 <= 18) vira duas restrições
+        self.assertEqual(data['matrix']['shape'], [3, 2])
+        self.assertEqual(data['senses'], ['<=', '>=', '<='])
+        self.assertEqual(self.solve(data), ([3.5, 6.0], 50.5))
+
+    def test_lp_and_csv(self):
+        data = read_upload(self.LP.splitlines(True), 'lp')
+        self.assertEqual(data['variables'], ['x1', 'x2'])
+        self.assertEqual(list(data['rhs']), [4.0, 18.0])
+        self.assertEqual(self.solve(data), ([2.0, 6.0], 46.0))
+
+        csv_lines = [',x1,x2,sense,rhs', 'objective,3,5,max,', 'c1,1,,<=,4', 'c2,3,2,<=,18', 'c3,,2,<=,12.5', 'integer,,1,,']
+        self.assertEqual(self.solve(read_upload(csv_lines, 'csv')), ([2.0, 6.0], 36.0))
+
+    def test_invalid_files(self):
+        for lines, fmt in (
+            (['ROWS', ' N COST', 'COLUMNS', ' X1 R9 1'], 'mps'),
+            (['Subject To', ' x1 <= 4'], 'lp'),
+            ([',x1,sense,rhs', 'c1,1,<=,4'], 'csv'),
+        ):
+            with self.assertRaises(ValueError):
+                read_upload(lines, fmt)
+
+
+class GalleryTests(SimpleTestCase):
+    CATALOG = [EXAMPLES[0], {**EXAMPLES[0], 'slug': 'inviavel', 'problem': {
+        'objective': 'maximize', 'objectiveFunction': '3x1+5x2', 'constraints': ['x1+x2<=4', 'x1+x2>=5'],
+    }}]
+
+    def test_build_and_serve(self):
+        with tempfile.TemporaryDirectory() as output:
+            stale = os.path.join(output, 'antigo.0123456789ab.png')
+            open(stale, 'wb').close()
+            with override_settings(SOLVER_GALLERY={'OUTPUT_DIR': output, 'VARIANTS': {'thumb': {'size': 'thumb'}}}):
+                manifest = build_gallery(self.CATALOG, output)
+                # O mesmo catálogo gera os mesmos arquivos (e a mesma versão)
+                self.assertEqual(build_gallery(self.CATALOG, output), manifest)
+                self.assertFalse(os.path.exists(stale))
+
+                wyndor, infeasible = manifest['entries']
+                self.assertEqual(wyndor['objective_result'], 36.0)
+                self.assertRegex(wyndor['files']['thumb'], r'^wyndor-thumb\.[0-9a-f]{12}\.png$')
+                # Sem gráfico para problemas inviáveis
+                self.assertEqual((infeasible['status'], set(infeasible['files'])), ('Infeasible', {'result'}))
+
+                response = self.client.get('/solver/gallery/')
+                self.assertEqual(response['ETag'], '"%s"' % manifest['version'])
+                url = response.json()['results'][0]['files']['result']
+                response = self.client.get(url)
+                self.assertIn('immutable', response['Cache-Control'])
+                self.assertEqual(json.loads(b''.join(response.streaming_content))['Ponto Ótimo'], '(2.0, 6.0)')
+                self.assertEqual(self.client.get('/solver/gallery/manifest.json').status_code, 404)
+
+    def test_invalid_catalog(self):
+        for catalog in ({}, [{'slug': 'Sem Espaço', 'problem': {}}], [EXAMPLES[0], EXAMPLES[0]]):
+            with self.assertRaises(ValueError):
+                load_catalog(catalog)
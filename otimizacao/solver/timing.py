@@ -0,0 +1,127 @@
+import contextvars
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+
+# Limites dos histogramas, em segundos (o último balde, +Inf, é implícito)
+BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+_current_trace = contextvars.ContextVar('solver_trace', default=None)
+
+
+class Trace:
+    """Etapas medidas durante uma requisição (ou uma tarefa), na ordem em que terminaram."""
+
+    def __init__(self):
+        self.spans = []
+
+    def add(self, name, seconds):
+        self.spans.append((name, seconds))
+
+    def totals(self):
+        """Soma por etapa (uma etapa pode se repetir, como em lotes), em milissegundos."""
+        totals = {}
+        for name, seconds in self.spans:
+            totals[name] = totals.get(name, 0.0) + seconds * 1000
+        return {name: round(ms, 3) for name, ms in totals.items()}
+
+
+class Histograms:
+    """Histogramas cumulativos de latência por (métrica, rótulos), no formato do Prometheus."""
+
+    def __init__(self, buckets=BUCKETS):
+        self.buckets = buckets
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, metric, labels, seconds):
+        key = (metric, tuple(sorted(labels.items())))
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [[0] * (len(self.buckets) + 1), 0.0]
+            series[0][bisect_left(self.buckets, seconds)] += 1
+            series[1] += seconds
+
+    def render(self, help_texts):
+        with self._lock:
+            series = sorted((key, [list(counts), total]) for key, (counts, total) in self._series.items())
+
+        lines = []
+        for metric, text in help_texts.items():
+            lines.append(f'# HELP {metric} {text}')
+            lines.append(f'# TYPE {metric} histogram')
+            for (name, labels), (counts, total) in series:
+                if name != metric:
+                    continue
+                label_text = ','.join(f'{k}="{v}"' for k, v in labels)
+                cumulative = 0
+                for bound, count in zip(self.buckets + ('+Inf',), counts):
+                    cumulative += count
+                    lines.append(f'{metric}_bucket{{{label_text},le="{bound}"}} {cumulative}')
+                lines.append(f'{metric}_sum{{{label_text}}} {total:.6f}')
+                lines.append(f'{metric}_count{{{label_text}}} {cumulative}')
+        return '\n'.join(lines) + '\n'
+
+
+_histograms = Histograms()
+
+HELP = {
+    'solver_stage_duration_seconds': 'Duração de cada etapa do pipeline de otimização.',
+    'solver_request_duration_seconds': 'Duração total das requisições do solver, por view.',
+}
+
+
+def get_histograms():
+    return _histograms
+
+
+# Função para registrar a duração de uma etapa no histograma e na requisição atual
+def observe(name, seconds):
+    _histograms.observe('solver_stage_duration_seconds', {'stage': name}, seconds)
+    trace = _current_trace.get()
+    if trace is not None:
+        trace.add(name, seconds)
+
+
+# Context manager para medir uma etapa: with span('build'): ...
+@contextmanager
+def span(name):
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe(name, time.perf_counter() - started)
+
+
+# Função para iniciar a coleta das etapas no contexto atual (requisição ou tarefa)
+def start_trace():
+    trace = Trace()
+    return trace, _current_trace.set(trace)
+
+
+def end_trace(token):
+    _current_trace.reset(token)
+
+
+# Função para executar uma tarefa em outro processo devolvendo também as etapas medidas nele
+def traced_call(function, *args):
+    trace, token = start_trace()
+    try:
+        return function(*args), trace.spans
+    finally:
+        end_trace(token)
+
+
+# Função para registrar no processo atual as etapas medidas em outro processo
+def observe_spans(spans):
+    for name, seconds in spans:
+        observe(name, seconds)
+
+
+# Função para montar o cabeçalho Server-Timing (durações em milissegundos)
+def server_timing(trace, total_seconds):
+    entries = [f'{name};dur={ms}' for name, ms in trace.totals().items()]
+    entries.append(f'total;dur={round(total_seconds * 1000, 3)}')
+    return ', '.join(entries)
@@ -0,0 +1,594 @@
+import csv
+import math
+import os
+import re
+from array import array
+
+import numpy as np
+from django.conf import settings
+
+DEFAULT_SETTINGS = {
+    'MAX_BYTES': 64 * 1024 * 1024,   # Tamanho máximo do arquivo enviado
+    'MAX_NONZEROS': 2_000_000,       # Coeficientes não nulos da matriz de restrições
+}
+
+# Formatos aceitos e as extensões de arquivo correspondentes
+FORMATS = {'mps': ('.mps', '.fmps'), 'lp': ('.lp',), 'csv': ('.csv',)}
+
+SENSE_ALIASES = {
+    '<=': '<=', '=<': '<=', '<': '<=', 'l': '<=',
+    '>=': '>=', '=>': '>=', '>': '>=', 'g': '>=',
+    '=': '=', '==': '=', 'e': '=',
+}
+
+OBJECTIVES = {'max': 'maximize', 'maximize': 'maximize', 'min': 'minimize', 'minimize': 'minimize'}
+
+
+def upload_settings():
+    return {**DEFAULT_SETTINGS, **getattr(settings, 'SOLVER_UPLOAD', {})}
+
+
+# Função para descobrir o formato do arquivo: parâmetro explícito ou extensão do nome
+def detect_format(requested=None, filename=None):
+    if requested:
+        if requested not in FORMATS:
+            raise ValueError(f"format deve ser um de: {', '.join(FORMATS)}")
+        return requested
+    extension = os.path.splitext(filename or '')[1].lower()
+    for name, extensions in FORMATS.items():
+        if extension in extensions:
+            return name
+    raise ValueError('Formato do arquivo desconhecido; informe ?format=mps, lp ou csv.')
+
+
+# Função para ler as linhas de um stream binário, decodificadas e com limite de tamanho
+def text_lines(stream, max_bytes=None):
+    max_bytes = max_bytes or upload_settings()['MAX_BYTES']
+    total = 0
+    for line in stream:
+        total += len(line)
+        if total > max_bytes:
+            raise ValueError(f'Arquivo maior que o limite de {max_bytes} bytes.')
+        yield line.decode('utf-8', errors='replace') if isinstance(line, bytes) else line
+
+
+# Função para ler um arquivo enviado (linhas) no formato esparso de solver/sparse.py
+def read_upload(lines, fmt, objective=None):
+    """
+    `lines` é um iterável de linhas (o arquivo é lido uma linha por vez, sem
+    ser carregado inteiro na memória); os coeficientes vão direto para
+    arrays compactos. `objective` ("maximize"/"minimize") substitui o
+    sentido do arquivo. Levanta ValueError para arquivos inválidos.
+    """
+    builder = SparseBuilder(upload_settings()['MAX_NONZEROS'])
+    READERS[fmt](lines, builder)
+    if objective:
+        if objective not in ('maximize', 'minimize'):
+            raise ValueError('objective deve ser "maximize" ou "minimize".')
+        builder.objective = objective
+    return builder.sparse_data()
+
+
+class SparseBuilder:
+    """Acumula o modelo lido (nomes, triplas COO, sentidos, rhs e limites)."""
+
+    def __init__(self, max_nonzeros):
+        self.max_nonzeros = max_nonzeros
+        self.objective = 'minimize'
+        self.offset = 0.0
+        self.columns = {}
+        self.rows = {}
+        self.senses = []
+        self.rhs = array('d')
+        self.row = array('q')
+        self.col = array('q')
+        self.data = array('d')
+        self.cost = {}
+        self.lower = {}
+        self.upper = {}
+        self.integers = set()
+
+    def column(self, name):
+        index = self.columns.get(name)
+        if index is None:
+            index = self.columns[name] = len(self.columns)
+        return index
+
+    def add_row(self, name, sense, rhs=0.0):
+        index = len(self.senses)
+        if name is not None:
+            if name in self.rows:
+                raise ValueError(f'Restrição repetida: {name}')
+            self.rows[name] = index
+        self.senses.append(sense)
+        self.rhs.append(rhs)
+        return index
+
+    def add(self, row, column, value):
+        if value == 0:
+            return
+        if len(self.data) >= self.max_nonzeros:
+            raise ValueError(f'O modelo tem mais de {self.max_nonzeros} coeficientes não nulos.')
+        self.row.append(row)
+        self.col.append(column)
+        self.data.append(value)
+
+    def add_terms(self, row, terms):
+        for name, value in terms.items():
+            self.add(row, self.column(name), value)
+
+    def set_cost(self, terms):
+        for name, value in terms.items():
+            self.cost[self.column(name)] = self.cost.get(self.column(name), 0.0) + value
+
+    def bound(self, name, lower=None, upper=None):
+        column = self.column(name)
+        if lower is not None:
+            self.lower[column] = lower
+        if upper is not None:
+            self.upper[column] = upper
+
+    def split_ranges(self, ranges):
+        """
+        `ranges` mapeia o índice da restrição para (low, high): a restrição
+        vira low <= linha e uma cópia dela, linha <= high.
+        """
+        if not ranges:
+            return
+        copies = np.full(len(self.senses), -1, dtype=np.int64)
+        for index, (low, high) in sorted(ranges.items()):
+            self.senses[index] = '>='
+            self.rhs[index] = low
+            copies[index] = self.add_row(None, '<=', high)
+
+        rows = np.array(self.row, dtype=np.int64)
+        selected = np.flatnonzero(copies[rows] >= 0)
+        if len(self.data) + selected.size > self.max_nonzeros:
+            raise ValueError(f'O modelo tem mais de {self.max_nonzeros} coeficientes não nulos.')
+        self.row.frombytes(copies[rows[selected]].tobytes())
+        self.col.frombytes(np.array(self.col, dtype=np.int64)[selected].tobytes())
+        self.data.frombytes(np.array(self.data, dtype=np.float64)[selected].tobytes())
+
+    def sparse_data(self):
+        n = len(self.columns)
+        if n == 0:
+            raise ValueError('O arquivo não define nenhuma variável.')
+        cost = np.zeros(n)
+        for column, value in self.cost.items():
+            cost[column] = value
+        bounds = [
+            [
+                None if self.lower.get(j, 0.0) == -math.inf else self.lower.get(j, 0.0),
+                None if self.upper.get(j, math.inf) == math.inf else self.upper[j],
+            ]
+            for j in range(n)
+        ]
+        return {
+            'format': 'sparse',
+            'objective': self.objective,
+            'cost': cost,
+            'variables': list(self.columns),
+            'matrix': {
+                'format': 'coo',
+                'shape': [len(self.senses), n],
+                'row': np.frombuffer(self.row, dtype=np.int64),
+                'col': np.frombuffer(self.col, dtype=np.int64),
+                'data': np.frombuffer(self.data, dtype=np.float64),
+            },
+            'senses': self.senses,
+            'rhs': np.frombuffer(self.rhs, dtype=np.float64),
+            'bounds': bounds,
+            'integers': sorted(self.integers),
+            'offset': self.offset,
+        }
+
+
+# Função para converter um número do arquivo (aceita inf/infinity)
+def read_number(text):
+    try:
+        return float(text)
+    except ValueError:
+        raise ValueError(f'Número inválido: {text}')
+
+
+# Função para ler um arquivo MPS (fixo ou livre; os campos são separados por espaços)
+def read_mps(lines, builder):
+    """
+    Seções: NAME, OBJSENSE, ROWS, COLUMNS (com marcadores INTORG/INTEND),
+    RHS, RANGES, BOUNDS (UP, LO, FX, FR, MI, PL, BV, LI, UI) e ENDATA. O
+    conjunto (RHS/RANGES/BOUNDS) é opcional, como no MPS livre. Nomes com
+    espaços (permitidos no MPS fixo) não são aceitos.
+    """
+    section = None
+    objective_row = None
+    integer_block = False
+    ranges = {}
+
+    for number, line in enumerate(lines, start=1):
+        if not line.strip() or line.startswith('*'):
+            continue
+        fields = line.split()
+        if not line[0].isspace():
+            section = fields[0].upper()
+            if section == 'OBJSENSE' and len(fields) > 1:
+                builder.objective = mps_objective(fields[1])
+            if section == 'ENDATA':
+                break
+            continue
+
+        if section == 'OBJSENSE':
+            builder.objective = mps_objective(fields[0])
+        elif section == 'ROWS':
+            kind, name = fields[0].upper(), fields[1]
+            if kind == 'N':
+                # A primeira linha N é o objetivo; as demais (linhas livres) são ignoradas
+                objective_row = objective_row or name
+                builder.rows.setdefault(name, None)
+            elif kind in ('L', 'G', 'E'):
+                builder.add_row(name, SENSE_ALIASES[kind.lower()])
+            else:
+                raise ValueError(f'Linha {number}: tipo de restrição desconhecido: {kind}')
+        elif section == 'COLUMNS':
+            if len(fields) >= 3 and fields[1].strip("'").upper() == 'MARKER':
+                integer_block = fields[2].strip("'").upper() == 'INTORG'
+                continue
+            column = builder.column(fields[0])
+            if integer_block:
+                builder.integers.add(column)
+            for row_name, value in pairs(fields[1:], number):
+                if row_name == objective_row:
+                    builder.cost[column] = builder.cost.get(column, 0.0) + value
+                elif row_name not in builder.rows:
+                    raise ValueError(f'Linha {number}: restrição desconhecida: {row_name}')
+                elif builder.rows[row_name] is not None:
+                    builder.add(builder.rows[row_name], column, value)
+        elif section in ('RHS', 'RANGES'):
+            # Com um número ímpar de campos, o primeiro é o nome do conjunto
+            for row_name, value in pairs(fields[len(fields) % 2:], number):
+                if row_name not in builder.rows:
+                    raise ValueError(f'Linha {number}: restrição desconhecida: {row_name}')
+                index = builder.rows[row_name]
+                if section == 'RANGES':
+                    if index is not None:
+                        ranges[index] = value
+                elif row_name == objective_row:
+                    builder.offset = -value
+                elif index is not None:
+                    builder.rhs[index] = value
+        elif section == 'BOUNDS':
+            mps_bound(builder, fields, number)
+        else:
+            raise ValueError(f'Linha {number}: seção desconhecida ou ausente: {section}')
+
+    # RANGES: L vira [rhs - |R|, rhs], G vira [rhs, rhs + |R|] e E vai de rhs a rhs + R
+    intervals = {}
+    for index, value in ranges.items():
+        rhs, sense = builder.rhs[index], builder.senses[index]
+        if sense == '<=':
+            intervals[index] = (rhs - abs(value), rhs)
+        elif sense == '>=':
+            intervals[index] = (rhs, rhs + abs(value))
+        else:
+            intervals[index] = (min(rhs, rhs + value), max(rhs, rhs + value))
+    builder.split_ranges(intervals)
+
+
+def mps_objective(text):
+    objective = OBJECTIVES.get(text.lower())
+    if objective is None:
+        raise ValueError(f'OBJSENSE desconhecido: {text}')
+    return objective
+
+
+# Função para ler pares (nome, valor) de uma linha MPS
+def pairs(fields, number):
+    if len(fields) % 2:
+        raise ValueError(f'Linha {number}: campos incompletos.')
+    return [(fields[i], read_number(fields[i + 1])) for i in range(0, len(fields), 2)]
+
+
+# Tipos de limite do MPS que têm valor
+BOUNDS_WITH_VALUE = ('UP', 'LO', 'FX', 'LI', 'UI')
+
+
+def mps_bound(builder, fields, number):
+    kind = fields[0].upper()
+    has_value = kind in BOUNDS_WITH_VALUE
+    # O nome do conjunto é opcional: [tipo, conjunto, coluna, valor] ou [tipo, coluna, valor]
+    expected = 4 if has_value else 3
+    name = fields[2] if len(fields) >= expected else fields[1]
+    if has_value:
+        value = read_number(fields[-1])
+    column = builder.column(name)
+
+    if kind in ('LI', 'UI', 'BV'):
+        builder.integers.add(column)
+    if kind in ('UP', 'UI'):
+        # Limite superior negativo sem limite inferior: a variável fica livre por baixo
+        if value < 0 and column not in builder.lower:
+            builder.lower[column] = -math.inf
+        builder.upper[column] = value
+    elif kind in ('LO', 'LI'):
+        builder.lower[column] = value
+    elif kind == 'FX':
+        builder.lower[column] = builder.upper[column] = value
+    elif kind == 'FR':
+        builder.lower[column], builder.upper[column] = -math.inf, math.inf
+    elif kind == 'MI':
+        builder.lower[column] = -math.inf
+    elif kind == 'PL':
+        builder.upper[column] = math.inf
+    elif kind == 'BV':
+        builder.lower[column], builder.upper[column] = 0.0, 1.0
+    else:
+        raise ValueError(f'Linha {number}: tipo de limite não suportado: {kind}')
+
+
+# Seções do formato LP (CPLEX), pelas palavras que as iniciam
+LP_SECTIONS = [
+    (re.compile(r'^\s*(maximize|maximise|maximum|max)\b', re.I), 'maximize'),
+    (re.compile(r'^\s*(minimize|minimise|minimum|min)\b', re.I), 'minimize'),
+    (re.compile(r'^\s*(subject\s+to|such\s+that|s\.t\.|st)(?=\s|$|:)', re.I), 'constraints'),
+    (re.compile(r'^\s*(bounds|bound)\b', re.I), 'bounds'),
+    (re.compile(r'^\s*(generals|general|gen|integers|integer)\b', re.I), 'general'),
+    (re.compile(r'^\s*(binaries|binary|bin)\b', re.I), 'binary'),
+    (re.compile(r'^\s*end\b', re.I), 'end'),
+]
+
+LP_TOKEN = re.compile(
+    r'\s*(?:'
+    r'(?P<number>(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?)'
+    r'|(?P<operator><=|>=|=<|=>|<|>|=)'
+    r'|(?P<sign>[+-])'
+    r'|(?P<colon>:)'
+    r'|(?P<name>[A-Za-z_][\w.\[\]()#$%&@!~\'"{}|^]*)'
+    r')'
+)
+
+
+# Função para separar uma linha do formato LP em (tipo, texto)
+def lp_tokens(text):
+    tokens = []
+    position = 0
+    text = text.rstrip()
+    while position < len(text):
+        match = LP_TOKEN.match(text, position)
+        if match is None or match.end() == position:
+            raise ValueError(f'Símbolo inesperado: {text[position:].strip()[:20]}')
+        position = match.end()
+        tokens.append((match.lastgroup, match.group(match.lastgroup)))
+    return tokens
+
+
+# Função para ler um arquivo LP (formato CPLEX)
+def read_lp(lines, builder):
+    """
+    Seções: Maximize/Minimize, Subject To, Bounds, General, Binary e End.
+    Objetivo e restrições podem ocupar várias linhas (uma restrição termina
+    no número depois do operador); limites são lidos um por linha.
+    Comentários começam com '\\'.
+    """
+    section = None
+    objective_seen = False
+    statement = []
+
+    for number, line in enumerate(lines, start=1):
+        line = line.split('\\', 1)[0]
+        if not line.strip():
+            continue
+        for pattern, name in LP_SECTIONS:
+            match = pattern.match(line)
+            if match:
+                if section in ('maximize', 'minimize') and statement:
+                    lp_objective(builder, statement, number)
+                elif statement:
+                    raise ValueError(f'Linha {number}: restrição incompleta antes de {match.group(1)}.')
+                statement = []
+                section = name
+                if name in ('maximize', 'minimize'):
+                    builder.objective = name
+                    objective_seen = True
+                line = line[match.end():]
+                break
+        if section == 'end':
+            break
+        if not objective_seen:
+            raise ValueError(f'Linha {number}: o arquivo deve começar com Maximize ou Minimize.')
+
+        tokens = lp_tokens(line)
+        if section in ('maximize', 'minimize'):
+            statement.extend(tokens)
+        elif section == 'constraints':
+            for token in tokens:
+                statement.append(token)
+                if lp_constraint_complete(statement):
+                    lp_constraint(builder, statement, number)
+                    statement = []
+        elif section == 'bounds':
+            if tokens:
+                lp_bound(builder, tokens, number)
+        else:
+            for kind, name in tokens:
+                if kind != 'name':
+                    raise ValueError(f'Linha {number}: esperado o nome de uma variável.')
+                column = builder.column(name)
+                builder.integers.add(column)
+                if section == 'binary':
+                    builder.lower[column], builder.upper[column] = 0.0, 1.0
+
+    if section in ('maximize', 'minimize') and statement:
+        lp_objective(builder, statement, number)
+    elif statement:
+        raise ValueError('Restrição incompleta no fim do arquivo.')
+
+
+# Função para separar o nome opcional ("c1:") de uma expressão LP
+def lp_statement_name(tokens):
+    if len(tokens) >= 2 and tokens[0][0] == 'name' and tokens[1][0] == 'colon':
+        return tokens[0][1], tokens[2:]
+    return None, tokens
+
+
+# Uma restrição está completa quando já tem o operador e o número do lado direito
+def lp_constraint_complete(tokens):
+    kinds = [kind for kind, _ in tokens]
+    if 'operator' not in kinds:
+        return False
+    return kinds[-1] == 'number' or (kinds[-1] == 'name' and tokens[-1][1].lower() in ('inf', 'infinity'))
+
+
+def lp_objective(builder, tokens, number):
+    terms, constant = lp_expression(lp_statement_name(tokens)[1], number)
+    builder.set_cost(terms)
+    builder.offset += constant
+
+
+def lp_constraint(builder, tokens, number):
+    name, tokens = lp_statement_name(tokens)
+    position = next(i for i, (kind, _) in enumerate(tokens) if kind == 'operator')
+    sense = SENSE_ALIASES[tokens[position][1]]
+    terms, constant = lp_expression(tokens[:position], number)
+    row = builder.add_row(name, sense, lp_constant(tokens[position + 1:], number) - constant)
+    builder.add_terms(row, terms)
+
+
+# Função para ler uma expressão linear LP: [sinal] [coeficiente] variável ... (+ constantes)
+def lp_expression(tokens, number):
+    terms = {}
+    constant = 0.0
+    sign, coefficient = 1.0, None
+    for kind, text in tokens:
+        if kind == 'sign':
+            if coefficient is not None:
+                constant += sign * coefficient
+                sign, coefficient = 1.0, None
+            sign = sign * (-1.0 if text == '-' else 1.0)
+        elif kind == 'number' and coefficient is None:
+            coefficient = read_number(text)
+        elif kind == 'name':
+            value = sign * (1.0 if coefficient is None else coefficient)
+            terms[text] = terms.get(text, 0.0) + value
+            sign, coefficient = 1.0, None
+        else:
+            raise ValueError(f'Linha {number}: expressão inválida.')
+    if coefficient is not None:
+        constant += sign * coefficient
+    return terms, constant
+
+
+# Função para ler um número LP com sinal (aceita inf/infinity)
+def lp_constant(tokens, number):
+    sign = 1.0
+    for kind, text in tokens:
+        if kind == 'sign':
+            sign = -sign if text == '-' else sign
+        elif kind == 'number':
+            return sign * read_number(text)
+        elif kind == 'name' and text.lower() in ('inf', 'infinity'):
+            return sign * math.inf
+        else:
+            break
+    raise ValueError(f'Linha {number}: número esperado.')
+
+
+def lp_bound(builder, tokens, number):
+    """Aceita: x free, x <= u, x >= l, x = v, l <= x, l <= x <= u (e os sentidos invertidos)."""
+    if len(tokens) == 2 and tokens[0][0] == 'name' and tokens[1][1].lower() == 'free':
+        builder.bound(tokens[0][1], -math.inf, math.inf)
+        return
+
+    # Divide nos operadores: [termo, op, termo] ou [termo, op, termo, op, termo]
+    parts, operators, current = [], [], []
+    for token in tokens:
+        if token[0] == 'operator':
+            parts.append(current)
+            operators.append(SENSE_ALIASES[token[1]])
+            current = []
+        else:
+            current.append(token)
+    parts.append(current)
+
+    def variable(part):
+        if len(part) == 1 and part[0][0] == 'name' and part[0][1].lower() not in ('inf', 'infinity'):
+            return part[0][1]
+        return None
+
+    if len(parts) == 3 and variable(parts[1]):
+        low, high = lp_constant(parts[0], number), lp_constant(parts[2], number)
+        if operators[0] == '>=':
+            low, high = high, low
+        builder.bound(parts[1][0][1], low, high)
+    elif len(parts) == 2 and (variable(parts[0]) or variable(parts[1])):
+        operator = operators[0]
+        if variable(parts[1]):
+            # l <= x equivale a x >= l
+            parts = parts[::-1]
+            operator = {'<=': '>=', '>=': '<=', '=': '='}[operator]
+        name, value = parts[0][0][1], lp_constant(parts[1], number)
+        if operator == '<=':
+            builder.bound(name, None, value)
+        elif operator == '>=':
+            builder.bound(name, value, None)
+        else:
+            builder.bound(name, value, value)
+    else:
+        raise ValueError(f'Linha {number}: limite inválido.')
+
+
+# Função para ler uma matriz de coeficientes em CSV
+def read_csv(lines, builder):
+    """
+    Cabeçalho: rótulo da linha, uma coluna por variável, "sense" e "rhs":
+
+        ,x1,x2,sense,rhs
+        objective,3,5,max,
+        c1,1,0,<=,4
+        lower,0,-inf,,
+        upper,,10,,
+        integer,0,1,,
+
+    A linha "objective" (sense max/min) é obrigatória; "lower", "upper" e
+    "integer" são opcionais. Células vazias valem 0 (ou o limite padrão).
+    """
+    reader = csv.reader(lines)
+    header = next(reader, None)
+    if not header:
+        raise ValueError('CSV vazio.')
+    header = [cell.strip() for cell in header]
+    lowered = [cell.lower() for cell in header]
+    if 'sense' not in lowered or 'rhs' not in lowered:
+        raise ValueError('O cabeçalho do CSV deve ter as colunas "sense" e "rhs".')
+    sense_at, rhs_at = lowered.index('sense'), lowered.index('rhs')
+    variables = [(i, builder.column(name)) for i, name in enumerate(header) if i and i not in (sense_at, rhs_at)]
+
+    has_objective = False
+    for number, cells in enumerate(reader, start=2):
+        if not any(cell.strip() for cell in cells):
+            continue
+        cells = [cell.strip() for cell in cells] + [''] * (len(header) - len(cells))
+        label = cells[0]
+        kind = label.lower()
+        values = [(column, cells[i]) for i, column in variables if cells[i]]
+        if kind in ('objective', 'obj'):
+            has_objective = True
+            builder.objective = OBJECTIVES.get(cells[sense_at].lower(), 'maximize')
+            for column, text in values:
+                builder.cost[column] = read_number(text)
+        elif kind in ('lower', 'upper'):
+            target = builder.lower if kind == 'lower' else builder.upper
+            for column, text in values:
+                target[column] = read_number(text)
+        elif kind == 'integer':
+            builder.integers.update(column for column, text in values if read_number(text))
+        else:
+            sense = SENSE_ALIASES.get(cells[sense_at].lower())
+            if sense is None:
+                raise ValueError(f'Linha {number}: sentido inválido: {cells[sense_at]}')
+            row = builder.add_row(label, sense, read_number(cells[rhs_at] or '0'))
+            for column, text in values:
+                builder.add(row, column, read_number(text))
+    if not has_objective:
+        raise ValueError('O CSV deve ter uma linha "objective".')
+
+
+READERS = {'mps': read_mps, 'lp': read_lp, 'csv': read_csv}
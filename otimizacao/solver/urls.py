@@ -4,5 +4,18 @@ from . import views
 urlpatterns = [
     path('', views.index, name='index'),
     path('optimize/', views.optimize, name='optimize'),
-    path('graph/', views.graph, name='graph'),
+    path('optimize/async/', views.optimize_async, name='optimize_async'),
+    path('optimize/upload/', views.optimize_upload, name='optimize_upload'),
+    path('optimize/batch/', views.optimize_batch, name='optimize_batch'),
+    path('optimize/stream/', views.optimize_stream, name='optimize_stream'),
+    path('sweep/', views.sweep, name='sweep'),
+    path('backends/', views.backends, name='backends'),
+    path('history/', views.history, name='history'),
+    path('jobs/', views.jobs, name='jobs'),
+    path('jobs/<uuid:job_id>/', views.job_detail, name='job_detail'),
+    path('sessions/', views.sessions, name='sessions'),
+    path('sessions/<str:session_id>/', views.session_detail, name='session_detail'),
+    path('gallery/', views.gallery, name='gallery'),
+    path('gallery/<str:name>', views.gallery_file, name='gallery_file'),
+    path('graph/<str:key>/', views.graph, name='graph'),
 ]
@@ -0,0 +1,97 @@
+from urllib.parse import urlencode
+
+from django.conf import settings
+
+# Formatos do gráfico e o Content-Type de cada um
+FORMATS = {
+    'png': 'image/png',
+    'svg': 'image/svg+xml',
+    'webp': 'image/webp',
+}
+
+# Larguras predefinidas, em pixels (a altura é sempre 4/5 da largura)
+SIZES = {'full': 1000, 'medium': 640, 'thumb': 320}
+
+QUALITIES = ('high', 'low')
+
+# Variante original: o PNG de 1000x800 com legenda, grade e título
+DEFAULT_VARIANT = {'format': 'png', 'width': 1000, 'dpi': 100, 'quality': 'high'}
+
+DEFAULT_SETTINGS = {
+    'MIN_WIDTH': 160,
+    'MAX_WIDTH': 2000,
+    'MIN_DPI': 30,
+    'MAX_DPI': 200,
+}
+
+
+def variant_settings():
+    render = getattr(settings, 'SOLVER_RENDER', {})
+    return {k: render.get(k, v) for k, v in DEFAULT_SETTINGS.items()}
+
+
+# Função para ler a variante do gráfico dos parâmetros da requisição
+def read_variant(params):
+    """
+    Parâmetros (todos opcionais): format (png, svg, webp), size (full,
+    medium, thumb) ou width (pixels), dpi e quality (high, low). Com
+    quality=low o gráfico sai sem legenda, grade e título, e os formatos
+    raster são mais comprimidos. Levanta ValueError para valores inválidos.
+    """
+    variant = dict(DEFAULT_VARIANT)
+    options = variant_settings()
+
+    fmt = params.get('format')
+    if fmt:
+        if fmt not in FORMATS:
+            raise ValueError(f"format deve ser um de: {', '.join(FORMATS)}")
+        variant['format'] = fmt
+
+    size = params.get('size')
+    if size:
+        if size not in SIZES:
+            raise ValueError(f"size deve ser um de: {', '.join(SIZES)}")
+        variant['width'] = SIZES[size]
+        # Miniaturas saem simplificadas, a menos que a qualidade seja pedida
+        if size == 'thumb':
+            variant['quality'] = 'low'
+
+    for name, low, high in (
+        ('width', options['MIN_WIDTH'], options['MAX_WIDTH']),
+        ('dpi', options['MIN_DPI'], options['MAX_DPI']),
+    ):
+        if params.get(name) in (None, ''):
+            continue
+        try:
+            number = int(params[name])
+        except (TypeError, ValueError):
+            raise ValueError(f'{name} deve ser um inteiro.')
+        if not low <= number <= high:
+            raise ValueError(f'{name} deve estar entre {low} e {high}.')
+        variant[name] = number
+
+    quality = params.get('quality')
+    if quality:
+        if quality not in QUALITIES:
+            raise ValueError(f"quality deve ser um de: {', '.join(QUALITIES)}")
+        variant['quality'] = quality
+    return variant
+
+
+# Função para o nome do artefato de uma variante (a variante original mantém o nome antigo)
+def variant_name(key, variant=None):
+    if variant is None or variant == DEFAULT_VARIANT:
+        return key
+    return f"{key}-w{variant['width']}-d{variant['dpi']}-{variant['quality']}.{variant['format']}"
+
+
+# Função para a URL do gráfico de um resultado na variante pedida
+def variant_query(variant=None):
+    if variant is None or variant == DEFAULT_VARIANT:
+        return ''
+    changed = {k: v for k, v in variant.items() if DEFAULT_VARIANT[k] != v}
+    return '?' + urlencode(changed)
+
+
+def content_type(variant=None):
+    return FORMATS[(variant or DEFAULT_VARIANT)['format']]
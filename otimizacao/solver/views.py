@@ -1,259 +1,894 @@
-import matplotlib
-matplotlib.use('Agg')
-
 from django.shortcuts import render
-from django.http import JsonResponse
-from pulp import LpProblem, LpVariable, LpMaximize, LpMinimize, lpSum, value
-import os
+from django.templatetags.static import static
+from django.core.paginator import EmptyPage, Paginator
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import FileResponse, HttpResponse, JsonResponse, StreamingHttpResponse
+from django.urls import reverse
+from django.utils.cache import patch_cache_control
+from django.utils.http import quote_etag
+from django.views.decorators.http import condition, require_http_methods, require_POST
+from asgiref.sync import sync_to_async
+from datetime import datetime, timezone
+import asyncio
 import json
-import re
-import numpy as np
-import matplotlib.pyplot as plt
+import os
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed, wait
+
+from .admission import get_admission
+from .artifacts import get_artifact_store
+from .batch import batch_settings, get_solve_executor
+from .cache import get_result_cache, problem_key
+from .gallery import IMMUTABLE_MAX_AGE, asset_content_type, asset_path, gallery_settings, load_manifest
+from .history import get_history, history_settings, stored_entry
+from .jobs import FINISHED, JOB_OPTIONS, QueueFull, cancel_job, jobs_settings, queue_position, submit_job, wait_for_job
+from .models import Problem, SolveJob
+from .timing import HELP, get_histograms, span
+from .variants import DEFAULT_VARIANT, content_type, read_variant, variant_name, variant_query
+from .workers import RenderQueueFull, get_render_pool
+
+# PuLP e NumPy (solver/problem.py, backends.py, sparse.py, sensitivity.py, sessions.py,
+# upload.py, geometry.py) são importados dentro das views que resolvem modelos: importar
+# as URLs não os carrega, e um worker que só atende index não paga essa importação
+
+
+# find_line_points e parse_expression continuam acessíveis em solver.views
+def __getattr__(name):
+    if name in ('find_line_points', 'parse_expression'):
+        from . import problem
+        return getattr(problem, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 # View inicial
 def index(request):
     return render(request, 'index.html')
 
+# Função para o nome do artefato pedido em /graph/<key>/ (None se os parâmetros forem inválidos)
+def graph_artifact(request, key):
+    try:
+        return variant_name(key, read_variant(request.GET))
+    except ValueError:
+        return None
+
+
+# Funções auxiliares para requisições condicionais (ETag / Last-Modified) do gráfico
+def graph_etag(request, key):
+    name = graph_artifact(request, key)
+    return name if name and get_artifact_store().exists(name) else None
+
+
+def graph_last_modified(request, key):
+    name = graph_artifact(request, key)
+    st = get_artifact_store().stat(name) if name else None
+    return datetime.fromtimestamp(st.st_mtime, tz=timezone.utc) if st else None
+
+
 # View para geração de gráficos
-def graph(request):
-    filepath = 'solver/static/graph.png'
-    if os.path.exists(filepath):
-        return FileResponse(open(filepath, 'rb'), content_type='image/png')
+@condition(etag_func=graph_etag, last_modified_func=graph_last_modified)
+def graph(request, key):
+    """
+    ?format=, ?size=/?width=, ?dpi= e ?quality= escolhem a variante (ver
+    solver/variants.py). Cada variante é renderizada uma vez, sob demanda,
+    e guardada como um artefato próprio.
+    """
+    try:
+        variant = read_variant(request.GET)
+    except ValueError as e:
+        return JsonResponse({'error': str(e)}, status=400)
+    name = variant_name(key, variant)
+
+    store = get_artifact_store()
+    f = store.open(name)
+    graph_bytes = None
+    if f is None:
+        # Variante ainda não gerada: renderiza a partir do resultado (cache ou histórico)
+        pool = get_render_pool()
+        if not pool.pending(name):
+            entry = get_result_cache().get(key) or stored_entry(key)
+            if entry is not None and entry['render'] is not None:
+                schedule_graph(key, entry, variant)
+        # O gráfico ainda pode estar sendo renderizado pelo pool de processos
+        graph_bytes = pool.wait(name)
+        if graph_bytes is None:
+            f = store.open(name)
+            if f is None:
+                return JsonResponse({'error': 'Gráfico não encontrado. Gere um gráfico primeiro.'}, status=404)
+
+    if f is not None:
+        response = FileResponse(f, content_type=content_type(variant))
     else:
-        return JsonResponse({'error': 'Gráfico não encontrado. Gere um gráfico primeiro.'}, status=404)
+        response = HttpResponse(graph_bytes, content_type=content_type(variant))
+        response['ETag'] = quote_etag(name)
+    patch_cache_control(response, public=True, max_age=store.max_age)
+    return response
 
 
-# Função para parsear expressões matemáticas
-def parse_expression(expression, variables):
+# Função para garantir que o gráfico de um resultado exista ou esteja sendo renderizado
+def schedule_graph(cache_key, entry, variant=None):
+    """
+    Retorna True se o gráfico (na variante pedida) já existe ou foi
+    agendado. Quando o PNG original fica pronto, ele também é guardado na
+    entrada do cache de resultados.
+    """
+    variant = variant or DEFAULT_VARIANT
+    name = variant_name(cache_key, variant)
+    artifact_store = get_artifact_store()
+    if artifact_store.exists(name):
+        return True
+    if variant != DEFAULT_VARIANT:
+        try:
+            get_render_pool().submit(name, *entry['render'], variant)
+            return True
+        except RenderQueueFull:
+            print(f"Fila de renderização cheia; gráfico {name} não agendado.")
+            return False
+    if entry.get('graph') is not None:
+        artifact_store.put(cache_key, entry['graph'])
+        return True
+
+    def store_in_cache(graph_bytes):
+        result_cache = get_result_cache()
+        current = result_cache.get(cache_key) or entry
+        result_cache.set(cache_key, {**current, 'graph': graph_bytes})
+
     try:
-        terms = re.findall(r'([+-]?\s*\d*\.*\d*)\s*([a-zA-Z_][a-zA-Z0-9_]*)', expression)
-        parsed_terms = []
-        for coef, var in terms:
-            coef = coef.replace(' ', '') 
-            if coef in ('', '+'):
-                coef = 1
-            elif coef == '-':
-                coef = -1
+        get_render_pool().submit(cache_key, *entry['render'], callback=store_in_cache)
+        return True
+    except RenderQueueFull:
+        print(f"Fila de renderização cheia; gráfico {cache_key} não agendado.")
+        return False
+
+
+# Função para montar a resposta conforme o gráfico tenha sido agendado ou não
+def graph_response(result, graph_scheduled):
+    if graph_scheduled:
+        return result
+    return {**result, 'graph_path': None, 'graph_error': 'Fila de renderização cheia. Tente novamente.'}
+
+
+# Função para montar a resposta com a geometria do gráfico (output=geometry) em vez do PNG
+def geometry_response(result, render):
+    from .geometry import plot_geometry
+
+    with span('geometry'):
+        geometry = plot_geometry(*render) if render is not None else None
+    return {**result, 'graph_path': None, 'geometry': geometry}
+
+
+# Função para consultar o cache de resultados (e reagendar o gráfico, se preciso)
+def lookup_result(cache_key, graph=True, geometry=False, variant=None):
+    cached = get_result_cache().get(cache_key)
+    if cached is None:
+        # Problemas resolvidos antes (inclusive por outros processos) vêm do histórico no banco
+        cached = stored_entry(cache_key)
+        if cached is None:
+            return None
+        cached['result']['graph_path'] = reverse('graph', args=[cache_key])
+        get_result_cache().set(cache_key, cached)
+    if geometry:
+        return geometry_response(cached['result'], cached['render'])
+    if not graph or cached['render'] is None:
+        return {**cached['result'], 'graph_path': None}
+    result = {**cached['result'], 'graph_path': graph_path(cache_key, variant)}
+    return graph_response(result, schedule_graph(cache_key, cached, variant))
+
+
+# Função para a URL do gráfico de um resultado, na variante pedida
+def graph_path(cache_key, variant=None):
+    return reverse('graph', args=[cache_key]) + variant_query(variant)
+
+
+# Função para montar a resposta numérica e os argumentos do gráfico (render_graph) de um modelo resolvido
+def solution_result(cache_key, non_negativity, solution):
+    optimal_point = solution['optimal_point']
+
+    result = {
+        'Ponto Ótimo': f"({', '.join(map(str, optimal_point))})",
+        'Resultado Objetivo': solution['objective_result'],
+        'Pontos Restrição': solution['restriction_points'],
+        'graph_key': cache_key,
+        'graph_path': reverse('graph', args=[cache_key])
+    }
+    if 'variables' in solution:
+        result['Variáveis'] = solution['variables']
+    if 'vertices' in solution:
+        result['Vértices'] = solution['vertices']
+    if 'backend' in solution:
+        result['Resolvedor'] = solution['backend']
+    if 'status' in solution:
+        result['Status'] = solution['status']
+    if 'presolve' in solution:
+        # Restrições removidas pelo presolve antes da resolução (ver solver/presolve.py)
+        result['Presolve'] = solution['presolve']
+    if 'gap' in solution:
+        # Modelos inteiros: limitante da melhor solução possível e gap relativo da incumbente
+        result['Limitante'] = solution['bound']
+        result['Gap'] = solution['gap']
+
+    render = None
+    if solution['constraint_lines'] is not None:
+        # Os vértices do resolvedor 2-D (x >= 0) servem ao gráfico quando a região é
+        # limitada e o gráfico também considera a não negatividade
+        vertices = None
+        if solution.get('bounded') and all(non_negativity.get(x, True) for x in ('x1', 'x2')):
+            vertices = solution['vertices']
+        render = (solution['constraint_lines'], non_negativity, optimal_point[:2], vertices)
+    return result, render
+
+
+# Função para montar a resposta de um modelo resolvido, guardá-la no cache e agendar o gráfico
+def finish_solve(cache_key, non_negativity, solution, graph=True, spec=None, geometry=False, variant=None):
+    """
+    `solution` vem de backends.solve/solve_problem (ou sparse_solution).
+    Sem constraint_lines (mais de duas variáveis) não há gráfico. Com
+    `spec` (o problema resolvido), a resolução entra no histórico. Com
+    `geometry`, a resposta traz a geometria do gráfico e nenhum PNG é gerado.
+    `variant` escolhe o formato/tamanho do gráfico agendado (ver solver/variants.py).
+    """
+    result, render = solution_result(cache_key, non_negativity, solution)
+    # Gerar gráfico fora da requisição; a resposta numérica sai imediatamente
+    entry = {'result': result, 'render': render, 'graph': None}
+    get_result_cache().set(cache_key, entry)
+    history = get_history()
+    if spec is not None and history is not None:
+        history.record(cache_key, spec, entry, solution)
+    if geometry:
+        return geometry_response(result, render)
+    if not graph or render is None:
+        return {**result, 'graph_path': None}
+    result = {**result, 'graph_path': graph_path(cache_key, variant)}
+    return graph_response(result, schedule_graph(cache_key, entry, variant))
+
+
+# Função para resolver um problema no formato esparso (N variáveis, matriz COO/CSR)
+def solve_sparse(data, geometry=False):
+    from pulp import PULP_CBC_CMD
+    from .backends import solver_limits
+    from .sparse import (
+        build_sparse_model, read_sparse_problem, sparse_non_negativity, sparse_problem_key, sparse_solution,
+    )
+
+    started = time.perf_counter()
+    with span('parse'):
+        problem = read_sparse_problem(data)
+        cache_key = sparse_problem_key(problem)
+    with span('lookup'):
+        cached = lookup_result(cache_key, geometry=geometry)
+    if cached is not None:
+        return cached
+
+    with span('build'):
+        model, variables = build_sparse_model(problem)
+    built = time.perf_counter()
+    with span('cbc'):
+        model.solve(PULP_CBC_CMD(msg=False, **solver_limits()))
+    solved = time.perf_counter()
+
+    solution = sparse_solution(model, variables, problem)
+    spec = {
+        'format': 'sparse',
+        'objective': problem['objective'],
+        'shape': list(problem['shape']),
+        'variables': problem['variables'],
+    }
+    result = finish_solve(cache_key, sparse_non_negativity(problem), solution, spec=spec, geometry=geometry)
+    result['timings'] = {
+        'build_ms': round((built - started) * 1000, 3),
+        'solve_ms': round((solved - built) * 1000, 3),
+    }
+    return result
+
+
+# Função para calcular a chave canônica de um problema
+def cache_key_for(problem):
+    return problem_key(
+        problem['objective'], problem['objectiveFunction'],
+        problem['constraints'], problem['nonNegativity'],
+        problem.get('variables'), problem.get('limits'), problem.get('solver'),
+    )
+
+
+# Função principal de otimização
+def optimize(request):
+    from .backends import solve
+    from .problem import read_problem
+    from .sparse import is_sparse_problem
+
+    if request.method == 'POST':
+        try:
+            # Obter dados do POST (cada etapa é medida; ver solver/timing.py)
+            with span('json'):
+                data = json.loads(request.body)
+            # output=geometry (no corpo ou na URL) devolve a geometria para o navegador desenhar
+            geometry = request.GET.get('output', data.get('output')) == 'geometry'
+            if is_sparse_problem(data):
+                return JsonResponse(solve_sparse(data, geometry=geometry))
+            with span('parse'):
+                problem = read_problem(data)
+                cache_key = cache_key_for(problem)
+                # ?format=svg, ?size=thumb... escolhem a variante do gráfico (ver solver/variants.py)
+                variant = read_variant(request.GET)
+
+            # Modelos repetidos são respondidos pelo cache, sem resolver nem desenhar
+            with span('lookup'):
+                cached = lookup_result(cache_key, geometry=geometry, variant=variant)
+            if cached is not None:
+                return JsonResponse(cached)
+
+            # Resolver o modelo com o resolvedor escolhido para o seu formato (ver solver/backends.py)
+            solution = solve(problem, problem['solver'])
+            with span('finish'):
+                result = finish_solve(cache_key, problem['nonNegativity'], solution, spec=problem,
+                                      geometry=geometry, variant=variant)
+            return JsonResponse(result)
+
+        except ValueError as e:
+            # Declarações inválidas (variables, limits) ou resolvedor indisponível
+            return JsonResponse({'error': str(e)}, status=400)
+        except Exception as e:
+            print(f"Erro inesperado: {e}")
+            return JsonResponse({'error': f"Erro inesperado: {str(e)}"}, status=500)
+
+
+# Versão assíncrona da otimização (ASGI): o CBC roda como subprocesso sem bloquear o worker
+@require_POST
+async def optimize_async(request):
+    from .backends import solve_async_problem
+    from .problem import read_problem
+
+    try:
+        with span('parse'):
+            data = json.loads(request.body)
+            problem = read_problem(data)
+            cache_key = cache_key_for(problem)
+            variant = read_variant(request.GET)
+        geometry = request.GET.get('output', data.get('output')) == 'geometry'
+
+        with span('lookup'):
+            cached = await sync_to_async(lookup_result, thread_sensitive=False)(
+                cache_key, geometry=geometry, variant=variant
+            )
+        if cached is not None:
+            return JsonResponse(cached)
+
+        # Resolver o modelo; a tarefa é cancelada se o cliente desconectar
+        solution = await solve_async_problem(problem, problem['solver'])
+
+        result = await sync_to_async(finish_solve, thread_sensitive=False)(
+            cache_key, problem['nonNegativity'], solution, spec=problem, geometry=geometry, variant=variant
+        )
+        return JsonResponse(result)
+
+    except asyncio.TimeoutError:
+        return JsonResponse({'error': 'Tempo limite de resolução excedido.'}, status=504)
+    except ValueError as e:
+        return JsonResponse({'error': str(e)}, status=400)
+    except Exception as e:
+        print(f"Erro inesperado: {e}")
+        return JsonResponse({'error': f"Erro inesperado: {str(e)}"}, status=500)
+
+
+# View para otimizar um modelo enviado como arquivo MPS, LP ou CSV (ver solver/upload.py)
+@require_POST
+def optimize_upload(request):
+    """
+    O arquivo vem em um formulário multipart (campo "file") ou como o próprio
+    corpo da requisição, com ?format=mps|lp|csv. Ele é lido em streaming,
+    linha a linha, e o modelo segue pelo caminho esparso de optimize.
+    ?objective=maximize|minimize substitui o sentido do arquivo.
+    """
+    from .upload import detect_format, read_upload, text_lines
+
+    try:
+        upload = request.FILES.get('file') if request.content_type == 'multipart/form-data' else None
+        fmt = detect_format(request.GET.get('format'), upload.name if upload is not None else None)
+        with span('upload'):
+            data = read_upload(text_lines(upload if upload is not None else request), fmt, request.GET.get('objective'))
+        result = solve_sparse(data, geometry=request.GET.get('output') == 'geometry')
+        m, n = data['matrix']['shape']
+        result['Arquivo'] = {'format': fmt, 'rows': m, 'columns': n, 'nonzeros': len(data['matrix']['data'])}
+        return JsonResponse(result)
+
+    except ValueError as e:
+        # Arquivo inválido, formato desconhecido ou modelo acima dos limites de SOLVER_UPLOAD
+        return JsonResponse({'error': str(e)}, status=400)
+    except Exception as e:
+        print(f"Erro inesperado: {e}")
+        return JsonResponse({'error': f"Erro inesperado: {str(e)}"}, status=500)
+
+
+# Função para resolver um lote de problemas, produzindo (índice, resultado)
+def iter_batch(items, graph=True, ordered=True, output=None):
+    """
+    Modelos em cache são respondidos na hora; os demais são resolvidos em
+    paralelo no pool de processos (modelos idênticos no mesmo lote são
+    resolvidos uma única vez). Com `ordered`, os resultados saem na ordem
+    do lote; caso contrário, conforme cada um termina.
+    """
+    from .backends import record_latency, solve_problem
+    from .problem import read_problem
+
+    executor = get_solve_executor()
+    ready = {}
+    pending = {}
+    submitted = {}
+
+    try:
+        for index, item in enumerate(items):
+            try:
+                problem = read_problem(item)
+                item_graph = graph and item.get('graph', True)
+                item_geometry = item.get('output', output) == 'geometry'
+                cache_key = cache_key_for(problem)
+                cached = lookup_result(cache_key, graph=item_graph, geometry=item_geometry)
+                if cached is not None:
+                    ready[index] = cached
+                    continue
+                if cache_key not in submitted:
+                    submitted[cache_key] = executor.submit(solve_problem, problem)
+                pending[submitted[cache_key]] = pending.get(submitted[cache_key], []) + [
+                    (index, cache_key, problem, item_graph, item_geometry)
+                ]
+            except Exception as e:
+                ready[index] = {'error': f"Erro inesperado: {str(e)}"}
+
+        def finished(future):
+            # As métricas dos processos do lote ficam neles; registra o tempo aqui também
+            if future.exception() is None:
+                record_latency(future.result())
+            for index, cache_key, problem, item_graph, item_geometry in pending[future]:
+                try:
+                    ready[index] = finish_solve(
+                        cache_key, problem['nonNegativity'], future.result(),
+                        graph=item_graph, spec=problem, geometry=item_geometry,
+                    )
+                except Exception as e:
+                    ready[index] = {'error': f"Erro inesperado: {str(e)}"}
+
+        if ordered:
+            by_index = {index: future for future, infos in pending.items() for index, *_ in infos}
+            for index in range(len(items)):
+                if index not in ready:
+                    finished(by_index[index])
+                yield index, ready.pop(index)
+        else:
+            for index in sorted(ready):
+                yield index, ready.pop(index)
+            for future in as_completed(pending):
+                finished(future)
+                for index in sorted(ready):
+                    yield index, ready.pop(index)
+    finally:
+        # Cliente desconectou ou houve erro: descarta o que ainda não começou
+        for future in pending:
+            future.cancel()
+
+
+# Função para formatar um evento Server-Sent Events
+def sse_event(event, data):
+    return f"event: {event}\ndata: {json.dumps(data, cls=DjangoJSONEncoder)}\n\n"
+
+
+# Função para resolver um problema produzindo eventos SSE: etapas, log do CBC, resultado e gráfico
+def iter_solve_events(data, geometry=False, poll_interval=0.2):
+    """
+    Eventos, na ordem: 'stage' (received, parsed, solving, solved,
+    rendering), 'progress' (uma linha do log do CBC por evento), 'result'
+    (a resposta numérica de optimize, assim que o modelo é resolvido),
+    'graph' (graph_path quando o PNG fica pronto, ou a geometria) e 'done'.
+    Em caso de falha, um evento 'error' encerra o fluxo.
+    """
+    from .backends import problem_shape, select_backend, solve
+    from .problem import read_problem
+
+    try:
+        yield sse_event('stage', {'stage': 'received'})
+        problem = read_problem(data)
+        cache_key = cache_key_for(problem)
+        shape = problem_shape(problem)
+        yield sse_event('stage', {'stage': 'parsed', 'variables': shape['variables'], 'constraints': shape['constraints']})
+
+        result = lookup_result(cache_key, geometry=geometry)
+        if result is None:
+            backend = select_backend(shape, problem['solver'])
+            yield sse_event('stage', {'stage': 'solving', 'backend': backend.name})
+
+            # O modelo é resolvido em uma thread enquanto o log do CBC é lido e repassado
+            fd, log_path = tempfile.mkstemp(suffix='.log')
+            os.close(fd)
+            executor = ThreadPoolExecutor(max_workers=1)
+            try:
+                future = executor.submit(solve, problem, backend.name, log_path)
+                with open(log_path) as log:
+                    partial = ''
+                    while True:
+                        finished = future.done()
+                        lines = (partial + log.read()).split('\n')
+                        partial = '' if finished else lines.pop()
+                        for line in filter(None, map(str.strip, lines)):
+                            yield sse_event('progress', {'line': line})
+                        if finished:
+                            break
+                        wait([future], timeout=poll_interval)
+                solution = future.result()
+            finally:
+                executor.shutdown(wait=False)
+                os.remove(log_path)
+
+            yield sse_event('stage', {'stage': 'solved', 'backend': solution['backend'], 'solve_ms': solution['solve_ms']})
+            result = finish_solve(cache_key, problem['nonNegativity'], solution, spec=problem, geometry=geometry)
+
+        yield sse_event('result', {k: v for k, v in result.items() if k != 'geometry'})
+
+        if geometry:
+            yield sse_event('graph', {'geometry': result['geometry']})
+        elif result.get('graph_path'):
+            yield sse_event('stage', {'stage': 'rendering'})
+            pool = get_render_pool()
+            deadline = time.monotonic() + pool.wait_timeout
+            rendered = None
+            while rendered is None and pool.pending(cache_key) and time.monotonic() < deadline:
+                rendered = pool.wait(cache_key, timeout=1.0)
+                yield ': keepalive\n\n'
+            if rendered is not None or get_artifact_store().exists(cache_key):
+                yield sse_event('graph', {'graph_path': result['graph_path']})
             else:
-                coef = float(coef)
+                yield sse_event('graph', {'graph_path': None, 'graph_error': 'O gráfico não ficou pronto.'})
+        else:
+            yield sse_event('graph', {'graph_path': None, 'graph_error': result.get('graph_error')})
 
-            if var not in variables:
-                variables[var] = LpVariable(var, lowBound=0)
+        yield sse_event('done', {})
 
-            parsed_terms.append(coef * variables[var])
-        return lpSum(parsed_terms)
     except Exception as e:
-        raise ValueError(f"Erro ao analisar a expressão: {expression}. Detalhes: {str(e)}")
+        print(f"Erro inesperado: {e}")
+        yield sse_event('error', {'error': f"Erro inesperado: {str(e)}"})
 
 
-# Função para calcular dois pontos de uma reta
-def find_line_points(lhs: str, rhs: float):
+# View de otimização com progresso em tempo real (Server-Sent Events)
+@require_POST
+def optimize_stream(request):
     """
-    Encontra dois pontos para uma restrição:
-    - Para equações com duas variáveis: Ponto A (0, ?) e Ponto B (?, 0)
-    - Para equações com apenas x1: Ponto A (rhs, 0) e Ponto B (rhs, 2)
-    - Para equações com apenas x2: Ponto A (0, rhs/coef) e Ponto B (2, rhs/coef)
+    Recebe o mesmo corpo de optimize e responde com text/event-stream (ver
+    iter_solve_events). O navegador mostra o ótimo antes do gráfico.
     """
+    from .sparse import is_sparse_problem
+
     try:
-        lhs = lhs.replace(' ', '').replace('--', '+').replace('+-', '-')
-        x1_match = re.search(r'([+-]?\d*\.?\d*)x1', lhs)
-        x2_match = re.search(r'([+-]?\d*\.?\d*)x2', lhs)
+        data = json.loads(request.body)
+    except ValueError as e:
+        return JsonResponse({'error': f"JSON inválido: {str(e)}"}, status=400)
+    if is_sparse_problem(data):
+        return JsonResponse({'error': 'Problemas esparsos não têm progresso; use /solver/optimize/.'}, status=400)
+
+    geometry = request.GET.get('output', data.get('output')) == 'geometry'
+    response = StreamingHttpResponse(iter_solve_events(data, geometry=geometry), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'   # Sem buffer em proxies (nginx)
+    return response
+
+
+# View para resolver vários modelos em uma única requisição
+@require_POST
+def optimize_batch(request):
+    """
+    Recebe uma lista de problemas no mesmo formato de optimize. Parâmetros:
+    ?format=ndjson devolve uma linha JSON por modelo, conforme terminam (com
+    o campo 'index'); ?graph=0 desliga os gráficos do lote inteiro, e
+    "graph": false em um item desliga apenas o dele. ?output=geometry (ou
+    "output" em um item) devolve a geometria em vez do PNG.
+    """
+    try:
+        items = json.loads(request.body)
+    except ValueError as e:
+        return JsonResponse({'error': f"JSON inválido: {str(e)}"}, status=400)
+
+    max_items = batch_settings()['MAX_ITEMS']
+    if not isinstance(items, list):
+        return JsonResponse({'error': 'O corpo deve ser uma lista de problemas.'}, status=400)
+    if len(items) > max_items:
+        return JsonResponse({'error': f'O lote excede o limite de {max_items} problemas.'}, status=400)
+
+    graph = request.GET.get('graph', '1') not in ('0', 'false')
+    output = request.GET.get('output')
+
+    if request.GET.get('format') == 'ndjson':
+        lines = (
+            json.dumps({'index': index, **result}, cls=DjangoJSONEncoder) + '\n'
+            for index, result in iter_batch(items, graph=graph, ordered=False, output=output)
+        )
+        return StreamingHttpResponse(lines, content_type='application/x-ndjson')
+
+    def json_array():
+        yield '['
+        for index, result in iter_batch(items, graph=graph, ordered=True, output=output):
+            yield (',' if index else '') + json.dumps(result, cls=DjangoJSONEncoder)
+        yield ']'
+
+    return StreamingHttpResponse(json_array(), content_type='application/json')
+
+
+# Função para montar a resposta de um job da fila
+def job_response(job):
+    response = {
+        'job': str(job.id),
+        'status': job.status,
+        'priority': job.priority,
+        'timeout': job.timeout,
+        'created_at': job.created_at,
+        'started_at': job.started_at,
+        'finished_at': job.finished_at,
+        'url': reverse('job_detail', args=[job.id]),
+    }
+    if job.status == SolveJob.PENDING:
+        response['position'] = queue_position(job)
+    if job.status == SolveJob.RUNNING and job.cancel_requested:
+        response['cancel_requested'] = True
+    if job.result is not None:
+        response['result'] = job.result
+    if job.error:
+        response['error'] = job.error
+    return response
+
+
+# View para enfileirar um problema: responde na hora com o id do job (ver solver/jobs.py)
+@require_POST
+def jobs(request):
+    """
+    Corpo: o problema no formato de optimize mais, opcionalmente,
+    "priority" (inteiro, maior sai antes), "timeout" (segundos) e as opções
+    "graph"/"output" da resposta. Um problema idêntico a um job ainda ativo
+    recebe esse mesmo job (200); um job novo responde 202.
+    """
+    from .problem import read_problem
+    from .sparse import is_sparse_problem
 
-        # Captura os coeficientes ou assume 1 quando omitidos
-        x1_coef = float(x1_match.group(1)) if x1_match and x1_match.group(1) not in ('', '+', '-') else (-1 if x1_match and x1_match.group(1) == '-' else 1)
-        x2_coef = float(x2_match.group(1)) if x2_match and x2_match.group(1) not in ('', '+', '-') else (-1 if x2_match and x2_match.group(1) == '-' else 1)
+    try:
+        data = json.loads(request.body)
+        if is_sparse_problem(data):
+            return JsonResponse({'error': 'A fila de jobs não aceita o formato esparso.'}, status=400)
+        problem = read_problem(data)
+        priority = int(data.get('priority', 0))
+        timeout = data.get('timeout')
+        cache_key = cache_key_for(problem)
+    except KeyError as e:
+        return JsonResponse({'error': f"Campo obrigatório ausente: {e}"}, status=400)
+    except (ValueError, TypeError) as e:
+        return JsonResponse({'error': str(e)}, status=400)
 
-        # Resolução da Equação
-        # Caso com apenas x1 (ex: x1 <= 5)
-        if x1_match and not x2_match:
-            return (rhs / x1_coef, 0), (rhs / x1_coef, 2)
+    try:
+        spec = {**problem, **{k: data[k] for k in JOB_OPTIONS if k in data}}
+        # Problemas já resolvidos não passam pela fila
+        cached = lookup_result(
+            cache_key, graph=data.get('graph', True), geometry=data.get('output') == 'geometry',
+        )
+        job, created = submit_job(cache_key, spec, priority=priority, timeout=timeout, result=cached)
+    except ValueError as e:
+        return JsonResponse({'error': str(e)}, status=400)
+    except QueueFull as e:
+        return JsonResponse({'error': str(e)}, status=503)
+    except Exception as e:
+        print(f"Erro inesperado: {e}")
+        return JsonResponse({'error': f"Erro inesperado: {str(e)}"}, status=500)
+
+    response = JsonResponse(job_response(job), status=202 if created and job.status not in FINISHED else 200)
+    response['Location'] = reverse('job_detail', args=[job.id])
+    return response
+
+
+# View para consultar (GET, com ?wait=N para long-poll) ou cancelar (DELETE) um job
+@require_http_methods(['GET', 'DELETE'])
+def job_detail(request, job_id):
+    if request.method == 'DELETE':
+        job = SolveJob.objects.filter(id=job_id).first()
+        if job is None:
+            return JsonResponse({'error': 'Job não encontrado.'}, status=404)
+        if job.status in FINISHED:
+            return JsonResponse(job_response(job), status=409)
+        return JsonResponse(job_response(cancel_job(job_id)), status=202)
+
+    try:
+        wait_seconds = min(float(request.GET.get('wait', 0)), jobs_settings()['MAX_WAIT'])
+    except ValueError:
+        return JsonResponse({'error': 'wait deve ser um número de segundos.'}, status=400)
 
-        # Caso com apenas x2 (ex: 2x2 <= 30)
-        if x2_match and not x1_match:
-            resolved_rhs = rhs / x2_coef  
-            return (0, resolved_rhs), (2, resolved_rhs)
+    job = wait_for_job(job_id, max(wait_seconds, 0))
+    if job is None:
+        return JsonResponse({'error': 'Job não encontrado.'}, status=404)
+    return JsonResponse(job_response(job))
 
-        # Caso padrão com duas variáveis (ex: -x1 + 2x2 <= 4)
-        y_intercept = rhs / x2_coef if x2_coef != 0 else 0
-        x_intercept = rhs / x1_coef if x1_coef != 0 else 0
 
-        return (0, y_intercept), (x_intercept, 0)
+# Função para montar a resposta de uma sessão de re-otimização
+def session_response(session):
+    result = finish_solve(
+        cache_key_for(session.problem), session.problem['nonNegativity'], session.solution(), spec=session.problem
+    )
+    return {'session': session.id, **result, 'timings': session.timing_report()}
 
-    except ZeroDivisionError:
-        print("Erro: Divisão por zero ao calcular pontos de restrição.")
-        return (0, 0), (0, 0)
+
+# View para criar uma sessão: resolve o problema e mantém o modelo em memória
+@require_POST
+def sessions(request):
+    from .problem import read_problem
+    from .sessions import SolveSession, get_session_store
+
+    try:
+        session = SolveSession(read_problem(json.loads(request.body)))
+        get_session_store().set(session.id, session)
+        return JsonResponse(session_response(session), status=201)
+    except KeyError as e:
+        return JsonResponse({'error': f"Campo obrigatório ausente: {e}"}, status=400)
+    except (ValueError, TypeError) as e:
+        return JsonResponse({'error': str(e)}, status=400)
     except Exception as e:
-        print(f"Erro ao calcular pontos da restrição: {e}")
-        return (0, 0), (0, 0)
+        print(f"Erro inesperado: {e}")
+        return JsonResponse({'error': f"Erro inesperado: {str(e)}"}, status=500)
 
-# Função principal de otimização
-def optimize(request):
-    if request.method == 'POST':
-        try:
-            # Obter dados do POST
-            data = json.loads(request.body)
-            objective = data['objective']
-            objectiveFunction = data['objectiveFunction']
-            constraints = data['constraints']
-            non_negativity = data.get('nonNegativity', {'x1': True, 'x2': True})
-
-            # Criar modelo de otimização
-            sense = LpMaximize if objective == 'maximize' else LpMinimize
-            model = LpProblem('Optimization', sense)
-
-            # Definir variáveis automaticamente
-            variables = {}
-            restriction_points = []
-            constraint_lines = []
-
-            # Adicionar função objetivo
-            model += parse_expression(objectiveFunction, variables), 'Objective'
-
-            # Adicionar restrições
-            for i, c in enumerate(constraints):
-                match = re.match(r'(.+?)(<=|>=|=)(.+)', c.replace(' ', ''))
-                if match:
-                    lhs = match.group(1)
-                    operator = match.group(2)
-                    rhs = float(match.group(3))
-                    
-                    constraint_lines.append((lhs, operator, rhs))
-
-                    if operator == '<=':
-                        model += parse_expression(lhs, variables) <= rhs
-                    elif operator == '>=':
-                        model += parse_expression(lhs, variables) >= rhs
-                    elif operator == '=':
-                        model += parse_expression(lhs, variables) == rhs
-
-                    # Calcular pontos para o gráfico
-                    A, B = find_line_points(lhs, rhs)
-                    restriction_points.append({
-                        'Restrição': f'Restrição {i + 1}',
-                        'Pontos': [A, B]
-                    })
-
-            # Adicionar restrições de não negatividade
-            if non_negativity.get('x1', True):
-                model += variables['x1'] >= 0
-            if non_negativity.get('x2', True):
-                model += variables['x2'] >= 0
-
-            # Resolver o modelo
-            model.solve()
-            optimal_point = [v.varValue for v in model.variables()]
-            objective_result = value(model.objective)
-
-            # Gerar gráfico
-            filepath = 'solver/static/graph.png'
-            os.makedirs(os.path.dirname(filepath), exist_ok=True)
-            plt.figure(figsize=(10, 8))
-            plt.xlabel('x1')
-            plt.ylabel('x2')
-            plt.title('Gráfico da Região Factível e Solução Ótima')
-
-            # Desenhar eixos principais
-            plt.axhline(0, color='black', linewidth=2)  # Eixo X
-            plt.axvline(0, color='black', linewidth=2)  # Eixo Y
-
-            # Intervalo amplo para melhor visualização
-            x_range = np.linspace(-1, 10000, 40000)
-            y_range = np.linspace(-1, 10000, 40000)
-
-            # Ponto coringa (0,0)
-            coringa_x = 0
-            coringa_y = 0
-
-            for i, (lhs, operator, rhs) in enumerate(constraint_lines):
-                try:
-                    lhs = lhs.replace(' ', '').replace('--', '+').replace('+-', '-')
-                    
-                    # Substituir sinais sem números explícitos
-                    lhs = re.sub(r'(?<![\d.])x', '1x', lhs)  # Substitui 'x' por '1x'
-                    lhs = re.sub(r'(?<![\d.])-x', '-1x', lhs)  # Substitui '-x' por '-1x'
-                    lhs = re.sub(r'(?<![\d.])\+x', '+1x', lhs)  # Substitui '+x' por '+1x'
-            
-                    # Coeficientes para x1 e x2 (extraídos do LHS)
-                    x1_match = re.search(r'([+-]?\d*\.?\d*)x1', lhs)
-                    x2_match = re.search(r'([+-]?\d*\.?\d*)x2', lhs)
-            
-                    x1_coef = float(x1_match.group(1)) if x1_match and x1_match.group(1) not in ('', '+', '-') else (-1 if x1_match and x1_match.group(1) == '-' else 1)
-                    x2_coef = float(x2_match.group(1)) if x2_match and x2_match.group(1) not in ('', '+', '-') else (-1 if x2_match and x2_match.group(1) == '-' else 1)
-            
-                    # Tratamento para restrições verticais (ex: x1 <= 5)
-                    if re.fullmatch(r'([+-]?\d*\.?\d*)x1', lhs) or re.fullmatch(r'x1', lhs):
-                        if operator == '<=':
-                            plt.axvline(x=rhs, color='purple', linewidth=2, label=f'Restrição {i + 1}')
-                            plt.fill_betweenx(y_range, -100, rhs, alpha=0.2, color='gray')
-                        elif operator == '>=':
-                            plt.axvline(x=rhs, color='purple', linewidth=2, label=f'Restrição {i + 1}')
-                            plt.fill_betweenx(y_range, rhs, 100, alpha=0.2, color='gray')
-            
-                    # Tratamento para restrições horizontais (ex: x2 <= 6)
-                    elif re.fullmatch(r'([+-]?\d*\.?\d*)x2', lhs) or re.fullmatch(r'x2', lhs):
-                        resolved_rhs = rhs / x2_coef if x2_coef != 0 else 0
-                        if operator == '<=':
-                            plt.axhline(y=resolved_rhs, color='green', linewidth=2, label=f'Restrição {i + 1}')
-                            plt.fill_between(x_range, -100, resolved_rhs, alpha=0.2, color='gray')
-                        elif operator == '>=':
-                            plt.axhline(y=resolved_rhs, color='green', linewidth=2, label=f'Restrição {i + 1}')
-                            plt.fill_between(x_range, resolved_rhs, 100, alpha=0.2, color='gray')
-            
-                    # Tratamento para restrições lineares
-                    else:
-                        coef_match = re.match(r'([+-]?\d*\.?\d*)x1([+-]?\d*\.?\d*)x2', lhs)
-                        if coef_match:
-                            coef_x1 = float(coef_match.group(1)) if coef_match.group(1) else 1
-                            coef_x2 = float(coef_match.group(2)) if coef_match.group(2) else 1
-            
-                            y_values = (rhs - coef_x1 * x_range) / coef_x2
-                            plt.plot(x_range, y_values, label=f'Restrição {i + 1}', linewidth=2)
-            
-                            if operator == '<=':
-                                plt.fill_between(x_range, y_values, -100, alpha=0.2, color='gray')
-                            elif operator == '>=':
-                                plt.fill_between(x_range, y_values, 100, alpha=0.2, color='gray')
-            
-                except Exception as e:
-                    print(f"Erro ao desenhar restrição {i + 1}: {e}")
-
-            # Adicionar ponto ótimo ao gráfico
-            plt.scatter(optimal_point[0], optimal_point[1], color='red', s=100, label='Solução Ótima')
-            plt.text(optimal_point[0], optimal_point[1], f'({optimal_point[0]}, {optimal_point[1]})', fontsize=10, color='red')
-
-            # Determinar os limites do gráfico dinamicamente
-            all_x = []
-            all_y = []
-
-            # Coletar todos os pontos das restrições
-            for restriction in restriction_points:
-                point1, point2 = restriction['Pontos']
-                all_x.extend([point1[0], point2[0]])
-                all_y.extend([point1[1], point2[1]])
-
-            # Ajustar limites com base nas restrições de não negatividade
-            if non_negativity.get('x1', True):
-                min_x = 0  # Garante que x1 não será negativo
-            if non_negativity.get('x2', True):
-                min_y = 0  # Garante que x2 não será negativo
-
-            # Garantir que limites negativos não sejam exibidos no gráfico
-            plt.xlim(min_x if 'min_x' in locals() else min(all_x) - 1, max(all_x) + 1)
-            plt.ylim(min_y if 'min_y' in locals() else min(all_y) - 1, max(all_y) + 1)
-
-            plt.grid(color='gray', linestyle='--', linewidth=0.5, alpha=0.7)
-            plt.legend()
-            plt.savefig(filepath)
-            plt.close()
-
-            return JsonResponse({
-                'Ponto Ótimo': f"({', '.join(map(str, optimal_point))})",
-                'Resultado Objetivo': objective_result,
-                'Pontos Restrição': restriction_points,
-                'graph_path': f"/static/graph.png"
-            })
 
-        except Exception as e:
-            print(f"Erro inesperado: {e}")
-            return JsonResponse({'error': f"Erro inesperado: {str(e)}"}, status=500)
+# View para consultar (GET), alterar e re-otimizar (POST) ou encerrar (DELETE) uma sessão
+@require_http_methods(['GET', 'POST', 'DELETE'])
+def session_detail(request, session_id):
+    from .sessions import get_session_store
+
+    store = get_session_store()
+    session = store.get(session_id)
+    if session is None:
+        return JsonResponse({'error': 'Sessão não encontrada ou expirada.'}, status=404)
+
+    if request.method == 'DELETE':
+        store.delete(session_id)
+        return JsonResponse({'session': session_id, 'deleted': True})
+
+    try:
+        with session.lock:
+            if request.method == 'POST':
+                session.apply(json.loads(request.body))
+            response = session_response(session)
+        store.set(session_id, session)  # Renova o prazo de expiração
+        return JsonResponse(response)
+    except ValueError as e:
+        return JsonResponse({'error': str(e)}, status=400)
+    except Exception as e:
+        print(f"Erro inesperado: {e}")
+        return JsonResponse({'error': f"Erro inesperado: {str(e)}"}, status=500)
+
 
+# View para varredura paramétrica e análise de sensibilidade
+@require_POST
+def sweep(request):
+    """
+    Corpo: o problema no formato de optimize mais "parameters", a lista de
+    coeficientes varridos (ver sensitivity.read_parameters). A resposta vem
+    em colunas, uma lista por grandeza com um valor por passo.
+    """
+    from .problem import read_problem
+    from .sensitivity import run_sweep
+
+    try:
+        data = json.loads(request.body)
+        return JsonResponse(run_sweep(read_problem(data), data['parameters']))
+    except KeyError as e:
+        return JsonResponse({'error': f"Campo obrigatório ausente: {e}"}, status=400)
+    except (ValueError, TypeError) as e:
+        return JsonResponse({'error': str(e)}, status=400)
+    except Exception as e:
+        print(f"Erro inesperado: {e}")
+        return JsonResponse({'error': f"Erro inesperado: {str(e)}"}, status=500)
+
+
+# View com os resolvedores registrados e os tempos medidos por faixa de formato
+def backends(request):
+    from .backends import BACKENDS, get_backend_metrics
+
+    return JsonResponse({
+        'backends': [{'name': name, 'available': b.available()} for name, b in BACKENDS.items()],
+        'metrics': get_backend_metrics().snapshot(),
+    })
+
+
+# View com o histórico paginado de problemas resolvidos (?page=N&page_size=M)
+@require_http_methods(['GET'])
+def history(request):
+    options = history_settings()
+    try:
+        page_size = min(int(request.GET.get('page_size', options['PAGE_SIZE'])), options['MAX_PAGE_SIZE'])
+        number = int(request.GET.get('page', 1))
+    except ValueError:
+        return JsonResponse({'error': 'page e page_size devem ser inteiros.'}, status=400)
+
+    rows = Problem.objects.values(
+        'key', 'objective', 'spec', 'variables', 'constraints', 'created_at',
+        'solution__backend', 'solution__objective_result', 'solution__optimal_point',
+    )
+    paginator = Paginator(rows, max(page_size, 1))
+    try:
+        page = paginator.page(number)
+    except EmptyPage:
+        return JsonResponse({'error': f'Página {number} não existe.'}, status=404)
+
+    return JsonResponse({
+        'count': paginator.count,
+        'page': page.number,
+        'num_pages': paginator.num_pages,
+        'results': [
+            {
+                'key': row['key'],
+                'objective': row['objective'],
+                'problem': row['spec'],
+                'variables': row['variables'],
+                'constraints': row['constraints'],
+                'created_at': row['created_at'],
+                'backend': row['solution__backend'],
+                'objective_result': row['solution__objective_result'],
+                'optimal_point': row['solution__optimal_point'],
+                'graph_path': reverse('graph', args=[row['key']]),
+            }
+            for row in page.object_list
+        ],
+    })
+
+
+# Função para a URL de um arquivo da galeria (view gallery_file ou STATIC_URL)
+def gallery_url(name, options):
+    if options['USE_STATIC_URL']:
+        return static(f"{options['STATIC_PREFIX']}/{name}")
+    return reverse('gallery_file', args=[name])
+
+
+def gallery_etag(request):
+    manifest = load_manifest()
+    return manifest['version'] if manifest else None
+
+
+# View com os problemas da galeria, resolvidos de antemão por `python manage.py build_gallery`
+@require_http_methods(['GET'])
+@condition(etag_func=gallery_etag)
+def gallery(request):
+    manifest = load_manifest()
+    if manifest is None:
+        return JsonResponse({'error': 'Galeria não gerada. Execute python manage.py build_gallery.'}, status=404)
+    options = gallery_settings()
+    response = JsonResponse({
+        'version': manifest['version'],
+        'results': [
+            {
+                **{k: v for k, v in entry.items() if k != 'files'},
+                'files': {name: gallery_url(file, options) for name, file in entry['files'].items()},
+            }
+            for entry in manifest['entries']
+        ],
+    })
+    patch_cache_control(response, public=True, max_age=options['MAX_AGE'])
+    return response
+
+
+# View para os arquivos da galeria; o nome tem a impressão digital do conteúdo, que nunca muda
+@require_http_methods(['GET'])
+def gallery_file(request, name):
+    path = asset_path(name)
+    if path is None:
+        return JsonResponse({'error': 'Arquivo da galeria não encontrado.'}, status=404)
+    response = FileResponse(open(path, 'rb'), content_type=asset_content_type(name))
+    patch_cache_control(response, public=True, max_age=IMMUTABLE_MAX_AGE, immutable=True)
+    return response
+
+
+# View com os histogramas de latência no formato texto do Prometheus
+def metrics(request):
+    from .backends import get_backend_metrics
+
+    lines = [get_histograms().render(HELP).rstrip('\n')]
+
+    # Tempos de resolução por resolvedor e faixa de formato (ver solver/backends.py)
+    lines.append('# HELP solver_backend_solve_seconds Tempo de resolução por resolvedor e formato do problema.')
+    lines.append('# TYPE solver_backend_solve_seconds summary')
+    for bucket, by_backend in get_backend_metrics().snapshot().items():
+        for name, stats in by_backend.items():
+            labels = f'backend="{name}",shape="{bucket}"'
+            lines.append(f"solver_backend_solve_seconds_sum{{{labels}}} {stats['total_ms'] / 1000:.6f}")
+            lines.append(f"solver_backend_solve_seconds_count{{{labels}}} {stats['count']}")
+
+    # Admissão: requisições aceitas, enfileiradas e recusadas (ver solver/admission.py)
+    lines.append(get_admission().render().rstrip('\n'))
+    return HttpResponse('\n'.join(lines) + '\n', content_type='text/plain; version=0.0.4; charset=utf-8')
@@ -0,0 +1,218 @@
+import atexit
+import logging
+import multiprocessing
+import os
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+
+from django.conf import settings
+
+from .artifacts import get_artifact_store
+from .timing import observe_spans, traced_call
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SETTINGS = {
+    'WORKERS': 2,            # Processos de renderização (0 = renderizar na própria requisição)
+    'MAX_PENDING': 32,       # Renderizações em andamento/na fila antes de recusar novas
+    'SUBMIT_TIMEOUT': 0.5,   # Tempo máximo de espera por uma vaga na fila, em segundos
+    'WAIT_TIMEOUT': 30,      # Tempo máximo que graph() espera uma renderização pendente
+    'PREWARM': True,         # Inicia e aquece o pool na partida do servidor (otimizacao/wsgi.py e asgi.py)
+}
+
+
+class RenderQueueFull(Exception):
+    pass
+
+
+# Função executada nos processos recém-criados apenas para forçar o aquecimento
+def _ping():
+    return True
+
+
+# O matplotlib (~0,7 s de importação) só é carregado ao renderizar: nos
+# processos do pool, ou no próprio processo quando WORKERS = 0
+def _warm_up():
+    from .rendering import warm_up
+    warm_up()
+
+
+def _render_graph(*args):
+    from .rendering import render_graph
+    return render_graph(*args)
+
+
+class RenderPool:
+    """
+    Pool de processos para renderização dos gráficos. Os processos são
+    criados com 'spawn' (sem herdar threads, conexões ou locks do Django) e
+    aquecidos com warm_up(). O número de renderizações pendentes é limitado
+    por um semáforo: quando a fila está cheia, submit() espera no máximo
+    `submit_timeout` segundos e então levanta RenderQueueFull.
+
+    Renderizações para a mesma chave são deduplicadas: enquanto uma estiver
+    pendente, novos pedidos recebem o mesmo Future. Ao terminar, o PNG é
+    gravado no ArtifactStore.
+    """
+
+    def __init__(self, store, workers=2, max_pending=32, submit_timeout=0.5, wait_timeout=30):
+        self.store = store
+        self.workers = workers
+        self.submit_timeout = submit_timeout
+        self.wait_timeout = wait_timeout
+        self._slots = threading.BoundedSemaphore(max_pending)
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._executor = None
+
+    @classmethod
+    def from_settings(cls):
+        options = {**DEFAULT_SETTINGS, **getattr(settings, 'SOLVER_RENDER', {})}
+        return cls(
+            get_artifact_store(),
+            workers=options['WORKERS'],
+            max_pending=options['MAX_PENDING'],
+            submit_timeout=options['SUBMIT_TIMEOUT'],
+            wait_timeout=options['WAIT_TIMEOUT'],
+        )
+
+    def _get_executor(self):
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context('spawn'),
+                initializer=_warm_up,
+            )
+            # Cria e aquece todos os processos antes da primeira renderização
+            for _ in range(self.workers):
+                self._executor.submit(_ping)
+        return self._executor
+
+    def start(self):
+        if self.workers:
+            with self._lock:
+                self._get_executor()
+
+    def submit(self, key, *args, callback=None):
+        """
+        Agenda a renderização do gráfico `key` (`args` são os argumentos de
+        render_graph) e retorna um Future com (PNG, etapas medidas no processo
+        de renderização).
+        `callback(graph_bytes)` é chamado após o artefato ser gravado.
+        """
+        with self._lock:
+            future = self._pending.get(key)
+            if future is not None:
+                return future
+
+        if not self.workers:
+            future = Future()
+            graph_bytes = _render_graph(*args)
+            self._finish(key, graph_bytes, callback)
+            future.set_result((graph_bytes, []))
+            return future
+
+        if not self._slots.acquire(timeout=self.submit_timeout):
+            raise RenderQueueFull('Fila de renderização cheia.')
+
+        try:
+            with self._lock:
+                future = self._pending.get(key)
+                if future is not None:
+                    self._slots.release()
+                    return future
+                future = self._get_executor().submit(traced_call, _render_graph, *args)
+                self._pending[key] = future
+        except BaseException:
+            self._slots.release()
+            raise
+
+        future.add_done_callback(lambda f: self._on_done(key, f, callback))
+        return future
+
+    def _on_done(self, key, future, callback):
+        try:
+            if not future.cancelled() and future.exception() is None:
+                graph_bytes, spans = future.result()
+                observe_spans(spans)
+                self._finish(key, graph_bytes, callback)
+            elif not future.cancelled():
+                logger.error('Erro ao renderizar o gráfico %s: %s', key, future.exception())
+        except Exception:
+            logger.exception('Erro ao gravar o gráfico %s', key)
+        finally:
+            with self._lock:
+                self._pending.pop(key, None)
+            self._slots.release()
+
+    def _finish(self, key, graph_bytes, callback):
+        self.store.put(key, graph_bytes)
+        if callback is not None:
+            callback(graph_bytes)
+
+    def pending(self, key):
+        with self._lock:
+            return key in self._pending
+
+    def wait(self, key, timeout=None):
+        """
+        Espera a renderização pendente de `key` e retorna o PNG, ou None se
+        não houver renderização pendente, se ela falhar ou estourar o tempo.
+        """
+        with self._lock:
+            future = self._pending.get(key)
+        if future is None:
+            return None
+        try:
+            return future.result(timeout=self.wait_timeout if timeout is None else timeout)[0]
+        except Exception:
+            return None
+
+    def shutdown(self, wait=True):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait, cancel_futures=True)
+
+
+_render_pool = None
+_render_pool_lock = threading.Lock()
+
+
+# Função para obter o pool de renderização configurado em settings.SOLVER_RENDER
+def get_render_pool():
+    global _render_pool
+    if _render_pool is None:
+        with _render_pool_lock:
+            if _render_pool is None:
+                _render_pool = RenderPool.from_settings()
+                _render_pool.start()
+                atexit.register(_render_pool.shutdown, wait=False)
+    return _render_pool
+
+
+# Após um fork (gunicorn --preload), o processo filho não herda as threads do executor
+def _forget_render_pool():
+    global _render_pool
+    _render_pool = None
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_forget_render_pool)
+
+
+# Função chamada por otimizacao/wsgi.py e asgi.py: cria e aquece os processos antes da primeira requisição
+def prewarm_render_pool():
+    """
+    Só os módulos WSGI/ASGI a chamam; comandos de gerenciamento, testes e
+    scripts que chamam django.setup() não criam o pool na partida. Com
+    SOLVER_STARTUP['PRELOAD'] (servidor com preload), o pool é criado em
+    cada worker após o fork, no primeiro gráfico.
+    """
+    from .startup import startup_settings
+
+    options = {**DEFAULT_SETTINGS, **getattr(settings, 'SOLVER_RENDER', {})}
+    if options['PREWARM'] and options['WORKERS'] and not startup_settings()['PRELOAD']:
+        get_render_pool()
+        return True
+    return False